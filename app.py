@@ -1,11 +1,63 @@
-from pydantic import BaseModel, HttpUrl
-from fastapi import FastAPI, HTTPException
-from scraper import cnbc_scraper, investing_scraper, forexfactory_scraper
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import Optional
+from pydantic import BaseModel, Field, HttpUrl
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from scraper import batch, export, http_client, metrics, records, settings
+from scraper.cache import ResponseCache, SQLiteBackend
+from scraper.matcher import compile_keywords, load_keywords, rank
+from scraper.news_index import default_index
+from scraper.normalize import normalize_history, normalize_rows
+from scraper.registry import LazyScrapers
+from scraper.scheduler import PrefetchScheduler
+
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s [%(levelname)s] %(message)s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compiled once here; score=true requests reuse it
+    app.state.keyword_matcher = compile_keywords(tuple(load_keywords(settings.KEYWORDS_PATH)))
+    # Opened here rather than at import, so importing app touches no files
+    await http_client.run_blocking(default_index)
+    if settings.PREFETCH_ENABLED:
+        scheduler.start()
+    yield
+    await scheduler.stop()
+    await http_client.aclose()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON via orjson"""
+
+    def render(self, content) -> bytes:
+        with metrics.stage("app", "serialize"):
+            return records.dumps(content)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+
+if settings.SERVER_TIMING:
+    @app.middleware("http")
+    async def server_timing(request: Request, call_next):
+        started = time.perf_counter()
+        metrics.start_request()
+        response = await call_next(request)
+        response.headers["Server-Timing"] = metrics.server_timing(time.perf_counter() - started)
+        return response
 
-app = FastAPI()
 
 class CalendarRequest(BaseModel):
-    date: str
+    date: Optional[str] = None
+    # Several days in one response: explicit dates, or week=true for Monday-Sunday around `date`
+    dates: Optional[list[str]] = None
+    week: bool = False
 
 class RangeRequest(BaseModel):
     start_date: str
@@ -14,38 +66,108 @@ class RangeRequest(BaseModel):
 class DetailRequest(BaseModel):
     url: HttpUrl
 
+class BatchDetailRequest(BaseModel):
+    urls: list[HttpUrl]
+    timeout: float = settings.BATCH_URL_TIMEOUT
+    stream: bool = False
+
 class SearchRequest(BaseModel):
     keyword: str
 
+class NewsSearchRequest(BaseModel):
+    keyword: str
+    limit: int = Field(20, ge=1, le=200)
+    site: Optional[str] = None
+
 class HistoryRequest(BaseModel):
     event_id: str
 
 
+# Scraper modules are imported on the first request that needs them, not at startup
 SCRAPERS = {
-    "cnbc": {
-        "latest": cnbc_scraper.latest_news,
-        "detail": cnbc_scraper.detail_page,
-        "search": cnbc_scraper.scrape_keyword
-    },
-    "investing": {
-        "latest": investing_scraper.latest_news,
-        "detail": investing_scraper.detail_page,
-        "search": investing_scraper.scrape_keyword
-    },
-    "forexfactory": {
-        "calendar": forexfactory_scraper.Scraper,
-        "history": forexfactory_scraper.HistoryScraper,
-        "date_range": forexfactory_scraper.RangeScraper
-    }
+    "cnbc": LazyScrapers({
+        "latest": "scraper.cnbc_scraper:latest_news_async",
+        "detail": "scraper.cnbc_scraper:detail_page_async",
+        "search": "scraper.cnbc_scraper:scrape_keyword_async"
+    }),
+    "investing": LazyScrapers({
+        "latest": "scraper.investing_scraper:latest_news_async",
+        "detail": "scraper.investing_scraper:detail_page_async",
+        "search": "scraper.investing_scraper:scrape_keyword_async"
+    }),
+    "forexfactory": LazyScrapers({
+        "calendar": "scraper.forexfactory_scraper:Scraper",
+        "history": "scraper.forexfactory_scraper:HistoryScraper",
+        "date_range": "scraper.forexfactory_scraper:RangeScraper"
+    })
 }
 
+# Failed scrapes come back as {"error": ...} or empty; never cache those, and answer
+# with the last good response instead while the upstream is failing
+response_cache = ResponseCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    backend=SQLiteBackend(settings.CACHE_PATH, keep=settings.CACHE_ERROR_TTL) if settings.CACHE_PATH else None,
+    cacheable=lambda value: bool(value) and not (isinstance(value, dict) and "error" in value),
+    error_ttl=settings.CACHE_ERROR_TTL,
+    coalesce=settings.CACHE_COALESCE,
+)
+
+
+async def indexed(domain: str, feed: str, results):
+    # Every successful latest/search scrape feeds the local index
+    news_index = default_index()
+    if news_index is not None and isinstance(results, list):
+        await http_client.run_blocking(news_index.ingest, results, domain, feed)
+    return results
+
+
+async def fetch_latest(domain: str):
+    return await indexed(domain, "latest", await SCRAPERS[domain]["latest"]())
+
+
+@app.get("/v1/pool-stats")
+async def pool_stats():
+    return http_client.pool_stats()
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    if not metrics.available():
+        raise HTTPException(status_code=404, detail="Metrics need the prometheus_client package")
+    body, content_type = metrics.render()
+    return Response(body, media_type=content_type)
+
+
+@app.get("/v1/cache-stats")
+async def cache_stats():
+    return response_cache.stats()
+
+
+@app.get("/v1/prefetch-stats")
+async def prefetch_stats():
+    return scheduler.stats()
+
+
+def ranked(request: Request, results):
+    # Errors ({"error": ...}) pass through unscored
+    if not isinstance(results, list):
+        return results
+    return rank(results, request.app.state.keyword_matcher)
+
 
 @app.get("/v1/{domain}/latest-news")
-async def latest_news(domain: str):
-    scraper_map = SCRAPERS.get(domain.lower())
+async def latest_news(domain: str, request: Request, score: bool = False):
+    domain = domain.lower()
+    scraper_map = SCRAPERS.get(domain)
     if not scraper_map or "latest" not in scraper_map:
         raise HTTPException(status_code=404, detail=f"No scraper found for domain '{domain}'")
-    return scraper_map["latest"]()
+    results = await response_cache.get_or_fetch(
+        f"{domain}:latest",
+        lambda: fetch_latest(domain),
+        ttl=settings.LATEST_NEWS_TTL,
+        stale_ttl=settings.CACHE_STALE_TTL,
+    )
+    return ranked(request, results) if score else results
 
 
 @app.post("/v1/{domain}/detail-page")
@@ -57,83 +179,291 @@ async def detail_news(domain: str, req: DetailRequest):
     if not req.url:
         raise HTTPException(status_code=400, detail="URL cannot be empty")
 
-    return scraper_map["detail"](req.url)
+    return await scraper_map["detail"](req.url)
+
+
+@app.post("/v1/{domain}/detail-pages")
+async def detail_pages(domain: str, req: BatchDetailRequest):
+    domain = domain.lower()
+    scraper_map = SCRAPERS.get(domain)
+    if not scraper_map or "detail" not in scraper_map:
+        raise HTTPException(status_code=404, detail=f"No scraper found for domain '{domain}'")
+
+    if not req.urls:
+        raise HTTPException(status_code=400, detail="URLs cannot be empty")
+    if len(req.urls) > settings.BATCH_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_URLS} URLs per request")
+
+    if req.stream:
+        async def ndjson():
+            async for result in batch.fetch_many(domain, scraper_map["detail"], req.urls, req.timeout):
+                yield json.dumps(result) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results = await batch.fetch_all(domain, scraper_map["detail"], req.urls, req.timeout)
+    succeeded = sum(1 for result in results if result["ok"])
+    return {
+        "total_result": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "data": results
+    }
+
+
+@app.post("/v1/news/search")
+async def news_search(req: NewsSearchRequest):
+    news_index = default_index()
+    if news_index is None:
+        raise HTTPException(status_code=404, detail="News index is disabled (SCRAPER_NEWS_INDEX_PATH)")
+    if not req.keyword.strip():
+        raise HTTPException(status_code=400, detail="Keyword cannot be empty")
+
+    results = await http_client.run_blocking(news_index.search, req.keyword, req.limit, req.site)
+    return {"total_result": len(results), "data": results}
 
 
 @app.post("/v1/{domain}/search-news")
-async def search_news(domain: str, req: SearchRequest):
-    scraper_map = SCRAPERS.get(domain.lower())
+async def search_news(domain: str, req: SearchRequest, request: Request, score: bool = False):
+    domain = domain.lower()
+    scraper_map = SCRAPERS.get(domain)
     if not scraper_map or "search" not in scraper_map:
         raise HTTPException(status_code=404, detail=f"No scraper found for domain '{domain}'")
 
     if not req.keyword.strip():
         raise HTTPException(status_code=400, detail="Keyword cannot be empty")
 
-    return scraper_map["search"](req.keyword)
+    results = await indexed(domain, "search", await scraper_map["search"](req.keyword))
+    return ranked(request, results) if score else results
+
+
+async def fetch_calendar(domain: str, date_str: str):
+    scraper = SCRAPERS[domain]["calendar"](date_str)
+    await scraper.scrape_async()
+    cleaned_data = await http_client.run_blocking(scraper.clean_data)
+    return {
+        "date": date_str,
+        "total_result": len(cleaned_data),
+        "data": cleaned_data
+    }
+
+
+async def cached_calendar(domain: str, date_str: str):
+    # One cache entry per day: settled days stay cached for good, recent ones expire quickly
+    return await response_cache.get_or_fetch(
+        f"{domain}:calendar:{date_str}",
+        lambda: fetch_calendar(domain, date_str),
+        ttl=SCRAPERS[domain]["calendar"].day_ttl(date_str),
+        stale_ttl=settings.CACHE_STALE_TTL,
+    )
+
+
+def calendar_days(req: CalendarRequest) -> list:
+    """The YYYY-MM-DD days a multi-day calendar request covers, sorted; 400 when invalid"""
+    try:
+        if req.week:
+            day = date.fromisoformat(req.date) if req.date else date.today()
+            monday = day - timedelta(days=day.weekday())
+            return [(monday + timedelta(days=offset)).isoformat() for offset in range(7)]
+        days = sorted({date.fromisoformat(value).isoformat() for value in req.dates})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Dates must be YYYY-MM-DD: {e}")
+    if not days:
+        raise HTTPException(status_code=400, detail="dates cannot be empty")
+    if len(days) > settings.CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.CALENDAR_MAX_DAYS} dates per request")
+    return days
+
+
+async def fetch_calendar_days(domain: str, days: list):
+    # Cached days answer straight away; the missing ones are fetched concurrently
+    results = await asyncio.gather(*(cached_calendar(domain, day) for day in days))
+    merged = SCRAPERS[domain]["calendar"].merge_days([(day, result["data"]) for day, result in zip(days, results)])
+    return {
+        "dates": days,
+        "total_result": len(merged),
+        "data": merged
+    }
+
+
+async def fetch_history(domain: str, event_id: str):
+    return await SCRAPERS[domain]["history"]().scrape_async(event_id)
 
 
 @app.post("/v1/{domain}/calendar")
-async def calendar(domain: str, req: CalendarRequest):
-    scraper_map = SCRAPERS.get(domain.lower())
+async def calendar(domain: str, req: CalendarRequest, normalize: bool = False):
+    domain = domain.lower()
+    scraper_map = SCRAPERS.get(domain)
     if not scraper_map or "calendar" not in scraper_map:
         raise HTTPException(status_code=404, detail=f"No calendar scraper found for domain '{domain}'")
+    if req.dates is None and not req.week and not req.date:
+        raise HTTPException(status_code=400, detail="Provide date, dates or week")
 
     try:
-        scraper_class = scraper_map["calendar"]
-        scraper = scraper_class(req.date)
-
-        raw_data = scraper.scrape()
-        cleaned_data = scraper.clean_data()
-        return {
-            "date": req.date,
-            "total_result": len(cleaned_data),
-            "data": cleaned_data
-        }
+        if req.dates is not None or req.week:
+            result = await fetch_calendar_days(domain, calendar_days(req))
+        else:
+            result = await cached_calendar(domain, req.date)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if normalize:
+        # After the cache: cached rows stay raw, and normalizing is one batched pass per response
+        result = {**result, "data": await http_client.run_blocking(normalize_rows, result["data"])}
+    # Returned as a response so FastAPI skips jsonable_encoder on every row
+    return FastJSONResponse(result)
+
+
+def check_format(fmt, normalize: bool = False):
+    if fmt is not None and fmt not in export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(export.FORMATS)}")
+    if fmt is not None and normalize:
+        raise HTTPException(status_code=400, detail="normalize applies to JSON responses; exports are already typed")
+
+
+async def exported(build_frame, fmt: str, filename: str) -> Response:
+    # Frame building and encoding are CPU-bound; keep them off the event loop
+    data = await http_client.run_blocking(lambda: export.encode(build_frame(), fmt))
+    media_type, extension = export.FORMATS[fmt]
+    return Response(data, media_type=media_type,
+                    headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'})
 
 
 @app.post("/v1/{domain}/range")
-async def get_range(domain: str, req: RangeRequest):
+async def get_range(domain: str, req: RangeRequest, request: Request, stream: bool = False,
+                    fmt: Optional[str] = Query(None, alias="format"), normalize: bool = False):
     scraper_map = SCRAPERS.get(domain.lower())
     if not scraper_map or "date_range" not in scraper_map:
         raise HTTPException(status_code=404, detail=f"No range scraper found for domain '{domain}'")
+    check_format(fmt, normalize)
+
+    scraper_class = scraper_map["date_range"]
+    scraper = scraper_class(req.start_date, req.end_date)
+
+    if fmt:
+        try:
+            cleaned_data = scraper.parse_events(await scraper.scrape_async())
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return await exported(lambda: export.events_frame(cleaned_data, start=req.start_date), fmt,
+                              f"range-{req.start_date}-{req.end_date}")
+
+    if stream or "application/x-ndjson" in request.headers.get("accept", ""):
+        if normalize:
+            raise HTTPException(status_code=400, detail="normalize needs the whole range; it cannot be streamed")
+        # One event per line as each chunk arrives; the last line is a summary trailer
+        async def ndjson():
+            total = 0
+            try:
+                async for row in scraper.iter_events_async():
+                    total += 1
+                    yield records.dumps(row) + b"\n"
+            except Exception as e:
+                yield records.dumps({"error": str(e)}) + b"\n"
+                return
+            yield records.dumps({
+                "start_date": req.start_date,
+                "end_date": req.end_date,
+                "total_result": total
+            }) + b"\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
     try:
-        scraper_class = scraper_map["date_range"]
-        scraper = scraper_class(req.start_date, req.end_date)
-
-        raw_data = scraper.scrape()
+        raw_data = await scraper.scrape_async()
         cleaned_data = scraper.parse_events(raw_data)
 
         if not cleaned_data:
             raise HTTPException(status_code=404, detail=f"No events found between {req.start_date} and {req.end_date}")
+        if normalize:
+            cleaned_data = await http_client.run_blocking(normalize_rows, cleaned_data)
 
-        return {
+        return FastJSONResponse({
             "start_date": req.start_date,
             "end_date": req.end_date,
             "total_result": len(cleaned_data),
             "data": cleaned_data
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/v1/{domain}/history")
-async def get_history(domain: str, req: HistoryRequest):
-    scraper_map = SCRAPERS.get(domain.lower())
+async def get_history(domain: str, req: HistoryRequest, fmt: Optional[str] = Query(None, alias="format"),
+                      normalize: bool = False):
+    domain = domain.lower()
+    scraper_map = SCRAPERS.get(domain)
     if not scraper_map or "history" not in scraper_map:
         raise HTTPException(status_code=404, detail=f"No history scraper found for domain '{domain}'")
+    check_format(fmt, normalize)
 
     try:
-        history_scraper_class = scraper_map["history"]
-        history_scraper = history_scraper_class()
-
-        history_data = history_scraper.scrape(req.event_id)
-
-        if not history_data:
-            raise HTTPException(status_code=404, detail=f"No history data found for event_id {req.event_id}")
-
-        return history_data
+        history_data = await response_cache.get_or_fetch(
+            f"{domain}:history:{req.event_id}",
+            lambda: fetch_history(domain, req.event_id),
+            ttl=settings.HISTORY_TTL,
+            stale_ttl=settings.CACHE_STALE_TTL,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    if not history_data:
+        raise HTTPException(status_code=404, detail=f"No history data found for event_id {req.event_id}")
+    if fmt:
+        return await exported(lambda: export.history_frame(history_data["history_data"]), fmt,
+                              f"history-{req.event_id}")
+    if normalize:
+        history_data = await http_client.run_blocking(normalize_history, history_data)
+    return FastJSONResponse(history_data)
+
+
+# Background refresh of the endpoints almost every client polls
+async def prefetch_latest(domain: str):
+    await response_cache.refresh(
+        f"{domain}:latest", lambda: fetch_latest(domain),
+        ttl=settings.LATEST_NEWS_TTL, stale_ttl=settings.CACHE_STALE_TTL,
+    )
+
+
+async def prefetch_calendar(date_str: str):
+    scraper_class = SCRAPERS["forexfactory"]["calendar"]
+    if scraper_class.settled(date_str):
+        # Settled days never change; only fill the cache when they are missing
+        return await cached_calendar("forexfactory", date_str)
+    return await response_cache.refresh(
+        f"forexfactory:calendar:{date_str}", lambda: fetch_calendar("forexfactory", date_str),
+        ttl=scraper_class.day_ttl(date_str), stale_ttl=settings.CACHE_STALE_TTL,
+    )
+
+
+async def prefetch_today():
+    await prefetch_calendar(date.today().isoformat())
+
+
+async def prefetch_week():
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    for offset in range(7):
+        day = monday + timedelta(days=offset)
+        if day != today:  # today has its own, faster job
+            await prefetch_calendar(day.isoformat())
+
+
+async def prefetch_red_histories():
+    # Reuse today's calendar from the cache; it is fetched only if the calendar job has not run yet
+    calendar = await cached_calendar("forexfactory", date.today().isoformat())
+    event_ids = dict.fromkeys(str(row["event_id"]) for row in calendar["data"] if row.get("impact") == "red")
+    for event_id in event_ids:
+        await response_cache.refresh(
+            f"forexfactory:history:{event_id}", lambda: fetch_history("forexfactory", event_id),
+            ttl=settings.HISTORY_TTL, stale_ttl=settings.CACHE_STALE_TTL,
+        )
+
+
+scheduler = PrefetchScheduler()
+scheduler.add("cnbc:latest", lambda: prefetch_latest("cnbc"), settings.PREFETCH_LATEST_INTERVAL)
+scheduler.add("investing:latest", lambda: prefetch_latest("investing"), settings.PREFETCH_LATEST_INTERVAL)
+scheduler.add("forexfactory:calendar:today", prefetch_today, settings.PREFETCH_CALENDAR_INTERVAL)
+scheduler.add("forexfactory:calendar:week", prefetch_week, settings.PREFETCH_WEEK_INTERVAL)
+scheduler.add("forexfactory:history:red", prefetch_red_histories, settings.PREFETCH_HISTORY_INTERVAL)
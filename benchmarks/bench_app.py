@@ -0,0 +1,236 @@
+"""
+End-to-end throughput of app.py against the local upstream stub.
+
+Starts benchmarks.stub_server and `uvicorn app:app` (with SCRAPER_UPSTREAM_URL pointing
+at the stub) as subprocesses, then:
+
+1. parse µs/page: each fixture through its scraper's parse function, in process
+2. load: every API route under `--concurrency` concurrent clients, reporting
+   requests/sec and p50 / p99 latency
+
+Fixtures and request parameters come from benchmarks/fixtures/ (record them with
+`python -m benchmarks.record`, or `--synthetic` to generate a set). Response caches
+are disabled (TTLs 0, request coalescing off) so every request scrapes, even when
+concurrent clients ask for the same key; pass --cached to keep the defaults.
+Rate limits are lifted so the stub, not the limiter, sets the pace.
+
+Usage:
+    python -m benchmarks.bench_app [--concurrency 16] [--requests 200] [--delay 0.05] [--cached] [routes ...]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import timeit
+from glob import glob
+
+import httpx
+
+from benchmarks.record import load_manifest
+from benchmarks.stub_server import FIXTURES_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parsers_by_fixture():
+    """Fixture file name prefix -> callable(bytes) running the scraper's parse path"""
+    from scraper import cnbc_scraper, investing_scraper, parsers
+    from scraper.cache import ResponseCache
+    from scraper.forexfactory_scraper import HistoryScraper, RangeScraper, Scraper
+
+    class Body:
+        # Just enough of a response for the parse functions that take one
+        def __init__(self, content):
+            self.content = content
+
+        def json(self):
+            return json.loads(self.content)
+
+    def calendar(body):
+        scraper = Scraper("2025-01-06")
+        scraper.parse_calendar_page(parsers.parse_html(body))
+        return scraper.clean_data()
+
+    history = HistoryScraper(store=False)
+    ranges = RangeScraper("2025-01-06", "2025-01-12", cache=ResponseCache())
+    return {
+        "cnbc_latest": lambda body: cnbc_scraper.parse_latest_news(body.decode("utf-8")),
+        "cnbc_detail": lambda body: cnbc_scraper.parse_detail_page(body, ""),
+        "cnbc_search": lambda body: cnbc_scraper.parse_search_results(Body(body), "bench"),
+        "investing_latest": investing_scraper.parse_latest_news,
+        "investing_detail": investing_scraper.parse_detail_page,
+        "investing_search": lambda body: investing_scraper.parse_search_results(Body(body)),
+        "forexfactory_calendar": calendar,
+        "forexfactory_details": lambda body: history.parse_event_history(json.loads(body)),
+        "forexfactory_history": lambda body: history.parse_history_page(json.loads(body)),
+        "forexfactory_range": lambda body: ranges.parse_events(json.loads(body)),
+    }
+
+
+def bench_parse(fixtures_dir: str, repeat: int):
+    extractors = parsers_by_fixture()
+    print(f"{'fixture':<32} {'KB':>8} {'µs/page':>10}")
+    for path in sorted(glob(os.path.join(fixtures_dir, "*.*"))):
+        name = os.path.basename(path)
+        extractor = next((func for prefix, func in extractors.items() if name.startswith(prefix)), None)
+        if extractor is None:
+            continue
+        with open(path, "rb") as f:
+            body = f.read()
+        seconds = timeit.timeit(lambda: extractor(body), number=repeat) / repeat
+        print(f"{name[:32]:<32} {len(body) / 1024:8.1f} {seconds * 1e6:10.0f}")
+
+
+def api_routes(params: dict) -> dict:
+    start, end = params["range"]
+    return {
+        "cnbc-latest": ("GET", "/v1/cnbc/latest-news", None),
+        "cnbc-search": ("POST", "/v1/cnbc/search-news", {"keyword": params["keyword"]}),
+        "cnbc-detail": ("POST", "/v1/cnbc/detail-page", {"url": params["cnbc_article"]}),
+        "investing-latest": ("GET", "/v1/investing/latest-news", None),
+        "investing-search": ("POST", "/v1/investing/search-news", {"keyword": params["keyword"]}),
+        "investing-detail": ("POST", "/v1/investing/detail-page", {"url": params["investing_article"]}),
+        "forexfactory-calendar": ("POST", "/v1/forexfactory/calendar", {"date": params["date"]}),
+        "forexfactory-history": ("POST", "/v1/forexfactory/history", {"event_id": params["event_id"]}),
+        "forexfactory-range": ("POST", "/v1/forexfactory/range", {"start_date": start, "end_date": end}),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def app_env(upstream: str, cached: bool) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "SCRAPER_UPSTREAM_URL": upstream,
+        "SCRAPER_PREFETCH": "0",
+        "SCRAPER_NEWS_INDEX_PATH": "",
+        "SCRAPER_HISTORY_STORE_PATH": "",
+        "SCRAPER_RANGE_CACHE_PATH": "",
+        "SCRAPER_CACHE_PATH": "",
+        "SCRAPER_RATE_LIMIT": "1000000",
+        "SCRAPER_FOREXFACTORY_RATE_LIMIT": "1000000",
+        "SCRAPER_RATE_LIMIT_BURST": "1000000",
+    })
+    if not cached:
+        for name in ("LATEST_NEWS_TTL", "CALENDAR_TTL", "CALENDAR_PAST_TTL", "HISTORY_TTL", "CACHE_STALE_TTL",
+                     "CACHE_ERROR_TTL", "RANGE_PAST_TTL"):
+            env[f"SCRAPER_{name}"] = "0"
+        env["SCRAPER_CACHE_COALESCE"] = "0"
+    return env
+
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args} exited with code {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+async def load(base_url: str, method: str, path: str, body, requests: int, concurrency: int):
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker(client):
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("routes", nargs="*", help="route names to run (default: all)")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per route")
+    parser.add_argument("--delay", type=float, default=0.0, help="stub upstream latency in seconds")
+    parser.add_argument("--repeat", type=int, default=50, help="parse repetitions per fixture")
+    parser.add_argument("--cached", action="store_true", help="keep response caching on")
+    parser.add_argument("--skip-parse", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="show stub and app output")
+    args = parser.parse_args()
+
+    try:
+        params = load_manifest(args.fixtures)["params"]
+    except FileNotFoundError:
+        parser.error(f"no fixtures in {args.fixtures}; run python -m benchmarks.record (or --synthetic) first")
+    routes = api_routes(params)
+    selected = args.routes or list(routes)
+    unknown = [name for name in selected if name not in routes]
+    if unknown:
+        parser.error(f"unknown route(s) {', '.join(unknown)}; choose from {', '.join(routes)}")
+
+    if not args.skip_parse:
+        bench_parse(args.fixtures, args.repeat)
+        print()
+
+    output = None if args.verbose else subprocess.DEVNULL
+    stub_port, app_port = free_port(), free_port()
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_server", "--port", str(stub_port),
+         "--delay", str(args.delay), "--fixtures", args.fixtures],
+        cwd=ROOT, stdout=output, stderr=output,
+    )
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(app_port), "--log-level", "warning"],
+        cwd=ROOT, env=app_env(f"http://127.0.0.1:{stub_port}", args.cached), stdout=output, stderr=output,
+    )
+    base_url = f"http://127.0.0.1:{app_port}"
+    try:
+        wait_until_up(f"http://127.0.0.1:{stub_port}/", stub)
+        wait_until_up(f"{base_url}/v1/pool-stats", app)
+
+        print(f"concurrency {args.concurrency}, {args.requests} requests per route, "
+              f"stub delay {args.delay * 1000:.0f} ms, cache {'on' if args.cached else 'off'}")
+        print(f"{'route':<24} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for name in selected:
+            method, path, body = routes[name]
+            asyncio.run(load(base_url, method, path, body, args.warmup, args.concurrency))
+            latencies, errors, elapsed = asyncio.run(
+                load(base_url, method, path, body, args.requests, args.concurrency)
+            )
+            print(f"{name:<24} {len(latencies) / elapsed:8.1f} {percentile(latencies, 0.5) * 1000:8.1f} "
+                  f"{percentile(latencies, 0.99) * 1000:8.1f} {errors:7d}")
+    finally:
+        app.terminate()
+        stub.terminate()
+        app.wait()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare the calendar cleaning pipelines.
+
+legacy:    json.dump(indent=4) -> pd.read_json -> ffill -> json.dump(indent=4)
+in-memory: Scraper.clean_data on the parsed rows
+
+Usage:
+    python -m benchmarks.bench_clean_data [--rows 120] [--repeat 200]
+"""
+import argparse
+import json
+import os
+import tempfile
+import timeit
+
+from scraper.forexfactory_scraper import Scraper
+
+
+def make_rows(count: int):
+    """Rows shaped like parse_event_row output: one day header followed by continuation rows"""
+    rows = []
+    for i in range(count):
+        first_of_day = i % 12 == 0
+        rows.append({
+            "event_id": str(140000 + i),
+            "day": f"Mon Sep {i // 12 + 1}" if first_of_day else "",
+            "date": f"Sep {i // 12 + 1}" if first_of_day else "",
+            "time": "8:30am" if i % 3 == 0 else "",
+            "currency": "USD",
+            "impact": "red",
+            "event": f"Event {i}",
+            "actual": "0.3%",
+            "forecast": "0.2%",
+            "previous": "0.1%",
+        })
+    return rows
+
+
+def legacy_clean(rows, workdir):
+    import pandas as pd
+
+    raw_path = os.path.join(workdir, "calendar_data.json")
+    with open(raw_path, "w") as f:
+        json.dump(rows, f, indent=4)
+
+    df = pd.read_json(raw_path)
+    df.loc[(df.day == "") | (df.day == "All") | df.day.str.contains("all|am|pm", case=False), "day"] = None
+    df.day = df.day.ffill()
+    df.loc[(df.date == "") | (df.date == "Day"), "date"] = None
+    df.date = df.date.ffill()
+    df.loc[(df.time == ""), "time"] = None
+    df.time = df.time.ffill()
+    cleaned_data = df.to_dict(orient="records")
+
+    with open(os.path.join(workdir, "cleaned_calendar_data.json"), "w") as f:
+        # read_json turns the "date" column into Timestamps, which json.dump rejects
+        json.dump(cleaned_data, f, indent=4, default=str)
+    return cleaned_data
+
+
+def in_memory_clean(rows):
+    scraper = Scraper("2025-09-01")
+    scraper.details = rows
+    return scraper.clean_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=120, help="rows per calendar page")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    with tempfile.TemporaryDirectory() as workdir:
+        legacy = timeit.timeit(lambda: legacy_clean(rows, workdir), number=args.repeat) / args.repeat
+    in_memory = timeit.timeit(lambda: in_memory_clean(rows), number=args.repeat) / args.repeat
+
+    print(f"rows per page: {args.rows}, repeat: {args.repeat}")
+    print(f"legacy (disk + pandas): {legacy * 1e6:10.1f} µs/call")
+    print(f"in-memory:              {in_memory * 1e6:10.1f} µs/call")
+    print(f"speedup:                {legacy / in_memory:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
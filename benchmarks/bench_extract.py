@@ -0,0 +1,77 @@
+"""
+Embedded-JSON extraction: full BeautifulSoup DOM + script lookup vs the raw-bytes fast path.
+
+Uses investing_*.html and cnbc_detail*.html pages from benchmarks/fixtures/, or a
+generated Next.js-style page with --synthetic.
+
+Usage:
+    python -m benchmarks.bench_extract [--repeat 50] [--synthetic]
+"""
+import argparse
+import json
+import os
+import re
+import timeit
+from glob import glob
+
+from scraper import extract
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def dom_next_data(html: bytes):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    return json.loads(soup.find("script", id="__NEXT_DATA__").text)
+
+
+def dom_s_data(html: bytes):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    script_tag = soup.find("script", attrs={"charset": "UTF-8"})
+    return json.loads(re.search(r"window\.__s_data\s*=\s*(\{.*?\});", script_tag.string).group(1))
+
+
+def synthetic_next_data_page() -> bytes:
+    news = [{"id": i, "title": f"Headline {i}", "link": f"/news/{i}", "body": "lorem ipsum " * 40} for i in range(60)]
+    payload = {"props": {"pageProps": {"state": {"newsStore": {"_news": news}}}}}
+    filler = "".join(f'<div class="card-{i}"><p>{"lorem ipsum " * 20}</p></div>' for i in range(400))
+    return (
+        f'<html><head><title>Latest</title></head><body>{filler}'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(payload)}</script></body></html>'
+    ).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--synthetic", action="store_true")
+    args = parser.parse_args()
+
+    cases = []
+    for path in sorted(glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        name = os.path.basename(path)
+        with open(path, "rb") as f:
+            body = f.read()
+        if name.startswith("investing_"):
+            cases.append((name, body, dom_next_data, lambda b: extract.script_json_by_id(b, "__NEXT_DATA__")))
+        elif name.startswith("cnbc_detail"):
+            cases.append((name, body, dom_s_data, lambda b: extract.assigned_json(b, "window.__s_data")))
+    if args.synthetic:
+        cases.append(("synthetic __NEXT_DATA__", synthetic_next_data_page(), dom_next_data,
+                      lambda b: extract.script_json_by_id(b, "__NEXT_DATA__")))
+    if not cases:
+        parser.error(f"no investing_*/cnbc_detail* fixtures in {FIXTURES_DIR}; record some or pass --synthetic")
+
+    print(f"{'page':<32} {'KB':>6} {'DOM µs':>10} {'fast µs':>10} {'speedup':>8}")
+    for name, body, slow, fast in cases:
+        assert slow(body) == fast(body), f"{name}: fast path disagrees with DOM path"
+        dom = timeit.timeit(lambda: slow(body), number=args.repeat) / args.repeat
+        quick = timeit.timeit(lambda: fast(body), number=args.repeat) / args.repeat
+        print(f"{name[:32]:<32} {len(body) / 1024:6.0f} {dom * 1e6:10.0f} {quick * 1e6:10.0f} {dom / quick:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Keyword counting: the per-keyword `in` loop checker.py used vs the compiled matcher.
+
+Runs against scraper/keywords.txt and again with the list padded to --keywords
+terms, since the loop's cost grows with the number of keywords and the automaton's does not.
+
+Usage:
+    python -m benchmarks.bench_matcher [--keywords 5000] [--words 800] [--repeat 50]
+"""
+import argparse
+import os
+import random
+import timeit
+
+from scraper import matcher
+
+KEYWORDS_PATH = os.path.join(os.path.dirname(matcher.__file__), "keywords.txt")
+
+
+def legacy_count(text, keywords):
+    count = 0
+    text_lower = text.lower()
+    for keyword in keywords:
+        if keyword.lower() in text_lower:
+            count += 1
+    return count
+
+
+def make_article(keywords, words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    vocabulary = ["market", "rates", "inflation", "traders", "said", "the", "on", "growth", "yields", "week"]
+    tokens = [rng.choice(vocabulary) for _ in range(words)]
+    for i in range(0, words, 25):
+        tokens[i] = rng.choice(keywords)
+    return " ".join(tokens)
+
+
+def padded(keywords, size: int):
+    extra = [f"synthetic term {i}" for i in range(max(size - len(keywords), 0))]
+    return keywords + extra
+
+
+def run(label, keywords, text, repeat):
+    compiled = matcher.KeywordMatcher(keywords)
+    assert compiled.count(text) == legacy_count(text, keywords)
+
+    legacy = timeit.timeit(lambda: legacy_count(text, keywords), number=repeat) / repeat
+    fast = timeit.timeit(lambda: compiled.count(text), number=repeat) / repeat
+    print(f"{label:<22} {len(keywords):>6} keywords  loop {legacy * 1e6:9.1f} µs  "
+          f"matcher {fast * 1e6:9.1f} µs  speedup {legacy / fast:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", type=int, default=5000, help="size of the padded keyword list")
+    parser.add_argument("--words", type=int, default=800, help="words per synthetic article")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    keywords = matcher.load_keywords(KEYWORDS_PATH)
+    text = make_article(keywords, args.words)
+
+    print(f"backend: {'pyahocorasick' if matcher.ahocorasick else 'pure Python'}, "
+          f"article: {len(text)} chars, repeat: {args.repeat}")
+    run("keywords.txt", keywords, text, args.repeat)
+    run("padded", padded(keywords, args.keywords), text, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Numeric normalization of history rows: per-row regex vs one batched pandas pass.
+
+per row:  what each client did, a regex match and float() per value, row by row
+batched:  scraper.normalize.normalize_rows, every column parsed at once
+
+Usage:
+    python -m benchmarks.bench_normalize [--rows 5000] [--repeat 5]
+"""
+import argparse
+import math
+import re
+import timeit
+
+from scraper.normalize import HISTORY_COLUMNS, normalize_rows
+from scraper.records import history_row
+
+NUMBER = re.compile(r"(-?\d[\d,]*\.?\d*)\s*([KMBT%]?)")
+MULTIPLIERS = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+SUFFIXES = ["%", "K", "M", "B", "", "%"]
+
+
+def value(i: int) -> str:
+    # A few hundred distinct strings, like one event's history: "0.3%", "-12.5K", "<0.1%", "1,234.5", ""
+    if i % 17 == 0:
+        return ""
+    number = (i * 37) % 400 / 10 - 5
+    prefix = "<" if i % 29 == 0 else ""
+    return f"{prefix}{number:,.1f}{SUFFIXES[i % 6]}" if i % 11 else f"{number * 100:,.1f}"
+
+
+def make_rows(count: int):
+    return [
+        history_row(f"Dec {i % 28 + 1}, {2024 - i // 365}", value(i), value(i + 3), value(i + 7))
+        for i in range(count)
+    ]
+
+
+def parse_value(value):
+    match = NUMBER.search(value or "")
+    if match is None:
+        return None, ""
+    return float(match.group(1).replace(",", "")) * MULTIPLIERS.get(match.group(2), 1.0), match.group(2)
+
+
+def per_row(rows):
+    out = []
+    for row in rows:
+        actual, actual_unit = parse_value(row["history_actual"])
+        forecast, forecast_unit = parse_value(row["history_forecast"])
+        previous, previous_unit = parse_value(row["history_previous"])
+        surprise = round(actual - forecast, 10) if actual is not None and forecast is not None else None
+        out.append({
+            **dict(row),
+            "history_actual_value": actual,
+            "history_forecast_value": forecast,
+            "history_previous_value": previous,
+            "unit": actual_unit or forecast_unit or previous_unit or None,
+            "surprise": surprise,
+            "beat_miss": None if surprise is None else "beat" if surprise > 0 else "miss" if surprise < 0 else "inline",
+        })
+    return out
+
+
+def same(expected, actual) -> bool:
+    # numpy and round() disagree in the last digit for large values
+    return all(
+        x.keys() == y.keys() and all(
+            x[key] == y[key] or isinstance(x[key], float) and math.isclose(x[key], y[key]) for key in x
+        )
+        for x, y in zip(expected, actual)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    assert same(per_row(rows), normalize_rows(rows, HISTORY_COLUMNS))
+    looped = timeit.timeit(lambda: per_row(rows), number=args.repeat) / args.repeat
+    batched = timeit.timeit(lambda: normalize_rows(rows, HISTORY_COLUMNS), number=args.repeat) / args.repeat
+
+    print(f"rows: {args.rows}, repeat: {args.repeat}")
+    print(f"  per row  {looped * 1e3:8.1f} ms   {looped / args.rows * 1e6:6.2f} µs/row")
+    print(f"  batched  {batched * 1e3:8.1f} ms   {batched / args.rows * 1e6:6.2f} µs/row   ({looped / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
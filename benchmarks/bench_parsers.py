@@ -0,0 +1,84 @@
+"""
+Parse time per page for every installed HTML parser backend.
+
+Reads saved pages from benchmarks/fixtures/. The file name prefix picks the extractor:
+cnbc_latest*, cnbc_detail*, investing_latest*, investing_detail*, forexfactory_calendar*.
+Without fixtures, pass --synthetic to generate a CNBC-style latest news page.
+
+Usage:
+    python -m benchmarks.bench_parsers [--repeat 50] [--synthetic] [files ...]
+"""
+import argparse
+import os
+import timeit
+from glob import glob
+
+from scraper import cnbc_scraper, investing_scraper, parsers
+from scraper.forexfactory_scraper import Scraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+EXTRACTORS = {
+    "cnbc_latest": cnbc_scraper.parse_latest_news,
+    "cnbc_detail": lambda html: cnbc_scraper.parse_detail_page(html, ""),
+    "investing_latest": investing_scraper.parse_latest_news,
+    "investing_detail": investing_scraper.parse_detail_page,
+    "forexfactory_calendar": lambda html: Scraper("2025-01-01").parse_calendar_page(parsers.parse_html(html)),
+}
+
+
+def synthetic_cnbc_latest(items: int = 60) -> str:
+    news = "".join(
+        f'<li><div class="LatestNews-container"><div class="LatestNews-headlineWrapper">'
+        f'<span class="LatestNews-wrapper"><time class="LatestNews-timestamp">{i} min ago</time></span>'
+        f'<a class="LatestNews-headline" href="https://www.cnbc.com/2025/01/01/story-{i}.html" '
+        f'title="Headline {i}">Headline number {i} about markets</a></div></div></li>'
+        for i in range(items)
+    )
+    filler = "".join(f'<div class="Card-{i}"><p>{"lorem ipsum " * 20}</p></div>' for i in range(400))
+    return f"<html><head><title>CNBC</title></head><body>{filler}<ul class=\"LatestNews-list\">{news}</ul>{filler}</body></html>"
+
+
+def extractor_for(path: str):
+    name = os.path.basename(path)
+    for prefix, extractor in EXTRACTORS.items():
+        if name.startswith(prefix):
+            return extractor
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--synthetic", action="store_true", help="benchmark a generated CNBC latest page")
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.files or sorted(glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        extractor = extractor_for(path)
+        if extractor is None:
+            print(f"skipping {path}: no extractor for this file name")
+            continue
+        with open(path, encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read(), extractor))
+    if args.synthetic:
+        pages.append(("synthetic cnbc_latest", synthetic_cnbc_latest(), EXTRACTORS["cnbc_latest"]))
+    if not pages:
+        parser.error(f"no fixture pages in {FIXTURES_DIR}; record some or pass --synthetic")
+
+    backends = parsers.available_backends()
+    print(f"{'page':<32} {'KB':>6} " + " ".join(f"{name:>22}" for name in backends))
+    for name, html, extractor in pages:
+        cells = []
+        for backend in backends:
+            parsers.set_backend(backend)
+            parse = timeit.timeit(lambda: parsers.parse_html(html), number=args.repeat) / args.repeat
+            total = timeit.timeit(lambda: extractor(html), number=args.repeat) / args.repeat
+            cells.append(f"{parse * 1e6:9.0f} / {total * 1e6:9.0f}")
+        print(f"{name[:32]:<32} {len(html) / 1024:6.0f} " + " ".join(f"{cell:>22}" for cell in cells))
+    print("values: parse µs/page / parse+extract µs/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Calendar/history rows: response serialization and memory per row.
+
+dict + jsonable_encoder:    what FastAPI did for a returned dict of row dicts
+dict + orjson:              FastJSONResponse on the scraper.records row dicts (what ships)
+slotted records + orjson:   the same rows as slotted dataclasses, which orjson encodes natively
+
+Slotted records take less memory per row but orjson encodes them several times slower
+than dicts, so rows stay dicts; this benchmark keeps that trade-off measured.
+
+Usage:
+    python -m benchmarks.bench_records [--rows 50000] [--repeat 5]
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+
+from scraper import records
+from scraper.records import event_row, history_row
+
+
+@dataclass(slots=True)
+class SlottedEvent:
+    event_id: object
+    day: object
+    date: object
+    time: object
+    currency: object
+    impact: str
+    event: object
+    actual: object
+    forecast: object
+    previous: object
+
+
+@dataclass(slots=True)
+class SlottedHistory:
+    date: str
+    history_actual: object
+    history_forecast: object
+    history_previous: object
+
+
+def event_values(i: int):
+    return (140000 + i, "Mon", f"Sep {i % 28 + 1}", "8:30am", "USD", "red", f"Event {i}",
+            f"{i % 10}.{i % 7}%", "0.2%", "0.1%")
+
+
+def history_values(i: int):
+    return (f"Sep {i}", "1.0%", "0.9%", "0.8%")
+
+
+def make_dicts(count: int):
+    return [event_row(*event_values(i)) for i in range(count)]
+
+
+def make_records(count: int):
+    return [SlottedEvent(*event_values(i)) for i in range(count)]
+
+
+def make_history_dicts(count: int):
+    return [history_row(*history_values(i)) for i in range(count)]
+
+
+def make_history_records(count: int):
+    return [SlottedHistory(*history_values(i)) for i in range(count)]
+
+
+def measure_memory(build, count: int) -> float:
+    tracemalloc.start()
+    rows = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return current / count
+
+
+def generic_encode(rows):
+    from fastapi.encoders import jsonable_encoder
+
+    return json.dumps(jsonable_encoder({"total_result": len(rows), "data": rows})).encode("utf-8")
+
+
+def fast_encode(rows):
+    return records.dumps({"total_result": len(rows), "data": rows})
+
+
+def record_encode(rows):
+    # orjson encodes dataclasses natively; the stdlib fallback needs them as dicts
+    if records.orjson is not None:
+        return records.orjson.dumps({"total_result": len(rows), "data": rows})
+    return records.dumps({"total_result": len(rows), "data": [
+        {name: getattr(row, name) for name in row.__slots__} for row in rows
+    ]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"rows: {args.rows}, repeat: {args.repeat}, orjson: {records.orjson is not None}")
+    for label, as_dicts, as_records in (("calendar", make_dicts, make_records),
+                                        ("history", make_history_dicts, make_history_records)):
+        dict_mem = measure_memory(as_dicts, args.rows)
+        record_mem = measure_memory(as_records, args.rows)
+
+        dict_rows, record_rows = as_dicts(args.rows), as_records(args.rows)
+        assert json.loads(generic_encode(dict_rows)) == json.loads(fast_encode(dict_rows))
+        assert json.loads(fast_encode(dict_rows)) == json.loads(record_encode(record_rows))
+        generic = timeit.timeit(lambda: generic_encode(dict_rows), number=args.repeat) / args.repeat
+        fast = timeit.timeit(lambda: fast_encode(dict_rows), number=args.repeat) / args.repeat
+        slotted = timeit.timeit(lambda: record_encode(record_rows), number=args.repeat) / args.repeat
+
+        print(f"{label}:")
+        print(f"  memory per row   dict {dict_mem:7.0f} B   slotted record {record_mem:7.0f} B")
+        print(f"  serialize        dict + jsonable_encoder   {generic * 1e3:8.1f} ms")
+        print(f"                   dict + orjson             {fast * 1e3:8.1f} ms   ({generic / fast:.1f}x)")
+        print(f"                   slotted records + orjson  {slotted * 1e3:8.1f} ms   ({slotted / fast:.1f}x dict + orjson)")
+
+
+if __name__ == "__main__":
+    main()
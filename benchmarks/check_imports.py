@@ -0,0 +1,112 @@
+"""
+Import-time budget check for the API and scraper modules.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for every
+target (best of --runs), then fails when a target takes longer than its budget or
+pulls in a module it must only load on first use: the HTTP clients, pandas / pyarrow,
+botasaurus, prometheus_client, and for app.py the scraper modules themselves.
+Interpreter startup (site, .pth files) is not counted.
+
+Budgets are generous on purpose; the forbidden-module list is the sharp check. Scale
+them with --scale on slow machines.
+
+Usage:
+    python -m benchmarks.check_imports [--runs 3] [--scale 1.0] [--top 8] [targets ...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED = ("httpx", "requests", "pandas", "pyarrow", "botasaurus_requests", "botasaurus", "prometheus_client")
+SCRAPER_MODULES = ("scraper.cnbc_scraper", "scraper.investing_scraper", "scraper.forexfactory_scraper")
+
+# target -> (budget in ms, modules it must not import)
+TARGETS = {
+    "app": (600, DEFERRED + SCRAPER_MODULES),
+    "scraper.cnbc_scraper": (150, DEFERRED),
+    "scraper.investing_scraper": (150, DEFERRED),
+    "scraper.forexfactory_scraper": (150, DEFERRED),
+    "scraper.export": (50, DEFERRED),
+    "scraper.normalize": (50, DEFERRED),
+}
+
+
+def import_times(module: str) -> list:
+    """
+    One `-X importtime` run.
+    Returns:
+        list: (depth, name, self µs, cumulative µs) per imported module, in report order
+    """
+    # The SQLite files default to a fresh, empty data dir: importing must not create them
+    env = {
+        name: value for name, value in os.environ.items()
+        if not (name.startswith("SCRAPER_") and name.endswith("_PATH"))
+    }
+    with tempfile.TemporaryDirectory() as data_dir:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, env=dict(env, SCRAPER_DATA_DIR=data_dir), capture_output=True, text=True,
+        )
+        created = os.listdir(data_dir)
+    if result.returncode:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    if created:
+        raise RuntimeError(f"import {module} created {', '.join(created)} in SCRAPER_DATA_DIR")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def check(module: str, budget_ms: float, forbidden: tuple, runs: int, top: int) -> bool:
+    best = None
+    for _ in range(runs):
+        rows = import_times(module)
+        total = next(cumulative for depth, name, _, cumulative in rows if depth == 0 and name == module)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+    loaded = {name for _, name, _, _ in rows}
+    leaked = sorted(name for name in forbidden if name in loaded)
+    ok = total / 1000 <= budget_ms and not leaked
+    print(f"{module:<32} {total / 1000:8.1f} {budget_ms:8.0f}  {'ok' if ok else 'FAIL'}")
+    for name in leaked:
+        print(f"    imports {name}")
+    if not ok:
+        # Slowest imports inside the target, by cumulative time
+        inside = [row for row in rows if row[0] >= 1]
+        for depth, name, _, cumulative in sorted(inside, key=lambda row: -row[3])[:top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {'  ' * (depth - 1)}{name}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", help="modules to check (default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="imports per target; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    parser.add_argument("--top", type=int, default=8, help="slow imports listed for a failing target")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.targets if name not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s) {', '.join(unknown)}; choose from {', '.join(TARGETS)}")
+
+    print(f"{'module':<32} {'ms':>8} {'budget':>8}")
+    results = [
+        check(name, TARGETS[name][0] * args.scale, TARGETS[name][1], max(args.runs, 1), args.top)
+        for name in args.targets or TARGETS
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
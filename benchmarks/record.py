@@ -0,0 +1,230 @@
+"""
+Record upstream responses for every route in app.SCRAPERS into benchmarks/fixtures/.
+
+Live mode fetches through scraper.http_client, with the same URLs, headers and
+browser sessions as the scrapers: CNBC world page, article and queryly search;
+Investing latest news, article and search; ForexFactory calendar page, event
+details, history pages and an apply-settings range. The article URLs and the event
+id come from the recorded listings. manifest.json notes what was recorded, and
+benchmarks.bench_app reads its request parameters from there.
+
+--synthetic writes generated pages in the same layout, which is enough to exercise
+every parser offline, e.g. in CI.
+
+Usage:
+    python -m benchmarks.record [--date 2025-01-06] [--keyword fed] [--history-pages 5]
+    python -m benchmarks.record --synthetic
+"""
+import argparse
+import json
+import os
+import time
+from datetime import date, timedelta
+
+from benchmarks.bench_extract import synthetic_next_data_page
+from benchmarks.bench_parsers import synthetic_cnbc_latest
+from benchmarks.stub_server import FIXTURES_DIR
+
+MANIFEST = "manifest.json"
+
+
+def save(fixtures_dir: str, name: str, body: bytes):
+    with open(os.path.join(fixtures_dir, name), "wb") as f:
+        f.write(body)
+    print(f"  {name:<32} {len(body) / 1024:8.1f} KB")
+
+
+def record_live(fixtures_dir: str, day: str, keyword: str, history_pages: int) -> dict:
+    from scraper import cnbc_scraper, http_client, investing_scraper, parsers
+    from scraper.forexfactory_scraper import HEADERS, RangeScraper, Scraper
+
+    recorded = {}
+
+    def get(name, method, url, **options):
+        response = http_client.fetch(method, url, **options)
+        save(fixtures_dir, name, response.content)
+        recorded[name] = {"method": method, "url": url}
+        return response
+
+    # CNBC
+    page = get("cnbc_latest.html", "GET", cnbc_scraper.LATEST_NEWS_URL, headers=cnbc_scraper.LATEST_NEWS_HEADERS)
+    cnbc_article = next(item["news_url"] for item in cnbc_scraper.parse_latest_news(page.text) if item["news_url"])
+    get("cnbc_detail.html", "GET", cnbc_article, headers=cnbc_scraper.DETAIL_HEADERS)
+    get("cnbc_search.json", "GET", cnbc_scraper._search_url(keyword), headers=cnbc_scraper.SEARCH_HEADERS)
+
+    # Investing.com
+    page = get("investing_latest.html", "GET", investing_scraper.LATEST_NEWS_URL, headers=investing_scraper.XHR_HEADERS)
+    investing_article = investing_scraper.parse_latest_news(page.content)[0]["url"]
+    get("investing_detail.html", "GET", investing_article, headers=investing_scraper.DETAIL_HEADERS)
+    get("investing_search.json", "POST", investing_scraper.SEARCH_URL, headers=investing_scraper.XHR_HEADERS,
+        data=investing_scraper._search_payload(keyword))
+
+    # ForexFactory: calendar page, then the first red (else any) event's details and history
+    calendar = Scraper(day)
+    page = get("forexfactory_calendar.html", "GET", calendar.base_url)
+    calendar.parse_calendar_page(parsers.parse_html(page.text))
+    rows = calendar.clean_data()
+    event = next((row for row in rows if row["impact"] == "red"), rows[0])
+    event_id = str(event["event_id"])
+    get("forexfactory_details.json", "GET", f"https://www.forexfactory.com/calendar/details/1-{event_id}",
+        headers=HEADERS)
+    for i in range(1, history_pages + 1):
+        response = get(f"forexfactory_history_{i}.json", "POST",
+                       f"https://www.forexfactory.com/calendar/history/1-{event_id}?i={i}", headers=HEADERS)
+        if not response.json()["data"]["history"].get("has_more"):
+            break
+
+    start = date.fromisoformat(day)
+    end = (start + timedelta(days=6)).isoformat()
+    scraper = RangeScraper(day, end)
+    get("forexfactory_range.json", "POST", scraper.url, headers=scraper.headers,
+        data=json.dumps(scraper.build_payload(day, end)))
+
+    return {
+        "recorded": recorded,
+        "params": {
+            "keyword": keyword,
+            "date": day,
+            "range": [day, end],
+            "event_id": event_id,
+            "cnbc_article": cnbc_article,
+            "investing_article": investing_article,
+        },
+    }
+
+
+def synthetic_cnbc_detail() -> bytes:
+    s_data = {"page": {"page": {"url": "https://www.cnbc.com/2025/01/06/story.html", "headline": "Markets rally"}}}
+    paragraphs = "".join(
+        f'<div class="group"><p>Paragraph {i} {"lorem ipsum " * 30}<a href="/quotes/{i}">quote {i}</a></p></div>'
+        for i in range(40)
+    )
+    return (
+        '<html><head><meta itemprop="image" content="https://image.cnbcfm.com/story.jpg"></head><body>'
+        f'<script charset="UTF-8">window.__s_data = {json.dumps(s_data)};</script>'
+        '<div class="RenderKeyPoints-list"><div class="group"><ul><li>Key point</li></ul></div></div>'
+        '<div class="InlineImage-imageEmbedCredit">Getty Images</div>'
+        f'<div class="ArticleBody-articleBody">{paragraphs}</div>'
+        '<time itemprop="datePublished">Published Mon, Jan 6 2025  9:30 AM EST</time></body></html>'
+    ).encode()
+
+
+def synthetic_investing_detail() -> bytes:
+    article = {"source_name": "Reuters", "media": [{"copyright": "Reuters"}]}
+    payload = {"props": {"pageProps": {"state": {"newsStore": {"_article": article}}}}}
+    body = "".join(
+        f'<p>Paragraph {i} {"lorem ipsum " * 30}<a class="aqlink js-hover-me" href="/equities/{i}">Stock {i}</a></p>'
+        for i in range(40)
+    )
+    return (
+        '<html><body><h1 id="articleTitle">Stocks climb</h1>'
+        '<img class="h-full w-full object-contain" src="https://i-invdn-com.investing.com/news/story.jpg">'
+        f'<div id="article">{body}</div>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(payload)}</script></body></html>'
+    ).encode()
+
+
+def synthetic_calendar(events: int = 60) -> bytes:
+    impacts = ["red", "ora", "yel", "gra"]
+    rows = "".join(
+        f'<tr data-event-id="{140000 + i}"><td>{"Mon Jan 6" if i == 0 else ""}</td>'
+        f'<td class="calendar__time">{"8:30am" if i % 3 == 0 else ""}</td>'
+        f'<td class="calendar__currency">USD</td>'
+        f'<td class="calendar__impact"><span class="icon icon--ff-impact-{impacts[i % 4]}"></span></td>'
+        f'<td class="calendar__event"><span class="calendar__event-title">Event {i}</span></td>'
+        f'<td class="calendar__actual">0.{i % 10}%</td><td class="calendar__forecast">0.2%</td>'
+        f'<td class="calendar__previous">0.1%</td></tr>'
+        for i in range(events)
+    )
+    return f'<html><body><table class="calendar__table">{rows}</table></body></html>'.encode()
+
+
+def synthetic_history_events(page: int, count: int = 20) -> list:
+    return [
+        {"event_id": 140000, "date": f"Dec {count - i}, {2024 - page}",
+         "actual": "0.3%", "forecast": "0.2%", "previous": "0.1%"}
+        for i in range(count)
+    ]
+
+
+def record_synthetic(fixtures_dir: str, history_pages: int) -> dict:
+    news = "".join(
+        f'<div class="flexposts__item"><a href="/news/{i}" title="Story {i}" data-source="Reuters">Story {i}</a>'
+        f'<p class="flexposts__preview flexposts__preview--pad">Preview {i}</p>'
+        f'<span class="flexposts__nowrap flexposts__time">1h</span></div>'
+        for i in range(5)
+    )
+    details = {"data": {
+        "linked_threads": {"news": [{"html": news}]},
+        "history": {"events": synthetic_history_events(0), "has_more": history_pages > 0},
+    }}
+    range_days = [{
+        "date": f"{weekday} Jan {6 + d}",
+        "events": [{
+            "id": 150000 + d * 20 + i, "date": f"Jan {6 + d}", "timeLabel": "8:30am", "currency": "USD",
+            "impactClass": "icon--ff-impact-red", "name": f"Event {i}",
+            "actual": "1.2%", "forecast": "1.0%", "previous": "0.9%",
+        } for i in range(20)],
+    } for d, weekday in enumerate(["Mon", "Tue", "Wed", "Thu", "Fri"])]
+
+    save(fixtures_dir, "cnbc_latest.html", synthetic_cnbc_latest().encode())
+    save(fixtures_dir, "cnbc_detail.html", synthetic_cnbc_detail())
+    save(fixtures_dir, "cnbc_search.json", json.dumps({"results": [{
+        "url": f"https://www.cnbc.com/2025/01/06/story-{i}.html", "cn:title": f"Fed story {i}",
+        "section": "Markets", "cn:promoImage": "", "cn:lastPubDate": "2025-01-06T09:30:00",
+    } for i in range(20)]}).encode())
+    save(fixtures_dir, "investing_latest.html", synthetic_next_data_page())
+    save(fixtures_dir, "investing_detail.html", synthetic_investing_detail())
+    save(fixtures_dir, "investing_search.json", json.dumps({"news": [{
+        "link": f"/news/fed-{i}", "providerName": "Reuters", "date": "Jan 06, 2025", "image": "",
+        "name": f"Fed story {i}", "content": "lorem ipsum " * 20,
+    } for i in range(20)]}).encode())
+    save(fixtures_dir, "forexfactory_calendar.html", synthetic_calendar())
+    save(fixtures_dir, "forexfactory_details.json", json.dumps(details).encode())
+    for i in range(1, history_pages + 1):
+        save(fixtures_dir, f"forexfactory_history_{i}.json", json.dumps({"data": {"history": {
+            "events": synthetic_history_events(i), "has_more": i < history_pages,
+        }}}).encode())
+    save(fixtures_dir, "forexfactory_range.json", json.dumps({"days": range_days}).encode())
+
+    return {
+        "recorded": "synthetic",
+        "params": {
+            "keyword": "fed",
+            "date": "2025-01-06",
+            "range": ["2025-01-06", "2025-01-12"],
+            "event_id": "140000",
+            "cnbc_article": "https://www.cnbc.com/2025/01/06/story.html",
+            "investing_article": "https://www.investing.com/news/stock-market-news/story-1",
+        },
+    }
+
+
+def load_manifest(fixtures_dir=None) -> dict:
+    with open(os.path.join(fixtures_dir or FIXTURES_DIR, MANIFEST)) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--date", default=(date.today() - timedelta(days=date.today().weekday())).isoformat(),
+                        help="calendar day to record, YYYY-MM-DD (default: this Monday)")
+    parser.add_argument("--keyword", default="fed")
+    parser.add_argument("--history-pages", type=int, default=5)
+    parser.add_argument("--synthetic", action="store_true", help="write generated fixtures instead of recording")
+    args = parser.parse_args()
+
+    os.makedirs(args.fixtures, exist_ok=True)
+    print(f"Writing fixtures to {args.fixtures}")
+    if args.synthetic:
+        manifest = record_synthetic(args.fixtures, args.history_pages)
+    else:
+        manifest = record_live(args.fixtures, args.date, args.keyword, args.history_pages)
+    manifest["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    with open(os.path.join(args.fixtures, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
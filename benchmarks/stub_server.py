@@ -0,0 +1,143 @@
+"""
+Local upstream stub serving recorded fixtures from benchmarks/fixtures/.
+
+Point the app at it with SCRAPER_UPSTREAM_URL; the fetch layer then requests
+http://<stub>/<original host>/<original path>, and every route the scrapers use is
+answered from the matching fixture (see ROUTES). History pages past the last recorded
+one come back empty with has_more false, so pagination always ends.
+
+Usage:
+    python -m benchmarks.stub_server [--port 8900] [--delay 0.05] [--fixtures DIR]
+    SCRAPER_UPSTREAM_URL=http://127.0.0.1:8900 uvicorn app:app
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+HTML = "text/html; charset=utf-8"
+JSON = "application/json"
+
+# (method, host, path pattern, fixture, content type); first match wins
+ROUTES = [
+    ("GET", "www.cnbc.com", r"/world/?", "cnbc_latest.html", HTML),
+    ("GET", "www.cnbc.com", r"/.+", "cnbc_detail.html", HTML),
+    ("GET", "api.queryly.com", r"/cnbc/json\.aspx", "cnbc_search.json", JSON),
+    ("GET", "www.investing.com", r"/news/latest-news", "investing_latest.html", HTML),
+    ("POST", "www.investing.com", r"/search/service/SearchInnerPage", "investing_search.json", JSON),
+    ("GET", "www.investing.com", r"/.+", "investing_detail.html", HTML),
+    ("GET", "www.forexfactory.com", r"/calendar", "forexfactory_calendar.html", HTML),
+    ("GET", "www.forexfactory.com", r"/calendar/details/1-\d+", "forexfactory_details.json", JSON),
+    ("POST", "www.forexfactory.com", r"/calendar/history/1-\d+", "forexfactory_history_{page}.json", JSON),
+    ("POST", "www.forexfactory.com", r"/calendar/apply-settings/1", "forexfactory_range.json", JSON),
+]
+
+LAST_HISTORY_PAGE = json.dumps({"data": {"history": {"events": [], "has_more": False}}}).encode()
+
+
+def route(method: str, path: str):
+    """
+    Fixture for an upstream request as the stub receives it.
+    Args:
+        method (str): HTTP method
+        path (str): "/<host>/<path>?<query>"
+    Returns:
+        tuple: (fixture file name, content type), or None when no route matches
+    """
+    parts = urlsplit(path)
+    host, _, rest = parts.path.lstrip("/").partition("/")
+    rest = "/" + rest
+    for route_method, route_host, pattern, fixture, content_type in ROUTES:
+        if method == route_method and host == route_host and re.fullmatch(pattern, rest):
+            page = parse_qs(parts.query).get("i", ["1"])[0]
+            return fixture.format(page=page), content_type
+    return None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real upstreams
+    fixtures_dir = FIXTURES_DIR
+    delay = 0.0
+    _cache = {}
+
+    def do_GET(self):
+        self.answer()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.answer()
+
+    def answer(self):
+        if self.delay:
+            time.sleep(self.delay)
+        match = route(self.command, self.path)
+        if match is None:
+            return self.send(404, b"no stub route", "text/plain")
+        fixture, content_type = match
+        body = self.load(fixture)
+        if body is None and fixture.startswith("forexfactory_history_"):
+            body = LAST_HISTORY_PAGE
+        if body is None:
+            return self.send(404, f"fixture {fixture} not recorded".encode(), "text/plain")
+        self.send(200, body, content_type)
+
+    def load(self, fixture: str):
+        if fixture not in self._cache:
+            path = os.path.join(self.fixtures_dir, fixture)
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as f:
+                self._cache[fixture] = f.read()
+        return self._cache[fixture]
+
+    def send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8900, fixtures_dir=None, delay=0.0) -> ThreadingHTTPServer:
+    """Stub server bound to host:port (port 0 picks a free one); call serve_forever() to run it"""
+    handler = type("Handler", (StubHandler,), {
+        "fixtures_dir": fixtures_dir or FIXTURES_DIR, "delay": delay, "_cache": {},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(**options) -> ThreadingHTTPServer:
+    server = make_server(**options)
+    threading.Thread(target=server.serve_forever, name="upstream-stub", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.fixtures, args.delay)
+    print(f"Serving {args.fixtures} on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import weakref
+
+from scraper import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared across requests so concurrent batches for one domain respect the same limit.
+# Kept per event loop: a semaphore is bound to the loop it first waits on, and scripts
+# call asyncio.run() more than once
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _semaphore(domain: str) -> asyncio.Semaphore:
+    semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if domain not in semaphores:
+        semaphores[domain] = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    return semaphores[domain]
+
+
+async def _fetch_one(domain: str, func, url: str, timeout: float) -> dict:
+    async with _semaphore(domain):
+        try:
+            data = await asyncio.wait_for(func(url), timeout)
+        except asyncio.TimeoutError:
+            return {"url": url, "ok": False, "error": f"Timed out after {timeout}s"}
+        except Exception as e:
+            logger.warning(f"Error fetching {url}: {e}")
+            return {"url": url, "ok": False, "error": str(e)}
+
+    # Scrapers report failures as {"error": ...} rather than raising
+    if isinstance(data, dict) and "error" in data:
+        return {"url": url, "ok": False, "error": data["error"]}
+    return {"url": url, "ok": True, "data": data}
+
+
+async def fetch_many(domain: str, func, urls: list, timeout: float = None):
+    """
+    Run `func` over many URLs concurrently, yielding results as they finish.
+    Args:
+        domain (str): Domain whose concurrency limit applies
+        func (callable): Async detail scraper taking one URL
+        urls (list): URLs to fetch
+        timeout (float): Per-URL timeout in seconds
+    Yields:
+        dict: {"url", "ok", "data"} or {"url", "ok", "error"} per URL
+    """
+    timeout = timeout or settings.BATCH_URL_TIMEOUT
+    tasks = [asyncio.ensure_future(_fetch_one(domain, func, str(url), timeout)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away while streaming: stop the remaining fetches
+        for task in tasks:
+            task.cancel()
+
+
+async def fetch_all(domain: str, func, urls: list, timeout: float = None) -> list:
+    """Like `fetch_many`, but waits for every URL and keeps the input order"""
+    timeout = timeout or settings.BATCH_URL_TIMEOUT
+    return await asyncio.gather(*(_fetch_one(domain, func, str(url), timeout) for url in urls))
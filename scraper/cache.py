@@ -0,0 +1,235 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from scraper import http_client
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class SQLiteBackend:
+    """
+    Persistent second tier so cached responses survive restarts.
+    Rows are kept `keep` seconds past their stale window for ResponseCache's error fallback.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, keep: float = 0):
+        self.max_entries = max_entries
+        self.keep = keep
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "fresh_until REAL NOT NULL, stale_until REAL NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fresh_until, stale_until FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[2] + self.keep <= time.time():
+            return None
+        return CacheEntry(json.loads(row[0]), row[1], row[2])
+
+    def set(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(entry.value), entry.fresh_until, entry.stale_until, time.time()),
+            )
+            # Keep the table bounded: drop expired rows, then the oldest beyond max_entries
+            self._conn.execute("DELETE FROM response_cache WHERE stale_until <= ?", (time.time() - self.keep,))
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+
+class ResponseCache:
+    """
+    In-memory LRU response cache with TTL, stale-while-revalidate and request coalescing.
+
+    Within `ttl` an entry is served as is. Between `ttl` and `ttl + stale_ttl` it is still
+    served, while a single background refresh replaces it. Concurrent misses for one key
+    share a single upstream fetch. For `error_ttl` seconds after that, an expired entry
+    still answers when the fetch raises or returns an uncacheable value (stale-if-error),
+    e.g. while an upstream's circuit breaker is open. With `coalesce=False` every miss
+    fetches on its own.
+    """
+
+    def __init__(self, max_entries: int = 1024, backend=None, cacheable=None, error_ttl: float = 0,
+                 coalesce: bool = True):
+        self.max_entries = max_entries
+        self.backend = backend
+        self.cacheable = cacheable or (lambda value: True)
+        self.error_ttl = error_ttl
+        self.coalesce = coalesce
+        self._entries = OrderedDict()
+        # `peek` and `put` run on worker threads too
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.error_hits = 0
+        self.misses = 0
+
+    async def get_or_fetch(self, key: str, fetch, ttl: float, stale_ttl: float = 0):
+        """
+        Return the cached value for `key`, calling `fetch` when it is missing or expired.
+        Args:
+            key (str): Cache key
+            fetch (callable): Coroutine function producing the value
+            ttl (float): Seconds the value stays fresh
+            stale_ttl (float): Extra seconds the value may be served while refreshing
+        Returns:
+            Any: Cached or freshly fetched value
+        """
+        entry = await self._lookup(key)
+        now = time.time()
+
+        if entry is not None and now < entry.fresh_until:
+            self.hits += 1
+            return entry.value
+
+        if entry is not None and now < entry.stale_until:
+            self.stale_hits += 1
+            self._start_load(key, fetch, ttl, stale_ttl)
+            return entry.value
+
+        self.misses += 1
+        # shield: a client disconnecting must not cancel a fetch other requests share
+        load = asyncio.shield(self._start_load(key, fetch, ttl, stale_ttl))
+        if entry is None or now >= entry.stale_until + self.error_ttl:
+            return await load
+
+        try:
+            value = await load
+        except Exception as e:
+            logger.warning(f"Serving expired {key} after failed refresh: {e}")
+            self.error_hits += 1
+            return entry.value
+        if not self.cacheable(value):
+            logger.warning(f"Serving expired {key} after failed refresh")
+            self.error_hits += 1
+            return entry.value
+        return value
+
+    async def set(self, key: str, value, ttl: float, stale_ttl: float = 0):
+        """Store a value directly, e.g. from a background prefetch"""
+        now = time.time()
+        entry = CacheEntry(value, now + ttl, now + ttl + stale_ttl)
+        self._remember(key, entry)
+        if self.backend is not None:
+            await http_client.run_blocking(self.backend.set, key, entry)
+
+    def peek(self, key: str):
+        """Blocking lookup for sync callers: the fresh value for `key`, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self.backend is not None:
+            entry = self.backend.get(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None or time.time() >= entry.fresh_until:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.value
+
+    def put(self, key: str, value, ttl: float, stale_ttl: float = 0):
+        """Blocking `set` for sync callers"""
+        now = time.time()
+        entry = CacheEntry(value, now + ttl, now + ttl + stale_ttl)
+        self._remember(key, entry)
+        if self.backend is not None:
+            self.backend.set(key, entry)
+
+    async def refresh(self, key: str, fetch, ttl: float, stale_ttl: float = 0):
+        """Fetch and store a value now, regardless of freshness, joining any load already running"""
+        return await asyncio.shield(self._start_load(key, fetch, ttl, stale_ttl))
+
+    async def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            await http_client.run_blocking(self.backend.delete, key)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "error_hits": self.error_hits,
+            "misses": self.misses,
+            "inflight": len(self._inflight),
+        }
+
+    async def _lookup(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if self.backend is not None:
+            entry = await http_client.run_blocking(self.backend.get, key)
+            if entry is not None:
+                self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _start_load(self, key: str, fetch, ttl: float, stale_ttl: float) -> asyncio.Task:
+        task = self._inflight.get(key) if self.coalesce else None
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, fetch, ttl, stale_ttl))
+            task.add_done_callback(self._log_failure)
+            if self.coalesce:
+                self._inflight[key] = task
+        return task
+
+    async def _load(self, key: str, fetch, ttl: float, stale_ttl: float):
+        try:
+            value = await fetch()
+            if self.cacheable(value):
+                await self.set(key, value, ttl, stale_ttl)
+            return value
+        finally:
+            if self.coalesce:
+                self._inflight.pop(key, None)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Cache refresh failed: {task.exception()}")
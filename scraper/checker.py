@@ -1,31 +1,189 @@
+"""
+Score news articles by keyword matches.
+
+Reads articles as NDJSON or a JSON array (detail_page output, or batch detail-pages
+results), scores title and content on a process pool and writes one NDJSON line per
+article, in input order. Input is read incrementally, so memory stays flat however
+large the file is.
+
+Usage:
+    python -m scraper.checker [news_data.json | -] [-o results.ndjson] [--keywords path]
+                              [--workers N] [--batch-size 64]
+"""
+import argparse
 import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from scraper import settings
+from scraper.matcher import KeywordMatcher, compile_keywords, load_keywords
+
+DEFAULT_KEYWORDS_PATH = settings.KEYWORDS_PATH
+
+_decoder = json.JSONDecoder()
+# Characters that may continue a number cut off at the end of a chunk
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+_worker_matcher = None
 
-with open("news_data.json", "r") as f:
-    data = json.load(f)
 
 def load_keywords_from_file(filepath):
-    with open(filepath, "r") as f:
-        keywords = [line.strip().lower() for line in f if line.strip()]
-    return keywords
+    return load_keywords(filepath)
 
 
 def count_keywords(text, keywords):
-    count = 0
-    text_lower = text.lower()
-    for keyword in keywords:
-        if keyword.lower() in text_lower:
-            count += 1
-    return count
-
-
-keywords = load_keywords_from_file("keywords.txt")
-
-for idx, item in enumerate(data):
-    title = item['title']
-    content = item["content"]
-    url = item['url']
-    count_title = count_keywords(title, keywords)
-    count_content = count_keywords(content, keywords)
-    print(f"URL: {url}")
-    print(f"{count_title} keyword matches in Title.")
-    print(f"{count_content} keyword matches in Content.")
\ No newline at end of file
+    """Number of distinct keywords found in the text (one automaton pass, compiled once per list)"""
+    return compile_keywords(tuple(keywords)).count(text)
+
+
+def iter_json_values(fp, chunk_size: int = 1 << 20):
+    """
+    Yield the items of a JSON array, or the values of a whitespace/newline separated
+    stream (NDJSON), without reading the whole file.
+    Args:
+        fp (TextIO): Open text file
+        chunk_size (int): Characters read per refill
+    """
+    buffer = ""
+    pos = 0
+    eof = False
+
+    while True:
+        # Skip whitespace, commas and array brackets between values; a stream of
+        # arrays (one per NDJSON line) is flattened the same way
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] in ",[]"):
+            pos += 1
+
+        if pos < len(buffer):
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                # A bare number followed by nothing or another number character ("1" of "1e-7")
+                # may continue in the next chunk
+                if eof or buffer[pos] in "{\"tfn" or end < len(buffer) and buffer[end] not in _NUMBER_CHARS:
+                    yield value
+                    pos = end
+                    continue
+
+        if eof:
+            return
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_articles(fp):
+    """Articles from detail_page output: plain dicts, lists of dicts, or batch results"""
+    for value in iter_json_values(fp):
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            if "ok" in item and "data" in item:
+                # POST /detail-pages result: {"url", "ok", "data"}
+                if not item["ok"]:
+                    continue
+                data = item["data"]
+                for article in data if isinstance(data, list) else [data]:
+                    yield {"url": item["url"], **article}
+            else:
+                yield item
+
+
+def score_article(article: dict, matcher: KeywordMatcher) -> dict:
+    """
+    Keyword matches for one article.
+    Returns:
+        dict: {"url", "title_matches", "content_matches", "keywords": {keyword: occurrences}}
+    """
+    title = matcher.hits(article.get("title") or "")
+    content = matcher.hits(article.get("content") or "")
+    keywords = dict(title)
+    for keyword, hits in content.items():
+        keywords[keyword] = keywords.get(keyword, 0) + hits
+    return {
+        "url": article.get("url"),
+        "title_matches": len(title),
+        "content_matches": len(content),
+        "keywords": keywords,
+    }
+
+
+def _init_worker(keywords):
+    global _worker_matcher
+    _worker_matcher = KeywordMatcher(keywords)
+
+
+def _score_batch(batch):
+    return [score_article(article, _worker_matcher) for article in batch]
+
+
+def _batches(articles, size: int):
+    batch = []
+    for article in articles:
+        # Only ship what scoring needs to the workers
+        batch.append({"url": article.get("url"), "title": article.get("title"), "content": article.get("content")})
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def score_articles(articles, keywords, workers=None, batch_size: int = 64):
+    """
+    Score an iterable of articles, yielding results in input order.
+    Args:
+        articles (Iterable[dict]): Articles with title, content and url
+        keywords (list): Keywords, compiled once per worker
+        workers (int): Worker processes; 1 scores in this process. Defaults to the CPU count
+        batch_size (int): Articles per task sent to a worker
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        matcher = compile_keywords(tuple(keywords))
+        for article in articles:
+            yield score_article(article, matcher)
+        return
+
+    # Bounded in-flight batches keep memory flat while every worker stays busy
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tuple(keywords),)) as pool:
+        pending = deque()
+        for batch in _batches(articles, batch_size):
+            pending.append(pool.submit(_score_batch, batch))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", default="news_data.json", help="JSON or NDJSON file, '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file, '-' for stdout")
+    parser.add_argument("--keywords", default=DEFAULT_KEYWORDS_PATH, help="keyword list, one per line")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=64, help="articles per worker task")
+    args = parser.parse_args(argv)
+
+    keywords = load_keywords(args.keywords)
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for result in score_articles(iter_articles(source), keywords, args.workers, args.batch_size):
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,36 @@
-import re
-import json
 import logging
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote
+from scraper import extract, http_client, metrics, parsers
 
 
-logging.basicConfig(level=logging.INFO)
+LATEST_NEWS_URL = "https://www.cnbc.com/world/?region=world"
+LATEST_NEWS_HEADERS = {
+    'accept': '*/*',
+    'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8,bho;q=0.7',
+    'content-type': 'application/json',
+    'origin': 'https://www.cnbc.com',
+    'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
+}
+
+SEARCH_URL = "https://api.queryly.com/cnbc/json.aspx"
+QUERYLY_KEY = "31a35d40a9a64ab3"
+SEARCH_HEADERS = {
+    'accept': '*/*',
+    'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
+    'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
+}
+
+DETAIL_HEADERS = {
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
+    'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
+}
+
+http_client.configure_pool("cnbc.com", headers=DETAIL_HEADERS)
+http_client.configure_pool("api.queryly.com", headers=SEARCH_HEADERS)
+
+# Re-polls of the latest news page skip parsing when the news cards are unchanged
+_latest_memo = extract.ParseMemo()
 
 
 def latest_news():
@@ -15,34 +39,67 @@ def latest_news():
     Returns:
         list: Parsed latest news articles
     """
+    try:
+        response = http_client.fetch("GET", LATEST_NEWS_URL, **_latest_news_request())
+    except Exception as e:
+        logging.error(f"Error fetching the URL: {e}")
+        return []
+
+    return _latest_news_result(response)
 
-    URL = "https://www.cnbc.com/world/?region=world"
-    HEADERS = {
-        'accept': '*/*',
-        'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8,bho;q=0.7',
-        'content-type': 'application/json',
-        'origin': 'https://www.cnbc.com',
-        'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-    }
 
+async def latest_news_async():
+    """
+    Non-blocking variant of `latest_news`
+    Returns:
+        list: Parsed latest news articles
+    """
     try:
-        response = requests.get(URL, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
+        response = await http_client.fetch_async("GET", LATEST_NEWS_URL, **_latest_news_request())
+    except Exception as e:
         logging.error(f"Error fetching the URL: {e}")
         return []
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    return await http_client.run_blocking(_latest_news_result, response)
+
+
+def _latest_news_request() -> dict:
+    # Revalidate only once a parse is memoized, so a 304 always has a result to reuse
+    return {"headers": LATEST_NEWS_HEADERS, "timeout": 10, "conditional": LATEST_NEWS_URL in _latest_memo}
+
+
+def _latest_news_result(response):
+    """Parsed latest news, reusing the last parse on a 304 or when the news cards hash the same"""
+    if response.status_code == 304:
+        return _latest_memo.last(LATEST_NEWS_URL)
+
+    cards = extract.region(response.content, b"LatestNews-container", b"</li>")
+    region_digest = extract.digest(cards) if cards is not None else None
+    return _latest_memo.parse(LATEST_NEWS_URL, region_digest, parse_latest_news, response.text)
+
+
+@metrics.timed("cnbc.com", "parse")
+def parse_latest_news(html: str):
+    """
+    Parse the CNBC world page
+    Args:
+        html (str): Page HTML
+    Returns:
+        list: Parsed latest news articles
+    """
+    soup = parsers.parse_html(html)
 
     details = list()
-    latest_news = soup.select(".LatestNews-container")
+    latest_news = soup.css(".LatestNews-container")
 
     for news in latest_news:
         try:
+            headline = news.css_first("a.LatestNews-headline")
+            time = news.css_first("time")
             dd = {
-                "news_url": news.select_one("a.LatestNews-headline")["href"] if news.select_one("a.LatestNews-headline") else "",
-                "title": news.select_one("a.LatestNews-headline").text.strip() if news.select_one("a.LatestNews-headline") else "",
-                "time": news.select_one("time").text.strip() if news.select_one("time") else ""
+                "news_url": headline.attr("href", "") if headline else "",
+                "title": headline.text().strip() if headline else "",
+                "time": time.text().strip() if time else ""
             }
             if dd.get("news_url") or dd.get("title"):
                 details.append(dd)
@@ -52,6 +109,10 @@ def latest_news():
     return details
 
 
+def _search_url(keyword: str) -> str:
+    return f"{SEARCH_URL}?queryly_key={QUERYLY_KEY}&query={quote(keyword)}"
+
+
 def scrape_keyword(keyword: str):
     """
     Search CNBC news articles by keyword.
@@ -60,26 +121,46 @@ def scrape_keyword(keyword: str):
     Returns:
         list: Parsed search results
     """
-    BASE_URL = "https://api.queryly.com/cnbc/json.aspx"
-    QUERYLY_KEY = "31a35d40a9a64ab3"
-    HEADERS = {
-        'accept': '*/*',
-        'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
-        'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-    }
+    logging.info(f"Searching CNBC for keyword: {keyword}")
+
+    try:
+        response = http_client.fetch("GET", _search_url(keyword), headers=SEARCH_HEADERS)
+    except Exception as e:
+        logging.error(f"Error fetching search results: {e}")
+        return {"error": f"Failed to fetch: {e}"}
+
+    return parse_search_results(response, keyword)
 
-    query = quote(keyword)
-    url = f"{BASE_URL}?queryly_key={QUERYLY_KEY}&query={query}"
 
+async def scrape_keyword_async(keyword: str):
+    """
+    Non-blocking variant of `scrape_keyword`
+    Args:
+        keyword (str): Search keyword
+    Returns:
+        list: Parsed search results
+    """
     logging.info(f"Searching CNBC for keyword: {keyword}")
 
     try:
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
+        response = await http_client.fetch_async("GET", _search_url(keyword), headers=SEARCH_HEADERS)
     except Exception as e:
         logging.error(f"Error fetching search results: {e}")
         return {"error": f"Failed to fetch: {e}"}
 
+    return parse_search_results(response, keyword)
+
+
+@metrics.timed("api.queryly.com", "extract")
+def parse_search_results(response, keyword: str):
+    """
+    Parse a queryly search response
+    Args:
+        response (Response): queryly JSON response
+        keyword (str): Search keyword, used for logging
+    Returns:
+        list: Parsed search results
+    """
     try:
         news_data = response.json().get('results', [])
     except Exception as e:
@@ -112,33 +193,57 @@ def detail_page(url: str):
     Returns:
         dict: Parsed article details
     """
-    HEADERS = {
-        'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
-        'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-    }
-
+    url = str(url)
     logging.info(f"Fetching article details from {url}")
 
     try:
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
+        response = http_client.fetch("GET", url, headers=DETAIL_HEADERS)
     except Exception as e:
         logging.error(f"Error fetching page: {e}")
         return {"error": f"Failed to fetch: {e}"}
 
+    return parse_detail_page(response.content, url)
+
+
+async def detail_page_async(url: str):
+    """
+    Non-blocking variant of `detail_page`
+    Args:
+        url (str): CNBC article URL
+    Returns:
+        dict: Parsed article details
+    """
+    url = str(url)
+    logging.info(f"Fetching article details from {url}")
+
     try:
-        soup = BeautifulSoup(response.text, 'html.parser')
+        response = await http_client.fetch_async("GET", url, headers=DETAIL_HEADERS)
+    except Exception as e:
+        logging.error(f"Error fetching page: {e}")
+        return {"error": f"Failed to fetch: {e}"}
 
-        # Extract JSON from script
-        script_tag = soup.find('script', attrs={'charset': "UTF-8"})
-        json_match = re.search(r'window\.__s_data\s*=\s*(\{.*?\});', script_tag.string if script_tag else "")
-        if not json_match:
+    return await http_client.run_blocking(parse_detail_page, response.content, url)
+
+
+@metrics.timed("cnbc.com", "parse")
+def parse_detail_page(body: bytes, url: str):
+    """
+    Parse a CNBC article page
+    Args:
+        body (bytes): Raw page HTML
+        url (str): Article URL, used when the page omits its own
+    Returns:
+        dict: Parsed article details
+    """
+    try:
+        # Decode only the window.__s_data object, straight from the raw bytes
+        with metrics.stage("cnbc.com", "extract"):
+            json_data = extract.assigned_json(body, "window.__s_data")
+        if not json_data:
             logging.error("Failed to extract JSON data")
             return {"error": "No JSON data found"}
 
-        json_string = json_match.group(1)
-        json_data = json.loads(json_string)
+        soup = parsers.parse_html(body)
 
         dd = {}
 
@@ -146,29 +251,30 @@ def detail_page(url: str):
         dd['title'] = json_data['page']['page'].get('headline', '')
 
         # Image and credits
-        image = soup.select_one('meta[itemprop="image"]')
-        image_credit = soup.select_one('div.InlineImage-imageEmbedCredit')
+        image = soup.css_first('meta[itemprop="image"]')
+        image_credit = soup.css_first('div.InlineImage-imageEmbedCredit')
         dd['image_data'] = [{
-            "image_text": image_credit.get_text(strip=True) if image_credit else None,
-            "image": image['content'] if image else None
+            "image_text": image_credit.text(strip=True) if image_credit else None,
+            "image": image.attr('content') if image else None
         }]
 
         # Key points
-        key_points = soup.select_one('div.RenderKeyPoints-list div.group')
-        dd['key_points'] = key_points.get_text(strip=True) if key_points else ""
+        key_points = soup.css_first('div.RenderKeyPoints-list div.group')
+        dd['key_points'] = key_points.text(strip=True) if key_points else ""
 
         # Content
-        contents = soup.select('div.ArticleBody-articleBody div.group')
-        dd['content'] = " ".join(tag.get_text(strip=True) for tag in contents)
+        contents = soup.css('div.ArticleBody-articleBody div.group')
+        dd['content'] = " ".join(tag.text(strip=True) for tag in contents)
 
         # Text links inside article
         dd['text_link'] = list()
-        text_link = soup.select('div.group p a')  
+        text_link = soup.css('div.group p a')
 
         for data in text_link:
             try:
-                text_name = data.text.strip()
-                text_href = urljoin("https://www.cnbc.com/", data['href'])
+                text_name = data.text().strip()
+                href = data.attr('href')
+                text_href = urljoin("https://www.cnbc.com/", href) if href else ""
                 if text_href:
                     dd['text_link'].append(
                         {
@@ -180,11 +286,11 @@ def detail_page(url: str):
                 logging.warning(f"Error parsing text_link: {e}")
 
         # Date & time
-        date_modified = soup.select_one('time[itemprop="dateModified"]')
-        date_published = soup.select_one('time[itemprop="datePublished"]')
+        date_modified = soup.css_first('time[itemprop="dateModified"]')
+        date_published = soup.css_first('time[itemprop="datePublished"]') if not date_modified else None
         datetime_text = (
-            date_modified.get_text("  ", strip=True) if date_modified
-            else date_published.get_text("  ", strip=True) if date_published
+            date_modified.text("  ", strip=True) if date_modified
+            else date_published.text("  ", strip=True) if date_published
             else ""
         )
 
@@ -0,0 +1,198 @@
+"""
+Typed, columnar export of ForexFactory calendar and history rows.
+
+Values such as "2.5%" or "250K" become floats (2.5, 250000.0) with the suffix kept in
+a categorical `unit` column; day/date/time become real timestamps; currency and
+impact are categorical.
+
+Usage:
+    python -m scraper.export range 2025-01-01 2025-03-31 --format parquet -o range.parquet
+    python -m scraper.export history 143203 --format csv -o history.csv
+"""
+import argparse
+import io
+import logging
+import sys
+
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+    "csv": ("text/csv", "csv"),
+}
+
+_MULTIPLIERS = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+_NUMBER = r"(-?\d[\d,]*\.?\d*)\s*([KMBT%]?)"
+_CLOCK = r"^\s*\d{1,2}:\d{2}\s*[ap]m\s*$"
+
+
+def parse_numeric(values):
+    """
+    Vectorized parse of ForexFactory value strings.
+    Args:
+        values (Series): Strings like "2.5%", "-1.2M", "<0.1%", "" or None
+    Returns:
+        tuple: (float Series with K/M/B/T applied, suffix Series: "%", "K", ... or "")
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = pd.Series(values, dtype=object)
+    # Each distinct string is parsed once: a column repeats the same few values
+    codes, uniques = pd.factorize(values)
+    parts = pd.Series(uniques, dtype="string").str.extract(_NUMBER)
+    number = pd.to_numeric(parts[0].str.replace(",", "", regex=False), errors="coerce")
+    suffix = parts[1].fillna("")
+    scale = suffix.map(_MULTIPLIERS).fillna(1.0).astype("float64")
+    scaled = (number * scale).astype("float64").to_numpy()
+    # Code -1 (None / NaN) picks the trailing NaN and ""
+    return (
+        pd.Series(np.append(scaled, np.nan)[codes], index=values.index, dtype="float64"),
+        pd.Series(np.append(suffix.to_numpy(dtype=object), "")[codes], index=values.index, dtype="string"),
+    )
+
+
+def to_timestamps(dates, times=None, start=None):
+    """
+    Combine date (and optional clock time) strings into timestamps.
+    Dates without a year ("Sep 1") take `start`'s year, rolling into the next year
+    when that would land before `start` (ranges that cross New Year).
+    Non-clock times ("All Day", "Tentative") keep midnight.
+    """
+    import pandas as pd
+
+    dates = pd.Series(dates, dtype="string").fillna("").str.strip()
+    if start is not None:
+        start = pd.Timestamp(start)
+        missing_year = ~dates.str.contains(r"\d{4}", regex=True)
+        dates = dates.where(~missing_year, dates + f" {start.year}")
+    if times is not None:
+        times = pd.Series(times, dtype="string", index=dates.index).fillna("")
+        dates = dates + " " + times.where(times.str.match(_CLOCK), "")
+
+    stamps = pd.to_datetime(dates.str.strip(), format="mixed", errors="coerce")
+    if start is not None:
+        rolled = stamps < start - pd.Timedelta(days=1)
+        stamps = stamps.where(~rolled, stamps + pd.DateOffset(years=1))
+    return stamps
+
+
+def _unit(*suffixes):
+    # First non-empty suffix across actual / forecast / previous
+    unit = suffixes[0]
+    for suffix in suffixes[1:]:
+        unit = unit.where(unit != "", suffix)
+    return unit.astype("category")
+
+
+def events_frame(rows, start=None):
+    """
+    Calendar or range events as a typed DataFrame.
+    Args:
+        rows (list): Event row dicts
+        start (str): First date of the request, "YYYY-MM-DD", supplies the year
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records([dict(row) for row in rows], columns=[
+        "event_id", "day", "date", "time", "currency", "impact", "event", "actual", "forecast", "previous",
+    ])
+    actual, actual_unit = parse_numeric(frame["actual"])
+    forecast, forecast_unit = parse_numeric(frame["forecast"])
+    previous, previous_unit = parse_numeric(frame["previous"])
+    return pd.DataFrame({
+        "event_id": pd.to_numeric(frame["event_id"], errors="coerce").astype("Int64"),
+        "timestamp": to_timestamps(frame["date"], frame["time"], start),
+        "time": frame["time"].astype("string"),
+        "currency": frame["currency"].astype("category"),
+        "impact": frame["impact"].astype("category"),
+        "event": frame["event"].astype("string"),
+        "actual": actual,
+        "forecast": forecast,
+        "previous": previous,
+        "unit": _unit(actual_unit, forecast_unit, previous_unit),
+    })
+
+
+def history_frame(rows):
+    """History rows as a typed DataFrame, newest first like the API"""
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records([dict(row) for row in rows], columns=[
+        "date", "history_actual", "history_forecast", "history_previous",
+    ])
+    actual, actual_unit = parse_numeric(frame["history_actual"])
+    forecast, forecast_unit = parse_numeric(frame["history_forecast"])
+    previous, previous_unit = parse_numeric(frame["history_previous"])
+    return pd.DataFrame({
+        "timestamp": to_timestamps(frame["date"]),
+        "actual": actual,
+        "forecast": forecast,
+        "previous": previous,
+        "unit": _unit(actual_unit, forecast_unit, previous_unit),
+    })
+
+
+def encode(frame, fmt: str) -> bytes:
+    """
+    Serialize a frame.
+    Args:
+        frame (DataFrame): events_frame or history_frame output
+        fmt (str): "parquet", "arrow" or "csv"
+    Returns:
+        bytes: File contents
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'; use one of {', '.join(FORMATS)}")
+
+    if fmt == "csv":
+        return frame.to_csv(index=False).encode("utf-8")
+
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    buffer = io.BytesIO()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, buffer, compression="zstd")
+    else:
+        import pyarrow.ipc
+
+        with pa.ipc.new_file(buffer, table.schema, options=pa.ipc.IpcWriteOptions(compression="zstd")) as writer:
+            writer.write_table(table)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    from scraper import settings
+    from scraper.forexfactory_scraper import HistoryScraper, RangeScraper
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    range_parser = commands.add_parser("range", help="calendar events between two dates")
+    range_parser.add_argument("start_date")
+    range_parser.add_argument("end_date")
+    history_parser = commands.add_parser("history", help="past releases of one event")
+    history_parser.add_argument("event_id")
+    for command in (range_parser, history_parser):
+        command.add_argument("--format", choices=list(FORMATS), default="parquet")
+        command.add_argument("-o", "--output", default="-", help="output file, '-' for stdout")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    if args.command == "range":
+        scraper = RangeScraper(args.start_date, args.end_date)
+        frame = events_frame(scraper.parse_events(scraper.scrape()), start=args.start_date)
+    else:
+        frame = history_frame(HistoryScraper().scrape(args.event_id)["history_data"])
+
+    data = encode(frame, args.format)
+    if args.output == "-":
+        sys.stdout.buffer.write(data)
+    else:
+        with open(args.output, "wb") as f:
+            f.write(data)
+
+
+if __name__ == "__main__":
+    main()
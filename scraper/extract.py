@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import threading
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_decoder = json.JSONDecoder()
+
+
+def loads(data):
+    """Decode JSON from str or bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _as_bytes(body) -> bytes:
+    return body.encode("utf-8") if isinstance(body, str) else body
+
+
+def script_body(body, marker) -> bytes:
+    """
+    Raw contents of the first <script> whose opening tag or text contains `marker`.
+    Args:
+        body (bytes | str): Full HTML response
+        marker (bytes | str): Text identifying the script, e.g. b'id="__NEXT_DATA__"'
+    Returns:
+        bytes: Script contents, or None when not found
+    """
+    body = _as_bytes(body)
+    index = body.find(_as_bytes(marker))
+    if index < 0:
+        return None
+
+    # The marker may sit in the opening tag or in the script text; either way the
+    # nearest <script> before it must still be open at the marker
+    tag = body.rfind(b"<script", 0, index)
+    if tag < 0 or body.find(b"</script>", tag, index) >= 0:
+        return None
+    start = body.find(b">", tag) + 1
+    end = body.find(b"</script>", max(start, index))
+    if end < 0:
+        return None
+    return body[start:end]
+
+
+def script_json_by_id(body, script_id: str):
+    """
+    Decode the JSON payload of <script id="...">, e.g. Next.js __NEXT_DATA__.
+    Args:
+        body (bytes | str): Full HTML response
+        script_id (str): Script element id
+    Returns:
+        dict: Decoded JSON, or None when the script is missing
+    """
+    blob = script_body(body, f'id="{script_id}"')
+    if blob is None:
+        return None
+    return loads(blob)
+
+
+def assigned_json(body, variable: str):
+    """
+    Decode the object literal assigned to a JS variable, e.g. `window.__s_data = {...};`.
+    Only that object is decoded; the rest of the script and page are skipped.
+    Args:
+        body (bytes | str): Full HTML response
+        variable (str): Assignment target, e.g. "window.__s_data"
+    Returns:
+        dict: Decoded JSON, or None when the assignment is missing
+    """
+    body = _as_bytes(body)
+    index = body.find(_as_bytes(variable))
+    if index < 0:
+        return None
+
+    start = body.find(b"{", index)
+    end = body.find(b"</script>", index)
+    if start < 0 or (end >= 0 and start > end):
+        return None
+    segment = body[start:end if end >= 0 else len(body)]
+
+    # Fast path: the object runs to the last closing brace before </script>
+    closing = segment.rfind(b"}")
+    try:
+        return loads(segment[:closing + 1])
+    except ValueError:
+        pass
+
+    # More statements follow the object; let the stdlib find where it ends
+    try:
+        value, _ = _decoder.raw_decode(segment.decode("utf-8", errors="replace"))
+        return value
+    except ValueError as e:
+        logger.warning(f"Could not decode {variable}: {e}")
+        return None
+
+
+def region(body, start, end) -> bytes:
+    """
+    Bytes from the first `start` marker to the first `end` marker after the last `start`.
+    Covers every repeated block (e.g. each news card) without parsing; None when `start` is missing.
+    """
+    body = _as_bytes(body)
+    start = _as_bytes(start)
+    first = body.find(start)
+    if first < 0:
+        return None
+    stop = body.find(_as_bytes(end), body.rfind(start))
+    return body[first:stop if stop >= 0 else len(body)]
+
+
+def digest(data) -> str:
+    return hashlib.blake2b(_as_bytes(data), digest_size=16).hexdigest()
+
+
+class ParseMemo:
+    """
+    Last parsed result per URL, keyed by a digest of the page region it came from.
+    An unchanged region (or a 304) returns the previous result without parsing again.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+    def last(self, url: str):
+        """Result of the last successful parse of `url`, or None"""
+        entry = self._entries.get(url)
+        if entry is not None:
+            self.hits += 1
+        return entry[1] if entry is not None else None
+
+    def parse(self, url: str, region_digest, parse, *args):
+        """
+        Return the memoized result when `region_digest` matches, else call `parse(*args)`.
+        Only list results are remembered, so error dicts are always recomputed.
+        """
+        entry = self._entries.get(url)
+        if region_digest is not None and entry is not None and entry[0] == region_digest:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        result = parse(*args)
+        if isinstance(result, list):
+            with self._lock:
+                self._entries[url] = (region_digest, result)
+        return result
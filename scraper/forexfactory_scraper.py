@@ -1,24 +1,52 @@
+import os
+import re
 import json
+import asyncio
 import logging
-import pandas as pd
-from bs4 import BeautifulSoup
-from datetime import datetime
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from urllib.parse import urljoin
-from botasaurus.request import Request
+from scraper import http_client, metrics, parsers, settings
+from scraper.cache import ResponseCache, SQLiteBackend
+from scraper.history_store import default_store, merge_history
+from scraper.records import event_row, history_row
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {
+    "accept": "application/json, text/plain, */*",
+    "accept-language": "en-GB,en-US;q=0.9,en;q=0.8",
+    "user-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+}
+
+http_client.configure_pool("forexfactory.com", headers=HEADERS)
+
+DOMAIN = "forexfactory.com"
+
+# DOM building and JSON decoding, timed as metrics stages
+parse_html = metrics.timed(DOMAIN, "parse")(parsers.parse_html)
 
-logging.basicConfig(level=logging.INFO)
+
+@metrics.timed(DOMAIN, "extract")
+def decode_json(response):
+    return response.json()
+
+
+# Placeholder text in the calendar's day cell on rows that continue the previous day
+DAY_PLACEHOLDER = re.compile("all|am|pm", re.IGNORECASE)
 
 
 class Scraper:
-    def __init__(self, date_str: str):
+    def __init__(self, date_str: str, snapshot_dir=None):
+        self.date_str = date_str
         self.base_url = self.build_url(date_str)
         self.details = []
-        self.headers = {
-            "accept": "application/json, text/plain, */*",
-            "accept-language": "en-GB,en-US;q=0.9,en;q=0.8",
-            "user-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                          "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
-        }
+        # Opt-in: keep raw/cleaned JSON in a directory unique to this scrape
+        self.snapshot_dir = snapshot_dir or settings.CALENDAR_SNAPSHOT_DIR or None
+        self._snapshot_path = None
+        self.headers = dict(HEADERS)
 
     def build_url(self, date_str: str) -> str:
         """Convert YYYY-MM-DD → forex factory format (e.g., sep5.2025)"""
@@ -29,108 +57,195 @@ class Scraper:
         return f"https://www.forexfactory.com/calendar?day={month_abbr}{day}.{year}"
 
     def fetch_calendar_page(self):
-        response = Request().get(self.base_url)
-        return BeautifulSoup(response.text, "html.parser")
+        response = http_client.fetch("GET", self.base_url)
+        return parse_html(response.text)
 
-    def parse_event_row(self, row):
-        row_data = {}
-        cells = row.find_all("td")
-        data_event_id = row["data-event-id"]
+    async def fetch_calendar_page_async(self):
+        response = await http_client.fetch_async("GET", self.base_url)
+        return await http_client.run_blocking(parse_html, response.text)
 
-        row_data["event_id"] = data_event_id
-        row_data["day"] = cells[0].text.split(" ")[0]
-        date = cells[0].text.split(" ")[1:]
-        row_data["date"] = " ".join(date)
-        row_data["time"] = row.find("td", class_="calendar__cell calendar__time").text
-        row_data["currency"] = row.find("td", class_="calendar__currency").text.strip()
+    def parse_event_row(self, row):
+        first_cell = row.css_first("td").text()
+        day, _, date = first_cell.partition(" ")
 
         # Impact
-        impact_class = row.find("td", class_="calendar__cell calendar__impact").find("span")["class"]
+        impact_class = row.css_first("td.calendar__impact span").attr("class").split()
         impact_level = [cls.split("icon--ff-impact-")[-1] for cls in impact_class if "icon--ff-impact-" in cls]
         if impact_level[0] == "yel":
-            row_data["impact"] = "yellow"
+            impact = "yellow"
         elif impact_level[0] == "ora":
-            row_data["impact"] = "orange"
+            impact = "orange"
         elif impact_level[0] == "gra":
-            row_data["impact"] = "gray"
+            impact = "gray"
         else:
-            row_data["impact"] = "red"
-
-        row_data["event"] = row.find("span", class_="calendar__event-title").text.strip()
-        row_data["actual"] = row.find("td", class_="calendar__actual").text.strip()
-        row_data["forecast"] = row.find("td", class_="calendar__forecast").text.strip()
-        row_data["previous"] = row.find("td", class_="calendar__previous").text.strip()
-
-        return row_data
+            impact = "red"
+
+        return event_row(
+            event_id=row.attr("data-event-id"),
+            day=day,
+            date=date,
+            time=row.css_first("td.calendar__time").text(),
+            currency=row.css_first("td.calendar__currency").text().strip(),
+            impact=impact,
+            event=row.css_first("span.calendar__event-title").text().strip(),
+            actual=row.css_first("td.calendar__actual").text().strip(),
+            forecast=row.css_first("td.calendar__forecast").text().strip(),
+            previous=row.css_first("td.calendar__previous").text().strip(),
+        )
 
     def scrape(self):
         """Scrape raw calendar data (without history)"""
-        soup = self.fetch_calendar_page()
-        for row in soup.find_all("tr", attrs={"data-event-id": True}):
+        return self.parse_calendar_page(self.fetch_calendar_page())
+
+    async def scrape_async(self):
+        """Non-blocking variant of `scrape`"""
+        soup = await self.fetch_calendar_page_async()
+        return await http_client.run_blocking(self.parse_calendar_page, soup)
+
+    @metrics.timed(DOMAIN, "extract")
+    def parse_calendar_page(self, soup):
+        """Collect event rows from a parsed calendar page"""
+        for row in soup.css("tr[data-event-id]"):
             row_data = self.parse_event_row(row)
             self.details.append(row_data)
 
-        # Save raw data
-        with open("calendar_data.json", "w") as f:
-            json.dump(self.details, f, indent=4)
+        if self.snapshot_dir:
+            self.save_snapshot("calendar_data.json", self.details)
 
         return self.details
 
+    @metrics.timed(DOMAIN, "extract")
     def clean_data(self):
-        """Clean scraped data and return cleaned JSON"""
-        df = pd.read_json("calendar_data.json")
-
-        df.loc[(df.day == "") | (df.day == "All") | df.day.str.contains("all|am|pm", case=False), "day"] = None
-        df.day = df.day.ffill()
-
-        df.loc[(df.date == "") | (df.date == "Day"), "date"] = None
-        df.date = df.date.ffill()
-
-        df.loc[(df.time == ""), "time"] = None
-        df.time = df.time.ffill()
-
-        cleaned_data = df.to_dict(orient="records")
-
-        with open("cleaned_calendar_data.json", "w") as f:
-            json.dump(cleaned_data, f, indent=4)
+        """Forward-fill day/date/time on the scraped rows and return cleaned data"""
+        cleaned_data = []
+        last = {"day": None, "date": None, "time": None}
+
+        for row in self.details:
+            row = row.copy()
+            if str(row["event_id"]).isdigit():
+                row["event_id"] = int(row["event_id"])
+
+            if row["day"] == "" or row["day"] == "All" or DAY_PLACEHOLDER.search(row["day"]):
+                row["day"] = None
+            if row["date"] == "" or row["date"] == "Day":
+                row["date"] = None
+            if row["time"] == "":
+                row["time"] = None
+
+            for field in last:
+                if row[field] is None:
+                    row[field] = last[field]
+                else:
+                    last[field] = row[field]
+            cleaned_data.append(row)
+
+        if self.snapshot_dir:
+            self.save_snapshot("cleaned_calendar_data.json", cleaned_data)
 
         return cleaned_data
 
+    @staticmethod
+    def settled(date_str: str) -> bool:
+        """True for days that ended before yesterday; their events and actuals no longer change"""
+        try:
+            return date.fromisoformat(date_str) < date.today() - timedelta(days=1)
+        except ValueError:
+            return False
+
+    @classmethod
+    def day_ttl(cls, date_str: str) -> float:
+        """Cache lifetime of one day's cleaned calendar: settled days forever, recent ones briefly"""
+        return settings.CALENDAR_PAST_TTL if cls.settled(date_str) else settings.CALENDAR_TTL
+
+    @staticmethod
+    @metrics.timed(DOMAIN, "extract")
+    def merge_days(days):
+        """
+        Merge cleaned calendar days into one list in date order.
+        Each day's leading rows are forward-filled from that day's own label, never from
+        the day before, and events already seen on an earlier day are dropped.
+        Args:
+            days (list): (YYYY-MM-DD, cleaned rows) pairs
+        Returns:
+            list: Cleaned rows of every day
+        """
+        merged = []
+        seen = set()
+        for date_str, rows in sorted(days, key=lambda day: day[0]):
+            dt = datetime.strptime(date_str, "%Y-%m-%d")
+            last = {"day": dt.strftime("%a"), "date": f"{dt:%b} {dt.day}", "time": None}
+            for row in rows:
+                if row["event_id"] in seen:
+                    continue
+                seen.add(row["event_id"])
+                if any(row[field] is None for field in last):
+                    row = row.copy()  # rows may be shared with the response cache
+                for field in last:
+                    if row[field] is None:
+                        row[field] = last[field]
+                    else:
+                        last[field] = row[field]
+                merged.append(row)
+        return merged
+
+    def save_snapshot(self, filename: str, data):
+        """Write JSON into this scrape's own snapshot directory"""
+        if self._snapshot_path is None:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            self._snapshot_path = tempfile.mkdtemp(prefix=f"calendar-{self.date_str}-", dir=self.snapshot_dir)
+        path = os.path.join(self._snapshot_path, filename)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+        logging.info(f"Saved snapshot to {path}")
+        return path
+
 
 class HistoryScraper:
-    def __init__(self):
-        self.headers = {
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
-            'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
-                          '(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-        }
+    def __init__(self, store=None):
+        self.headers = dict(HEADERS)
+        # Persisted history lets repeat calls fetch only the first page
+        self.store = store if store is not None else default_store()
 
     def fetch_event_history(self, data_event_id):
         url = f"https://www.forexfactory.com/calendar/details/1-{data_event_id}"
+        res = http_client.fetch("GET", url, headers=self.headers)
+        return self.parse_event_history(decode_json(res))
+
+    async def fetch_event_history_async(self, data_event_id):
+        url = f"https://www.forexfactory.com/calendar/details/1-{data_event_id}"
+        res = await http_client.fetch_async("GET", url, headers=self.headers)
+        return await http_client.run_blocking(self.parse_event_history, decode_json(res))
+
+    @metrics.timed(DOMAIN, "extract")
+    def parse_event_history(self, payload):
         history = list()
-        res = Request().get(url, headers=self.headers)
         base_url = 'https://www.forexfactory.com'
         related_news = list()
 
-        news_html = res.json()['data']['linked_threads']['news']
+        news_html = payload['data']['linked_threads']['news']
         for html in news_html:
             news_dict = dict()
             try:
-                news = BeautifulSoup(html['html'], 'html.parser')
-                news_dict['news_url'] = urljoin(base_url, news.find('a')['href']) if news.find('a') else ''
-                news_dict['news_title'] = news.find('a')['title'] if news.find('a') else ''
-                news_dict['image'] = news.find('img')['src'] if news.find('img') else ''
-                news_dict['source'] = news.find('a', attrs={'data-source': True}).text if news.find('a', attrs={'data-source': True}) else ''
-                news_dict['content'] = news.select_one('p[class*="flexposts__preview flexposts__preview--pad"]').text if news.select_one('p[class*="flexposts__preview flexposts__preview--pad"]') else ''
-                news_dict['date'] = news.select_one('span[class*="flexposts__nowrap flexposts__time"]').text if news.select_one('span[class*="flexposts__nowrap flexposts__time"]') else ''
-                news_dict['comment'] = news.select_one('.comments').text.strip('|') if news.select_one('.comments') else ''
+                news = parse_html(html['html'])
+                link = news.css_first('a')
+                image = news.css_first('img')
+                source = news.css_first('a[data-source]')
+                content = news.css_first('p[class*="flexposts__preview flexposts__preview--pad"]')
+                date = news.css_first('span[class*="flexposts__nowrap flexposts__time"]')
+                comment = news.css_first('.comments')
+                news_dict['news_url'] = urljoin(base_url, link.attr('href', '')) if link else ''
+                news_dict['news_title'] = link.attr('title', '') if link else ''
+                news_dict['image'] = image.attr('src', '') if image else ''
+                news_dict['source'] = source.text() if source else ''
+                news_dict['content'] = content.text() if content else ''
+                news_dict['date'] = date.text() if date else ''
+                news_dict['comment'] = comment.text().strip('|') if comment else ''
             except (KeyError, IndexError, TypeError, AttributeError):
                 news_dict = {'news_url': '', 'news_title': '', 'image': '', 'source': '', 'content': '', 'date': '', 'comment': ''}
             related_news.append(news_dict)
 
-        history_forex_data = res.json()['data']['history']['events']
-        has_more_key = res.json()['data']['history']
+        history_forex_data = payload['data']['history']['events']
+        has_more_key = payload['data']['history']
         for data in history_forex_data:
             try:
                 event_id = data['event_id']
@@ -139,7 +254,7 @@ class HistoryScraper:
                 actual = data['actual']
                 forecast = data['forecast']
                 previous = data['previous']
-                history.append({'date': date, 'history_actual': actual, 'history_forecast': forecast, 'history_previous': previous})
+                history.append(history_row(date, actual, forecast, previous))
             except KeyError:
                 continue
         return history, related_news, event_id, has_more
@@ -149,46 +264,110 @@ class HistoryScraper:
         history = list()
         while has_more:
             url = f"https://www.forexfactory.com/calendar/history/1-{event_id}?i={i}"
-            response = Request().post(url, headers=self.headers)
+            response = http_client.fetch("POST", url, headers=self.headers)
             i += 1
-            history_forex_data = response.json()['data']['history']['events']
-            for data in history_forex_data:
-                try:
-                    event_id = data['event_id']
-                    has_more = response.json()['data']['history']['has_more']
-                    date = data['date']
-                    actual = data['actual']
-                    forecast = data['forecast']
-                    previous = data['previous']
-                    history.append({'date': date, 'history_actual': actual, 'history_forecast': forecast, 'history_previous': previous})
-                except KeyError:
-                    continue
+            page, has_more = self.parse_history_page(decode_json(response))
+            history.extend(page)
         return history
-    
+
+    async def fetch_history_page_async(self, event_id, i):
+        url = f"https://www.forexfactory.com/calendar/history/1-{event_id}?i={i}"
+        response = await http_client.fetch_async("POST", url, headers=self.headers)
+        return self.parse_history_page(decode_json(response))
+
+    async def history_pagination_async(self, event_id, has_more=True, window=None):
+        """
+        Fetch history pages `window` at a time, speculatively ahead of the last known page.
+        Pages are consumed in order; once one reports has_more false, the
+        requests still outstanding for later pages are cancelled.
+        """
+        window = window or settings.HISTORY_PAGE_WINDOW
+        history = list()
+        start = 1
+        while has_more:
+            tasks = [asyncio.ensure_future(self.fetch_history_page_async(event_id, i)) for i in range(start, start + window)]
+            try:
+                for task in tasks:
+                    page, has_more = await task
+                    history.extend(page)
+                    if not has_more:
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Let the cancelled requests unwind before returning
+                await asyncio.gather(*tasks, return_exceptions=True)
+            start += window
+        return history
+
+    @metrics.timed(DOMAIN, "extract")
+    def parse_history_page(self, payload):
+        history = list()
+        has_more = payload['data']['history'].get('has_more', False)
+        for data in payload['data']['history']['events']:
+            try:
+                date = data['date']
+                actual = data['actual']
+                forecast = data['forecast']
+                previous = data['previous']
+                history.append(history_row(date, actual, forecast, previous))
+            except KeyError:
+                continue
+        return history, has_more
+
     def scrape(self, data_event_id):
         history_data, related_news, event_id, has_more = self.fetch_event_history(data_event_id)
-        history_data.extend(self.history_pagination(event_id, has_more))
+
+        stored = self.store.get(data_event_id) if self.store else None
+        merged = merge_history(history_data, stored["history_data"]) if stored and has_more else None
+        if merged is not None:
+            history_data = merged
+        else:
+            history_data.extend(self.history_pagination(event_id, has_more))
+
+        if self.store:
+            self.store.put(data_event_id, history_data, related_news)
         return {'data_event_id': data_event_id, 'history_data': history_data, 'related_news': related_news}
 
-import json
-import logging
-from botasaurus.request import Request
+    async def scrape_async(self, data_event_id):
+        """Non-blocking variant of `scrape`"""
+        history_data, related_news, event_id, has_more = await self.fetch_event_history_async(data_event_id)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.StreamHandler()]  # logs to console
-)
+        stored = await http_client.run_blocking(self.store.get, data_event_id) if self.store else None
+        merged = merge_history(history_data, stored["history_data"]) if stored and has_more else None
+        if merged is not None:
+            history_data = merged
+        else:
+            history_data.extend(await self.history_pagination_async(event_id, has_more))
+
+        if self.store:
+            await http_client.run_blocking(self.store.put, data_event_id, history_data, related_news)
+        return {'data_event_id': data_event_id, 'history_data': history_data, 'related_news': related_news}
 
-logger = logging.getLogger(__name__)
+
+_range_cache = None
+
+
+def range_cache() -> ResponseCache:
+    """Shared cache of apply-settings chunk responses, persisted when SCRAPER_RANGE_CACHE_PATH is set"""
+    global _range_cache
+    if _range_cache is None:
+        backend = SQLiteBackend(settings.RANGE_CACHE_PATH) if settings.RANGE_CACHE_PATH else None
+        _range_cache = ResponseCache(max_entries=settings.RANGE_CACHE_MAX_ENTRIES, backend=backend)
+    return _range_cache
 
 
 class RangeScraper:
-    def __init__(self, start_date: str, end_date: str):
+    def __init__(self, start_date: str, end_date: str, chunk_days=None, concurrency=None, cache=None,
+                 snapshot_dir=None):
         self.url = "https://www.forexfactory.com/calendar/apply-settings/1?navigation=0"
         self.start_date = start_date
         self.end_date = end_date
+        self.chunk_days = chunk_days or settings.RANGE_CHUNK_DAYS
+        self.concurrency = concurrency or settings.RANGE_CONCURRENCY
+        self.cache = cache if cache is not None else range_cache()
+        # Opt-in: keep the merged raw response for debugging
+        self.snapshot_dir = snapshot_dir or settings.CALENDAR_SNAPSHOT_DIR or None
 
         self.headers = {
             "accept": "application/json, text/plain, */*",
@@ -199,54 +378,185 @@ class RangeScraper:
             "user-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
         }
 
-        self.payload = {
+        self.payload = self.build_payload(self.start_date, self.end_date)
+
+        logger.info(f"Initialized ForexFactoryRangeScraper with start_date={self.start_date}, end_date={self.end_date}")
+
+    def build_payload(self, begin_date: str, end_date: str) -> dict:
+        return {
             "default_view": "this_week",
             "impacts": [3, 2, 1, 0],
             "event_types": [1, 2, 3, 4, 5, 7, 8, 9, 10, 11],
             "currencies": [1, 2, 3, 4, 5, 6, 7, 8, 9],
-            "begin_date": self.start_date,   
-            "end_date": self.end_date        
+            "begin_date": begin_date,
+            "end_date": end_date
         }
 
-        logger.info(f"Initialized ForexFactoryRangeScraper with start_date={self.start_date}, end_date={self.end_date}")
+    def chunks(self) -> list:
+        """Split the range into consecutive (begin, end) windows of chunk_days days"""
+        try:
+            begin = date.fromisoformat(self.start_date)
+            end = date.fromisoformat(self.end_date)
+        except ValueError:
+            # Not YYYY-MM-DD; let ForexFactory interpret the range as one request
+            return [(self.start_date, self.end_date)]
+
+        windows = []
+        while begin <= end:
+            chunk_end = min(begin + timedelta(days=self.chunk_days - 1), end)
+            windows.append((begin.isoformat(), chunk_end.isoformat()))
+            begin = chunk_end + timedelta(days=1)
+        return windows
+
+    def chunk_ttl(self, chunk_end: str) -> float:
+        """Chunks that ended before yesterday no longer change; recent ones expire like the calendar"""
+        try:
+            settled = date.fromisoformat(chunk_end) < date.today() - timedelta(days=1)
+        except ValueError:
+            settled = False
+        return settings.RANGE_PAST_TTL if settled else settings.CALENDAR_TTL
+
+    def chunk_key(self, begin_date: str, end_date: str) -> str:
+        return f"forexfactory:range:{begin_date}:{end_date}"
 
     def scrape(self):
         """Fetch economic calendar events for given date range"""
-        logger.info(f"Sending POST request to {self.url} for date range {self.start_date} → {self.end_date}")
+        # Blocking all the way down, so it also works from code already running an event loop:
+        # chunks are loaded on a thread pool bounded by `concurrency`
+        windows = self.chunks()
+        logger.info(f"Fetching {self.start_date} → {self.end_date} in {len(windows)} chunk(s)")
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(windows))) as pool:
+            futures = [pool.submit(self.load_chunk, *window) for window in windows]
+
+        data = self.merge_chunks(future.result() for future in futures)
+        if self.snapshot_dir:
+            self.save_snapshot(data)
+        return data
 
+    async def scrape_async(self):
+        """Fetch the range as concurrent chunks, reusing cached ones, and merge them"""
+        data = self.merge_chunks([chunk async for chunk in self.iter_chunks_async()])
+        if self.snapshot_dir:
+            await http_client.run_blocking(self.save_snapshot, data)
+        return data
+
+    async def iter_chunks_async(self):
+        """Yield chunk responses in date order while later chunks are still being fetched"""
+        windows = self.chunks()
+        logger.info(f"Fetching {self.start_date} → {self.end_date} in {len(windows)} chunk(s)")
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load_chunk(begin_date, end_date):
+            async with semaphore:
+                return await http_client.run_blocking(self.load_chunk, begin_date, end_date)
+
+        tasks = [asyncio.ensure_future(load_chunk(*window)) for window in windows]
         try:
-            r = Request().post(
-                self.url,
-                headers=self.headers,
-                data=json.dumps(self.payload)
-            )
-            logger.info("Request successful")
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def iter_events_async(self):
+        """Yield cleaned events day by day as the chunks covering them arrive"""
+        seen = set()
+        async for chunk in self.iter_chunks_async():
+            for row in self.iter_events({"days": list(self.iter_days(chunk, seen))}):
+                yield row
+
+    def load_chunk(self, begin_date: str, end_date: str):
+        """One chunk response from the cache, or fetched and cached, blocking"""
+        key = self.chunk_key(begin_date, end_date)
+        chunk = self.cache.peek(key)
+        if chunk is None:
+            chunk = self.fetch_chunk(begin_date, end_date)
+            # Each chunk is cached as soon as it lands, so a failed backfill resumes where it stopped
+            self.cache.put(key, chunk, ttl=self.chunk_ttl(end_date))
+        return chunk
+
+    def fetch_chunk(self, begin_date: str, end_date: str):
+        """POST one chunk to apply-settings and decode the response, blocking"""
+        logger.info(f"Sending POST request to {self.url} for date range {begin_date} → {end_date}")
+        payload = self.build_payload(begin_date, end_date)
+
+        try:
+            r = http_client.fetch("POST", self.url, headers=self.headers, data=json.dumps(payload))
         except Exception as e:
-            logger.error(f"Request failed: {e}", exc_info=True)
+            logger.error(f"Request failed for {begin_date} → {end_date}: {e}", exc_info=True)
             raise
 
+        return self.handle_response(r)
+
+    @metrics.timed(DOMAIN, "extract")
+    def handle_response(self, r):
+        """Decode the apply-settings response"""
         try:
             data = r.json()
-            logger.info(f"Parsed JSON response successfully with {len(data.get('days', []))} days of data")
         except Exception as e:
-            logger.warning(f"Failed to parse JSON, returning raw text. Error: {e}")
-            data = r.text
+            # Raising keeps an unusable chunk out of the cache
+            raise ValueError(f"ForexFactory returned a non-JSON range response: {e}") from e
+        logger.info(f"Parsed JSON response successfully with {len(data.get('days', []))} days of data")
+        return data
 
-        with open("calendar_range.json", "w") as f:
+    @staticmethod
+    def iter_days(chunk, seen: set):
+        """Days of one chunk response without the events whose id is already in `seen`"""
+        for day in chunk.get("days", []):
+            events = []
+            for ev in day.get("events", []):
+                event_id = ev.get("id")
+                if event_id is not None and event_id in seen:
+                    continue
+                seen.add(event_id)
+                events.append(ev)
+            yield {**day, "events": events}
+
+    @classmethod
+    def merge_chunks(cls, chunks) -> dict:
+        """Concatenate chunk responses in date order, dropping events already seen in an earlier chunk"""
+        days = []
+        by_date = {}
+        seen = set()
+
+        for chunk in chunks:
+            for day in cls.iter_days(chunk, seen):
+                # Chunk edges may repeat a day; fold its remaining events into the first copy
+                label = day.get("date")
+                if label in by_date:
+                    by_date[label]["events"].extend(day["events"])
+                    continue
+                by_date[label] = day
+                days.append(day)
+
+        return {"days": days}
+
+    def save_snapshot(self, data):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        path = os.path.join(
+            tempfile.mkdtemp(prefix=f"range-{self.start_date}-{self.end_date}-", dir=self.snapshot_dir),
+            "calendar_range.json",
+        )
+        with open(path, "w") as f:
             json.dump(data, f, indent=4)
-            logger.info("Saved raw response to calendar_range.json")
-
-        return data
+        logger.info(f"Saved raw response to {path}")
+        return path
     
+    @metrics.timed(DOMAIN, "extract")
     def parse_events(self, raw_json):
         """Convert raw API JSON into cleaned format"""
         logger.info("Parsing events from raw JSON")
-        details = []
+        details = list(self.iter_events(raw_json))
+        logger.info(f"Parsed total {len(details)} events successfully")
+        return details
 
+    def iter_events(self, raw_json):
+        """Yield cleaned events one at a time, without building the whole list"""
         try:
             for day in raw_json.get("days", []):
                 events = day.get("events", [])
-                logger.info(f"Processing {len(events)} events for day {day.get('date')}")
+                logger.debug(f"Processing {len(events)} events for day {day.get('date')}")
 
                 for ev in events:
                     impact_class = ev.get("impactClass", "")
@@ -261,27 +571,22 @@ class RangeScraper:
                     else:
                         impact = "red"
 
-                    row_data = {
-                        "event_id": ev.get("id"),
-                        "day": day.get("date").split(" ")[0],   
-                        "date": ev.get("date"),
-                        "time": ev.get("timeLabel"),
-                        "currency": ev.get("currency"),
-                        "impact": impact,
-                        "event": ev.get("name"),
-                        "actual": ev.get("actual"),
-                        "forecast": ev.get("forecast"),
-                        "previous": ev.get("previous"),
-                    }
-                    details.append(row_data)
-            
-            logger.info(f"Parsed total {len(details)} events successfully")
+                    yield event_row(
+                        event_id=ev.get("id"),
+                        day=day.get("date").split(" ")[0],
+                        date=ev.get("date"),
+                        time=ev.get("timeLabel"),
+                        currency=ev.get("currency"),
+                        impact=impact,
+                        event=ev.get("name"),
+                        actual=ev.get("actual"),
+                        forecast=ev.get("forecast"),
+                        previous=ev.get("previous"),
+                    )
 
         except Exception as e:
             logger.error(f"Error while parsing events: {e}", exc_info=True)
 
-        return details
-
     def scrape_cleaned(self):
         """Scrape + return cleaned events"""
         logger.info("Starting scrape_cleaned process")
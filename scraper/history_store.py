@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from scraper import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryStore:
+    """
+    SQLite store of ForexFactory event history keyed by event_id.
+
+    Past releases never change, so once an event is stored only its first
+    history page needs fetching to pick up new rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS event_history ("
+            "event_id TEXT PRIMARY KEY, history_data TEXT NOT NULL, "
+            "related_news TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, event_id):
+        """
+        Args:
+            event_id (str): ForexFactory calendar event id
+        Returns:
+            dict: {"history_data": [...], "related_news": [...]} or None when not stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT history_data, related_news FROM event_history WHERE event_id = ?", (str(event_id),)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"history_data": json.loads(row[0]), "related_news": json.loads(row[1])}
+
+    def put(self, event_id, history_data: list, related_news: list):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO event_history VALUES (?, ?, ?, ?)",
+                (str(event_id), json.dumps(history_data), json.dumps(related_news), time.time()),
+            )
+            self._conn.commit()
+
+
+def merge_history(first_page: list, stored: list):
+    """
+    Put a freshly fetched first history page on top of the stored rows.
+    First-page rows win, so revised values replace stored ones.
+    Args:
+        first_page (list): Newest rows, as returned by the details endpoint
+        stored (list): Previously stored rows, newest first
+    Returns:
+        list: Merged rows, or None when the page does not overlap the store
+              (more releases happened than one page holds) and a full scrape is needed
+    """
+    fresh_dates = {row["date"] for row in first_page}
+    if stored and not any(row["date"] in fresh_dates for row in stored):
+        return None
+    return first_page + [row for row in stored if row["date"] not in fresh_dates]
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    """Shared store at settings.HISTORY_STORE_PATH, or None when disabled"""
+    global _default_store
+    if not settings.HISTORY_STORE_PATH:
+        return None
+    with _default_lock:
+        if _default_store is None:
+            _default_store = HistoryStore(settings.HISTORY_STORE_PATH)
+    return _default_store
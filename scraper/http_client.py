@@ -0,0 +1,438 @@
+import asyncio
+import contextvars
+import functools
+import importlib.util
+import logging
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from scraper import metrics, settings
+from scraper.throttle import CircuitBreaker, TokenBucket, backoff, retry_after
+
+logger = logging.getLogger(__name__)
+
+# Bounded pool for work that cannot run on the event loop; created on first use and again
+# after aclose(), so a later lifespan in the same process gets a fresh one
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _blocking_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.BLOCKING_WORKERS, thread_name_prefix="scraper-blocking")
+        return _executor
+
+
+def _http2_enabled() -> bool:
+    if settings.HTTP2 == "auto":
+        return importlib.util.find_spec("h2") is not None
+    return settings.HTTP2 in ("1", "true", "yes")
+
+
+class HostPool:
+    """
+    Keep-alive connections and default headers for one upstream domain.
+
+    Plain domains get an httpx.AsyncClient (async) and a requests.Session (sync).
+    Browser domains get one botasaurus session per worker thread; requests that send
+    no headers there keep the session's generated, fingerprint-consistent ones.
+    Every pool has its own adaptive rate limiter and circuit breaker.
+    """
+
+    def __init__(self, domain: str, browser=False, headers=None, max_connections=None,
+                 max_keepalive_connections=None, keepalive_expiry=None, http2=None, rate_limit=None):
+        self.domain = domain
+        # A stub upstream (SCRAPER_UPSTREAM_URL) has no fingerprinting to get past
+        self.browser = browser and not settings.UPSTREAM_URL
+        self.headers = dict(headers or {})
+        self.max_connections = max_connections or settings.MAX_CONNECTIONS
+        self.max_keepalive_connections = max_keepalive_connections or settings.MAX_KEEPALIVE_CONNECTIONS
+        self.keepalive_expiry = keepalive_expiry or settings.KEEPALIVE_EXPIRY
+        self.http2 = _http2_enabled() if http2 is None else http2
+
+        self.limiter = TokenBucket(rate_limit or settings.RATE_LIMIT, settings.RATE_LIMIT_BURST,
+                                   settings.RATE_LIMIT_MIN)
+        self.breaker = CircuitBreaker(settings.BREAKER_THRESHOLD, settings.BREAKER_RESET)
+
+        self.requests = 0
+        self.not_modified = 0
+        self.retries = 0
+        self.connections_opened = 0
+        # One httpx client per event loop: a client is bound to the loop it was created on,
+        # and scripts call asyncio.run() more than once
+        self._clients = weakref.WeakKeyDictionary()
+        self._session = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            import httpx
+
+            client = self._clients[loop] = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=settings.REQUEST_TIMEOUT,
+                follow_redirects=True,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+        return client
+
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def browser_session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            from botasaurus_requests import Session
+
+            session = Session(browser="firefox")
+            self._local.session = session
+            # tls-client hides its sockets, so count sessions as connections
+            with self._lock:
+                self.connections_opened += 1
+        return session
+
+    def acquire(self) -> float:
+        """Fail fast while the circuit is open, else the seconds to wait for a rate-limit token"""
+        self.breaker.check(self.domain)
+        return self.limiter.reserve()
+
+    def record(self, response=None) -> bool:
+        """
+        Feed an attempt's outcome to the limiter and breaker.
+        Args:
+            response (Response): Upstream response, None for a connection error or timeout
+        Returns:
+            bool: True when the attempt is worth retrying
+        """
+        status = response.status_code if response is not None else None
+        if status in (429, 503):
+            self.limiter.throttle(retry_after(response))
+        elif status is not None and status < 500:
+            self.limiter.recover()
+        # 4xx other than 429 means the host is up and answering
+        if status is None or status == 429 or status >= 500:
+            self.breaker.failure()
+            return status in (None, 429, 502, 503, 504)
+        self.breaker.success()
+        return False
+
+    def count_request(self, status_code=None):
+        with self._lock:
+            self.requests += 1
+            if status_code == 304:
+                self.not_modified += 1
+
+    def tracer(self):
+        """
+        httpx/httpcore trace hook for one request: counts new connections and times
+        connect (DNS + TCP), TLS and the wait for response headers as metrics stages.
+        """
+        started = {}
+
+        async def trace(event_name, info):
+            event, _, phase = event_name.rpartition(".")
+            if phase == "started":
+                started[event] = time.perf_counter()
+                return
+            if event == "connection.connect_tcp" and phase == "complete":
+                self.connections_opened += 1
+            name = _TRACE_STAGES.get(event)
+            if name is not None and event in started:
+                metrics.observe_nested(self.domain, name, time.perf_counter() - started.pop(event))
+
+        return trace
+
+    def stats(self) -> dict:
+        opened = self.connections_opened
+        if self._session is not None:
+            # urllib3 keeps its own per-host counters
+            manager = self._session.get_adapter("https://").poolmanager
+            opened += sum(manager.pools[key].num_connections for key in manager.pools.keys())
+        reused = max(self.requests - opened, 0)
+        return {
+            "domain": self.domain,
+            "backend": "botasaurus" if self.browser else "httpx/requests",
+            "http2": self.http2 and not self.browser,
+            "max_connections": self.max_connections,
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "connections_opened": opened,
+            "reused": reused,
+            "reuse_rate": round(reused / self.requests, 3) if self.requests else 0.0,
+            "retries": self.retries,
+            "limiter": self.limiter.stats(),
+            "breaker": self.breaker.stats(),
+        }
+
+    async def aclose(self):
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+_TRACE_STAGES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls",
+    "http11.receive_response_headers": "wait",
+    "http2.receive_response_headers": "wait",
+}
+
+POOLS = {
+    "cnbc.com": HostPool("cnbc.com"),
+    "api.queryly.com": HostPool("api.queryly.com"),
+    "investing.com": HostPool("investing.com", browser=True),
+    "forexfactory.com": HostPool("forexfactory.com", browser=True, rate_limit=settings.FOREXFACTORY_RATE_LIMIT),
+}
+_default_pool = HostPool("*")
+
+
+def get_pool(url: str) -> HostPool:
+    """Return the pool whose domain matches the URL host"""
+    host = urlsplit(url).hostname or ""
+    for domain, pool in POOLS.items():
+        if host == domain or host.endswith("." + domain):
+            return pool
+    return _default_pool
+
+
+def configure_pool(domain: str, **options):
+    """
+    Set options on a domain's pool before first use.
+    Args:
+        domain (str): Pool domain, e.g. "cnbc.com"
+        options: Any HostPool attribute (headers, max_connections, http2, limiter, ...)
+    """
+    pool = POOLS.setdefault(domain, HostPool(domain))
+    for name, value in options.items():
+        setattr(pool, name, dict(value) if name == "headers" else value)
+
+
+def pool_stats() -> list:
+    """Connection reuse, rate limit and circuit breaker statistics for every pool that has served a request"""
+    return [pool.stats() for pool in (*POOLS.values(), _default_pool) if pool.requests]
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking callable on the shared worker pool.
+    Args:
+        func (callable): Blocking function
+    Returns:
+        Any: Whatever `func` returns
+    """
+    loop = asyncio.get_running_loop()
+    # Carry the caller's context so metrics stages in `func` land in the right request
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_blocking_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+
+async def aclose():
+    """Close every pooled client (call on application shutdown)"""
+    for pool in (*POOLS.values(), _default_pool):
+        await pool.aclose()
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+# ETag / Last-Modified seen per URL, replayed on conditional requests
+_validators = {}
+
+
+def _conditional_headers(url: str, headers):
+    etag, last_modified = _validators.get(url, (None, None))
+    conditional = {}
+    if etag:
+        conditional["If-None-Match"] = etag
+    if last_modified:
+        conditional["If-Modified-Since"] = last_modified
+    return {**(headers or {}), **conditional} if conditional else headers
+
+
+def _check_response(url: str, response, conditional: bool):
+    if conditional:
+        if response.status_code == 304:
+            return response
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if response.status_code == 200 and (etag or last_modified):
+            _validators[url] = (etag, last_modified)
+        else:
+            _validators.pop(url, None)
+    response.raise_for_status()
+    return response
+
+
+def _upstream_url(url: str) -> str:
+    # https://host/path?query -> SCRAPER_UPSTREAM_URL/host/path?query
+    if not settings.UPSTREAM_URL:
+        return url
+    parts = urlsplit(url)
+    target = f"{settings.UPSTREAM_URL}/{parts.netloc}{parts.path or '/'}"
+    return f"{target}?{parts.query}" if parts.query else target
+
+
+def _browser_request(pool: HostPool, method: str, url: str, headers=None, data=None, timeout=None):
+    # botasaurus mimics a real browser TLS fingerprint, which Investing.com and
+    # ForexFactory require. It is blocking-only, so async callers reach it via run_blocking.
+    send = getattr(pool.browser_session(), method.lower())
+    headers = {**pool.headers, **headers} if headers else None
+    kwargs = {"headers": headers, "data": data, "timeout": timeout}
+    return send(url, referer="https://www.google.com/", **{k: v for k, v in kwargs.items() if v is not None})
+
+
+def _transport_errors() -> tuple:
+    # Connection errors and timeouts; requests and botasaurus raise OSError subclasses.
+    # httpx is imported by then whenever an httpx client sent the request.
+    httpx = sys.modules.get("httpx")
+    return (OSError, httpx.TransportError) if httpx is not None else (OSError,)
+
+
+def _retry_delay(pool: HostPool, attempt: int, method: str, url: str, response=None, error=None):
+    """Seconds to wait before the next attempt, or None when the last outcome should stand"""
+    if attempt + 1 >= settings.RETRY_ATTEMPTS:
+        return None
+    floor = retry_after(response) if response is not None else None
+    if floor is not None and floor > settings.RETRY_BACKOFF_MAX:
+        return None  # the host wants a longer break than a request should wait
+    delay = backoff(attempt, settings.RETRY_BACKOFF, settings.RETRY_BACKOFF_MAX, floor)
+    reason = error if error is not None else f"HTTP {response.status_code}"
+    logger.warning(f"{method} {url} failed ({reason}); retry {attempt + 1} in {delay:.2f}s")
+    with pool._lock:
+        pool.retries += 1
+    return delay
+
+
+def _prepare(url: str, headers, timeout, conditional: bool):
+    """Pool, upstream target, headers and timeout for one `fetch` / `fetch_async` call"""
+    timeout = settings.REQUEST_TIMEOUT if timeout is None else timeout
+    if conditional:
+        headers = _conditional_headers(url, headers)
+    return get_pool(url), _upstream_url(url), headers, timeout
+
+
+def _retry_policy(pool: HostPool, method: str, url: str, conditional: bool):
+    """
+    Retries shared by `fetch` and `fetch_async`, which only wait and send.
+    Yields the seconds to back off before each attempt (0 before the first) and is sent
+    that attempt's response or transport error. Returns the checked response, or raises
+    once an outcome should stand.
+    """
+    outcome = yield 0
+    for attempt in range(max(settings.RETRY_ATTEMPTS, 1)):
+        if isinstance(outcome, Exception):
+            metrics.count_response(pool.domain)
+            pool.record()
+            delay = _retry_delay(pool, attempt, method, url, error=outcome)
+            if delay is None:
+                raise outcome
+        else:
+            metrics.count_response(pool.domain, outcome)
+            pool.count_request(outcome.status_code)
+            delay = _retry_delay(pool, attempt, method, url, response=outcome) if pool.record(outcome) else None
+            if delay is None:
+                return _check_response(url, outcome, conditional)
+        outcome = yield delay
+
+
+def fetch(method: str, url: str, *, headers=None, data=None, timeout=None, conditional=False):
+    """
+    Blocking HTTP request through the URL's domain pool.
+
+    Requests wait for the host's rate limiter, and connection errors, timeouts, 429 and
+    502-504 are retried with jittered backoff. Every call the scrapers make is a read,
+    so POSTs (search, calendar settings) are retried too.
+    Args:
+        method (str): HTTP method
+        url (str): Target URL
+        headers (dict): Request headers, merged over the pool defaults
+        data (str): Request body
+        timeout (float): Timeout in seconds, defaults to settings.REQUEST_TIMEOUT
+        conditional (bool): Send the URL's last ETag / Last-Modified; the caller must
+            then handle a 304 response, which has no body
+    Returns:
+        Response: Response object, already checked with raise_for_status() (304 excepted)
+    Raises:
+        CircuitOpenError: The host has been failing and is not being called for now
+    """
+    pool, target, headers, timeout = _prepare(url, headers, timeout, conditional)
+    policy = _retry_policy(pool, method, url, conditional)
+    outcome = None
+    while True:
+        try:
+            delay = policy.send(outcome)
+        except StopIteration as done:
+            return done.value
+        if delay:
+            time.sleep(delay)
+        time.sleep(pool.acquire())
+        try:
+            with metrics.stage(pool.domain, "fetch"):
+                if pool.browser:
+                    outcome = _browser_request(pool, method, target, headers=headers, data=data, timeout=timeout)
+                else:
+                    outcome = pool.session().request(method, target, headers=headers, data=data, timeout=timeout)
+        except _transport_errors() as e:
+            outcome = e
+
+
+async def fetch_async(method: str, url: str, *, headers=None, data=None, timeout=None, conditional=False):
+    """
+    Non-blocking HTTP request, same arguments and retries as `fetch`.
+    Browser domains send on the worker pool; everything else uses the domain's httpx
+    client. Rate-limit and backoff waits happen on the event loop either way.
+    """
+    pool, target, headers, timeout = _prepare(url, headers, timeout, conditional)
+    policy = _retry_policy(pool, method, url, conditional)
+    outcome = None
+    while True:
+        try:
+            delay = policy.send(outcome)
+        except StopIteration as done:
+            return done.value
+        if delay:
+            await asyncio.sleep(delay)
+        await asyncio.sleep(pool.acquire())
+        try:
+            with metrics.stage(pool.domain, "fetch"):
+                if pool.browser:
+                    outcome = await run_blocking(
+                        _browser_request, pool, method, target, headers=headers, data=data, timeout=timeout
+                    )
+                else:
+                    outcome = await pool.async_client().request(
+                        method, target, headers=headers, content=data, timeout=timeout,
+                        extensions={"trace": pool.tracer()},
+                    )
+        except _transport_errors() as e:
+            outcome = e
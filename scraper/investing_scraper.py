@@ -1,10 +1,27 @@
-import json
 import logging
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from botasaurus.request import Request
+from scraper import extract, http_client, metrics, parsers
 
-logging.basicConfig(level=logging.INFO)
+
+LATEST_NEWS_URL = "https://www.investing.com/news/latest-news"
+SEARCH_URL = "https://www.investing.com/search/service/SearchInnerPage"
+XHR_HEADERS = {
+    'accept': 'application/json, text/javascript, */*; q=0.01',
+    'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
+    'content-type': 'application/x-www-form-urlencoded',
+    'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
+    'x-requested-with': 'XMLHttpRequest'
+}
+DETAIL_HEADERS = {
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
+    'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
+}
+
+http_client.configure_pool("investing.com", headers=DETAIL_HEADERS)
+
+# Re-polls of the latest news page skip decoding when newsStore._news is unchanged
+_latest_memo = extract.ParseMemo()
 
 
 def latest_news():
@@ -13,27 +30,62 @@ def latest_news():
     Returns:
         list: Parsed latest news articles
     """
-    URL = "https://www.investing.com/news/latest-news"
-    HEADERS = {
-        'accept': 'application/json, text/javascript, */*; q=0.01',
-        'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
-        'content-type': 'application/x-www-form-urlencoded',
-        'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-        'x-requested-with': 'XMLHttpRequest'
-    }
+    logging.info(f"Fetching latest news from {LATEST_NEWS_URL}")
+
+    try:
+        response = http_client.fetch("GET", LATEST_NEWS_URL, **_latest_news_request())
+    except Exception as e:
+        logging.error(f"Error fetching latest news: {e}")
+        return {"error": f"Failed to fetch: {e}"}
+
+    return _latest_news_result(response)
 
-    logging.info(f"Fetching latest news from {URL}")
+
+async def latest_news_async():
+    """
+    Non-blocking variant of `latest_news`
+    Returns:
+        list: Parsed latest news articles
+    """
+    logging.info(f"Fetching latest news from {LATEST_NEWS_URL}")
 
     try:
-        response = Request().get(URL, headers=HEADERS)
-        response.raise_for_status()
+        response = await http_client.fetch_async("GET", LATEST_NEWS_URL, **_latest_news_request())
     except Exception as e:
         logging.error(f"Error fetching latest news: {e}")
         return {"error": f"Failed to fetch: {e}"}
 
+    return await http_client.run_blocking(_latest_news_result, response)
+
+
+def _latest_news_request() -> dict:
+    # Revalidate only once a parse is memoized, so a 304 always has a result to reuse
+    return {"headers": XHR_HEADERS, "conditional": LATEST_NEWS_URL in _latest_memo}
+
+
+def _latest_news_result(response):
+    """Parsed latest news, reusing the last parse on a 304 or when the news list hashes the same"""
+    if response.status_code == 304:
+        return _latest_memo.last(LATEST_NEWS_URL)
+
+    # From the "_news" key to the end of __NEXT_DATA__: the list plus any stores after it
+    news = extract.region(response.content, b'"_news":', b"</script>")
+    region_digest = extract.digest(news) if news is not None else None
+    return _latest_memo.parse(LATEST_NEWS_URL, region_digest, parse_latest_news, response.content)
+
+
+@metrics.timed("investing.com", "extract")
+def parse_latest_news(body: bytes):
+    """
+    Parse the Investing.com latest news page.
+    Everything comes from __NEXT_DATA__, so no DOM is built.
+    Args:
+        body (bytes): Raw page HTML
+    Returns:
+        list: Parsed latest news articles
+    """
     try:
-        soup = BeautifulSoup(response.text, 'html.parser')
-        json_data = json.loads(soup.find('script', id="__NEXT_DATA__").text)
+        json_data = extract.script_json_by_id(body, "__NEXT_DATA__")
         news_data = json_data['props']['pageProps']['state']['newsStore']['_news']
     except Exception as e:
         logging.error(f"Error parsing JSON from page: {e}")
@@ -61,6 +113,10 @@ def latest_news():
     return details
 
 
+def _search_payload(keyword: str) -> str:
+    return f'search_text={keyword.replace(" ", "%2520")}&tab=news&isFilter=true'
+
+
 def scrape_keyword(keyword: str):
     """
     Search Investing.com news by keyword
@@ -69,25 +125,45 @@ def scrape_keyword(keyword: str):
     Returns:
         list: Parsed news articles
     """
-    URL = "https://www.investing.com/search/service/SearchInnerPage"
-    PAYLOAD = f'search_text={keyword.replace(" ", "%2520")}&tab=news&isFilter=true'
-    HEADERS = {
-        'accept': 'application/json, text/javascript, */*; q=0.01',
-        'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
-        'content-type': 'application/x-www-form-urlencoded',
-        'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-        'x-requested-with': 'XMLHttpRequest'
-    }
+    logging.info("Sending request to Investing.com API...")
+
+    try:
+        response = http_client.fetch("POST", SEARCH_URL, headers=XHR_HEADERS, data=_search_payload(keyword))
+    except Exception as e:
+        logging.error(f"Error fetching the URL: {e}")
+        return []
+
+    return parse_search_results(response)
 
+
+async def scrape_keyword_async(keyword: str):
+    """
+    Non-blocking variant of `scrape_keyword`
+    Args:
+        keyword (str): Search keyword
+    Returns:
+        list: Parsed news articles
+    """
     logging.info("Sending request to Investing.com API...")
 
     try:
-        response = Request().post(URL, headers=HEADERS, data=PAYLOAD)
-        response.raise_for_status()
+        response = await http_client.fetch_async("POST", SEARCH_URL, headers=XHR_HEADERS, data=_search_payload(keyword))
     except Exception as e:
         logging.error(f"Error fetching the URL: {e}")
         return []
 
+    return parse_search_results(response)
+
+
+@metrics.timed("investing.com", "extract")
+def parse_search_results(response):
+    """
+    Parse an Investing.com search response
+    Args:
+        response (Response): SearchInnerPage JSON response
+    Returns:
+        list: Parsed news articles
+    """
     try:
         news_data = response.json().get('news', [])
     except Exception as e:
@@ -124,42 +200,68 @@ def detail_page(url: str):
     Returns:
         dict: Parsed article details
     """
-    headers = {
-        'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'accept-language': 'en-GB,en-US;q=0.9,en;q=0.8',
-        'user-agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-    }
+    url = str(url)
+    logging.info(f"Fetching detail page: {url}")
+    try:
+        response = http_client.fetch("GET", url, headers=DETAIL_HEADERS)
+    except Exception as e:
+        logging.error(f"Error fetching detail page: {e}")
+        return {"error": f"Failed to fetch URL: {e}"}
+
+    return parse_detail_page(response.content)
 
+
+async def detail_page_async(url: str):
+    """
+    Non-blocking variant of `detail_page`
+    Args:
+        url (str): Article URL
+    Returns:
+        dict: Parsed article details
+    """
+    url = str(url)
     logging.info(f"Fetching detail page: {url}")
     try:
-        response = Request().get(url, headers=headers)
-        response.raise_for_status()
+        response = await http_client.fetch_async("GET", url, headers=DETAIL_HEADERS)
     except Exception as e:
         logging.error(f"Error fetching detail page: {e}")
         return {"error": f"Failed to fetch URL: {e}"}
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    return await http_client.run_blocking(parse_detail_page, response.content)
+
+
+@metrics.timed("investing.com", "parse")
+def parse_detail_page(body: bytes):
+    """
+    Parse an Investing.com article page
+    Args:
+        body (bytes): Raw page HTML
+    Returns:
+        list: Parsed article details
+    """
     details = list()
 
     try:
         dd = {}
-        # JSON data
-        data = json.loads(soup.find('script', id="__NEXT_DATA__").text)
+        # JSON data, decoded straight from the raw bytes; the DOM is only needed
+        # for the fields below, so build it after the JSON checks out
+        with metrics.stage("investing.com", "extract"):
+            data = extract.script_json_by_id(body, "__NEXT_DATA__")
+            article = data['props']['pageProps']['state']['newsStore']['_article']
+        soup = parsers.parse_html(body)
 
         # Title
-        dd['title'] = soup.find('h1', id="articleTitle").text.strip() if soup.find('h1', id="articleTitle") else ''
+        title = soup.css_first('h1#articleTitle')
+        dd['title'] = title.text().strip() if title else ''
 
         # Source
-        dd['source'] = data['props']['pageProps']['state']['newsStore']['_article']['source_name']
+        dd['source'] = article['source_name']
 
         # Image + copyright
         img_result = []
-        img_tag = soup.find('img', class_="h-full w-full object-contain")
-        image_of_news = img_tag['src'] if img_tag else ''
-        copyright = (
-            data['props']['pageProps']['state']['newsStore']['_article']['media'][0]['copyright']
-            if data['props']['pageProps']['state']['newsStore']['_article'].get('media') else ''
-        )
+        img_tag = soup.css_first('img.h-full.w-full.object-contain')
+        image_of_news = img_tag.attr('src', '') if img_tag else ''
+        copyright = article['media'][0]['copyright'] if article.get('media') else ''
         img_result.append({
             'image_text': copyright,
             'image': image_of_news
@@ -167,15 +269,16 @@ def detail_page(url: str):
         dd['image'] = img_result
 
         # Content
-        dd['content'] = soup.find('div', id="article").text.strip() if soup.find('div', id="article") else ''
+        content = soup.css_first('div#article')
+        dd['content'] = content.text().strip() if content else ''
 
         # Text links
         text_link_results = []
         base_url = 'https://www.investing.com/'
-        text_links = soup.find_all('a', class_="aqlink js-hover-me")
+        text_links = soup.css('a.aqlink.js-hover-me')
         for textlink in text_links:
-            text_name = textlink.text
-            text_href = urljoin(base_url, textlink['href'])
+            text_name = textlink.text()
+            text_href = urljoin(base_url, textlink.attr('href', ''))
             text_link_results.append({
                 'text_name': text_name,
                 'text_href': text_href
@@ -183,14 +286,16 @@ def detail_page(url: str):
         dd['text_link'] = text_link_results
 
         # Date and time
-        date_and_time = soup.select_one('div[class^="flex flex-col gap-2 text-warren-gray"] div')
-        updated_date = date_and_time.find_next_sibling('div') if date_and_time else None
+        date_and_time = soup.css_first('div[class^="flex flex-col gap-2 text-warren-gray"] div')
+        updated_date = date_and_time.next_sibling('div') if date_and_time else None
         if updated_date:
-            dd['posted_date'] = updated_date.text.strip('Updated ').split(', ')[0]
-            dd['posted_time'] = updated_date.text.strip('Updated ').split(', ')[1]
+            parts = updated_date.text().strip('Updated ').split(', ')
+            dd['posted_date'] = parts[0]
+            dd['posted_time'] = parts[1]
         elif date_and_time:
-            dd['posted_date'] = date_and_time.text.strip('Published ').split(', ')[0]
-            dd['posted_time'] = date_and_time.text.strip('Published ').split(', ')[1]
+            parts = date_and_time.text().strip('Published ').split(', ')
+            dd['posted_date'] = parts[0]
+            dd['posted_time'] = parts[1]
         else:
             dd['posted_date'] = ''
             dd['posted_time'] = ''
@@ -205,26 +310,3 @@ def detail_page(url: str):
 
     return details
 
-
-# def multi_detail_page(urls: list[str]):
-#     """
-#     Fetch and parse multiple article detail pages from Investing.com
-#     Args:
-#         urls (list): List of article URLs
-#     Returns:
-#         list: Parsed details for each URL
-#     """
-#     results = []
-#     for url in urls:
-#         try:
-#             detail = detail_page(url)
-#             results.append({
-#                 "url": url,
-#                 "data": detail
-#             })
-#         except Exception as e:
-#             results.append({
-#                 "url": url,
-#                 "error": str(e)
-#             })
-#     return results
\ No newline at end of file
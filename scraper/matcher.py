@@ -0,0 +1,168 @@
+import logging
+from collections import deque
+from functools import lru_cache
+
+try:
+    import ahocorasick
+except ImportError:  # optional speedup (pyahocorasick)
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive multi-keyword matcher compiled once into an Aho-Corasick automaton.
+
+    One pass over the text finds every occurrence of every keyword, so the cost no
+    longer grows with the number of keywords. Matching is by substring, like
+    `keyword in text`. Positions index into `text.lower()`, which lines up with the
+    original text for ASCII.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(k.strip().lower() for k in keywords if k.strip()))
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            if self.keywords:
+                self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            self._goto, self._fail, self._out = _build_automaton(self.keywords)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def iter_matches(self, text: str):
+        """
+        Yield every keyword occurrence in the text.
+        Args:
+            text (str): Text to scan
+        Returns:
+            Iterator[tuple]: (start, keyword) pairs in order of match end
+        """
+        if not self.keywords or not text:
+            return
+        text = text.lower()
+
+        if self._automaton is not None:
+            for end, keyword in self._automaton.iter(text):
+                yield end - len(keyword) + 1, keyword
+            return
+
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for keyword in out[node]:
+                yield i - len(keyword) + 1, keyword
+
+    def scan(self, text: str) -> dict:
+        """
+        Counts, per-keyword hits and positions from a single pass.
+        Args:
+            text (str): Text to scan
+        Returns:
+            dict: {"count": distinct keywords found, "total": occurrences,
+                   "hits": {keyword: occurrences}, "positions": {keyword: [start, ...]}}
+        """
+        positions = {}
+        total = 0
+        for start, keyword in self.iter_matches(text):
+            positions.setdefault(keyword, []).append(start)
+            total += 1
+        return {
+            "count": len(positions),
+            "total": total,
+            "hits": {keyword: len(starts) for keyword, starts in positions.items()},
+            "positions": positions,
+        }
+
+    def hits(self, text: str) -> dict:
+        """Occurrences per keyword found in the text"""
+        counts = {}
+        for _, keyword in self.iter_matches(text):
+            counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
+
+    def count(self, text: str) -> int:
+        """Number of distinct keywords present in the text"""
+        return len({keyword for _, keyword in self.iter_matches(text)})
+
+
+def _build_automaton(keywords):
+    # Trie as a list of {char: node} dicts; out[node] holds every keyword ending there,
+    # including those reached through failure links
+    goto = [{}]
+    out = [()]
+    for keyword in keywords:
+        node = 0
+        for ch in keyword:
+            child = goto[node].get(ch)
+            if child is None:
+                child = len(goto)
+                goto[node][ch] = child
+                goto.append({})
+                out.append(())
+            node = child
+        out[node] += (keyword,)
+
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for ch, child in goto[node].items():
+            queue.append(child)
+            state = fail[node]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            fail[child] = goto[state].get(ch, 0)
+            out[child] += out[fail[child]]
+    return goto, fail, out
+
+
+@lru_cache(maxsize=8)
+def compile_keywords(keywords: tuple) -> KeywordMatcher:
+    """Cached KeywordMatcher for a keyword tuple, so repeat callers compile it only once"""
+    matcher = KeywordMatcher(keywords)
+    logger.info(f"Compiled {len(matcher)} keywords ({'pyahocorasick' if ahocorasick else 'pure Python'})")
+    return matcher
+
+
+def rank(items, matcher: KeywordMatcher, fields=("title", "content")) -> list:
+    """
+    Score items by keyword matches and sort them, most relevant first.
+    Items are copied, never modified, so cached results can be ranked safely.
+    Args:
+        items (list): Article dicts
+        matcher (KeywordMatcher): Compiled keywords
+        fields (tuple): Text fields to scan
+    Returns:
+        list: Copies with a "keyword_matches" entry:
+              {<field>: distinct keywords, ..., "total": sum, "keywords": [matched keywords]}
+    """
+    scored = []
+    for item in items:
+        matches = {}
+        found = {}
+        for field in fields:
+            hits = matcher.hits(item.get(field) or "")
+            matches[field] = len(hits)
+            found.update(hits)
+        matches["total"] = sum(matches[field] for field in fields)
+        matches["keywords"] = sorted(found)
+        scored.append({**item, "keyword_matches": matches})
+
+    # Stable sort: ties keep the upstream order
+    scored.sort(key=lambda item: [-item["keyword_matches"][key] for key in ("total", *fields)])
+    return scored
+
+
+def load_keywords(filepath: str) -> list:
+    """One keyword per line; blank lines are skipped"""
+    with open(filepath, "r") as f:
+        return [line.strip().lower() for line in f if line.strip()]
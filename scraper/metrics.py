@@ -0,0 +1,176 @@
+"""
+Per-stage latency and upstream traffic metrics.
+
+Stages are timed with `stage` / `timed` and recorded as self time: a stage nested in
+another (JSON extraction inside a parse function, connect/TLS inside a fetch) is taken
+out of its parent, so the stages of one request add up to its total. Stage names:
+
+    connect    DNS lookup + TCP connect (httpx pools only)
+    tls        TLS handshake (httpx pools only)
+    wait       request sent until response headers arrive (httpx pools only)
+    fetch      the rest of the upstream exchange; all of it for requests / botasaurus
+    parse      HTML parsing and walking the DOM
+    extract    JSON decoding and mapping upstream fields to ours
+    serialize  encoding the API response
+
+Exposed on /metrics in the Prometheus text format when prometheus_client is
+installed; the per-request Server-Timing header works without it.
+"""
+import asyncio
+import contextvars
+import functools
+import importlib.util
+import threading
+import time
+from contextlib import contextmanager
+
+
+class _Collectors:
+    """The Prometheus collectors, created on first use so importing a scraper stays cheap"""
+
+    def __init__(self, prometheus_client):
+        self.client = prometheus_client
+        self.stage_seconds = prometheus_client.Histogram(
+            "scraper_stage_seconds", "Time spent per domain and stage (self time)", ["domain", "stage"],
+            buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+        )
+        self.upstream_responses = prometheus_client.Counter(
+            "scraper_upstream_responses_total", "Upstream responses by status code ('error' for transport errors)",
+            ["domain", "status"],
+        )
+        self.upstream_bytes = prometheus_client.Counter(
+            "scraper_upstream_bytes_total", "Response body bytes received from upstream", ["domain"],
+        )
+
+
+_collectors = None
+_collectors_lock = threading.Lock()
+
+
+def available() -> bool:
+    """True when prometheus_client is installed (it is optional; /metrics needs it)"""
+    return importlib.util.find_spec("prometheus_client") is not None
+
+
+def _prometheus():
+    global _collectors
+    if _collectors is None:
+        with _collectors_lock:
+            if _collectors is None:
+                try:
+                    import prometheus_client
+                except ImportError:
+                    _collectors = False
+                else:
+                    _collectors = _Collectors(prometheus_client)
+    return _collectors or None
+
+
+class _Frame:
+    __slots__ = ("children",)
+
+    def __init__(self):
+        self.children = 0.0
+
+
+# Innermost running stage, and the Server-Timing collector of the current API request
+_frame = contextvars.ContextVar("metrics_frame", default=None)
+_timings = contextvars.ContextVar("metrics_timings", default=None)
+
+
+def observe(domain: str, name: str, seconds: float):
+    """Record a measured duration for a stage"""
+    collectors = _prometheus()
+    if collectors is not None:
+        collectors.stage_seconds.labels(domain, name).observe(seconds)
+    timings = _timings.get()
+    if timings is not None:
+        key = (name, domain)
+        timings[key] = timings.get(key, 0.0) + seconds
+
+
+def observe_nested(domain: str, name: str, seconds: float):
+    """Record a duration measured inside the current stage, taking it out of that stage's self time"""
+    frame = _frame.get()
+    if frame is not None:
+        frame.children += seconds
+    observe(domain, name, seconds)
+
+
+@contextmanager
+def stage(domain: str, name: str):
+    """
+    Time a block as one stage.
+    Args:
+        domain (str): Upstream domain the work belongs to, e.g. "cnbc.com"
+        name (str): Stage name (see module docstring)
+    """
+    parent = _frame.get()
+    frame = _Frame()
+    token = _frame.set(frame)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _frame.reset(token)
+        if parent is not None:
+            parent.children += elapsed
+        observe(domain, name, max(elapsed - frame.children, 0.0))
+
+
+def timed(domain: str, name: str):
+    """Decorator form of `stage` for plain and async functions"""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(domain, name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(domain, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_response(domain: str, response=None):
+    """Count one upstream response (None for a connection error or timeout) and its body size"""
+    collectors = _prometheus()
+    if collectors is None:
+        return
+    if response is None:
+        collectors.upstream_responses.labels(domain, "error").inc()
+        return
+    collectors.upstream_responses.labels(domain, str(response.status_code)).inc()
+    collectors.upstream_bytes.labels(domain).inc(len(response.content))
+
+
+def start_request():
+    """Begin collecting stage timings for the current API request"""
+    _timings.set({})
+
+
+def server_timing(total: float) -> str:
+    """Server-Timing header value for the timings collected since `start_request`"""
+    entries = [
+        f'{name};desc="{domain}";dur={seconds * 1000:.1f}'
+        for (name, domain), seconds in (_timings.get() or {}).items()
+    ]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def render():
+    """
+    Every metric in the Prometheus text exposition format.
+    Returns:
+        tuple: (body bytes, content type)
+    """
+    collectors = _prometheus()
+    if collectors is None:
+        raise RuntimeError("prometheus_client is not installed")
+    return collectors.client.generate_latest(), collectors.client.CONTENT_TYPE_LATEST
@@ -0,0 +1,195 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from scraper import settings
+
+logger = logging.getLogger(__name__)
+
+SITES = {
+    "cnbc": "https://www.cnbc.com/",
+    "investing": "https://www.investing.com/",
+}
+
+_WORDS = re.compile(r"\w+")
+
+
+def canonical_url(url: str, site=None) -> str:
+    """Absolute URL with lowercase host, no fragment, no utm_* parameters and no trailing slash"""
+    if site in SITES:
+        url = urljoin(SITES[site], url)
+    parts = urlsplit(url.strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith("utm_")])
+    host = parts.netloc.lower()
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, parts.path.rstrip("/") or "/", query, ""))
+
+
+def title_hash(title: str) -> str:
+    """Hash of the title's lowercased words, so case, spacing and punctuation differences collapse"""
+    words = " ".join(_WORDS.findall(title.lower()))
+    return hashlib.blake2b(words.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def normalize(item: dict, site: str, feed: str):
+    """
+    Map one latest_news / scrape_keyword item to the index schema.
+    CNBC uses news_url and posted_date_time; Investing uses url and time.
+    Returns:
+        dict: Normalized article, or None when it has no URL or title
+    """
+    url = item.get("url") or item.get("news_url")
+    title = (item.get("title") or "").strip()
+    if not url or not title:
+        return None
+    return {
+        "url": canonical_url(url, site),
+        "title_hash": title_hash(title),
+        "site": site,
+        "feed": feed,
+        "provider": item.get("source") or item.get("section") or "",
+        "title": title,
+        "content": item.get("content") or "",
+        "image": item.get("image") or "",
+        "published": item.get("posted_date_time") or item.get("time") or "",
+    }
+
+
+class NewsIndex:
+    """
+    SQLite article index with FTS5 search over title and content.
+
+    Every scrape is ingested as it happens. An article already indexed under the
+    same canonical URL, or the same title from another feed, is updated in place:
+    longer content and missing fields are filled in rather than duplicated.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, title_hash TEXT NOT NULL, "
+            "site TEXT NOT NULL, feed TEXT NOT NULL, provider TEXT NOT NULL, title TEXT NOT NULL, "
+            "content TEXT NOT NULL, image TEXT NOT NULL, published TEXT NOT NULL, "
+            "first_seen REAL NOT NULL, last_seen REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS articles_title_hash ON articles (title_hash);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+            "title, content, content='articles', content_rowid='id');"
+            # External-content FTS table: keep it in step with the articles table
+            "CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN "
+            "INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content); END;"
+            "CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, content ON articles BEGIN "
+            "INSERT INTO articles_fts (articles_fts, rowid, title, content) "
+            "VALUES ('delete', old.id, old.title, old.content); "
+            "INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content); END;"
+        )
+        self._conn.commit()
+
+    def ingest(self, items, site: str, feed: str) -> int:
+        """
+        Add or refresh scraped items.
+        Args:
+            items (list): latest_news or scrape_keyword output
+            site (str): "cnbc" or "investing"
+            feed (str): "latest" or "search"
+        Returns:
+            int: Number of articles that were new to the index
+        """
+        now = time.time()
+        added = 0
+        with self._lock:
+            for item in items:
+                article = normalize(item, site, feed)
+                if article is None:
+                    continue
+                row = self._conn.execute(
+                    "SELECT id, content FROM articles WHERE url = ? OR title_hash = ? LIMIT 1",
+                    (article["url"], article["title_hash"]),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO articles (url, title_hash, site, feed, provider, title, content, image, "
+                        "published, first_seen, last_seen) VALUES "
+                        "(:url, :title_hash, :site, :feed, :provider, :title, :content, :image, "
+                        ":published, :now, :now)",
+                        {**article, "now": now},
+                    )
+                    added += 1
+                    continue
+
+                # Keep the richest copy: search results carry content the latest feed lacks
+                if len(article["content"]) > len(row["content"]):
+                    self._conn.execute("UPDATE articles SET content = ? WHERE id = ?", (article["content"], row["id"]))
+                self._conn.execute(
+                    "UPDATE articles SET last_seen = ?, "
+                    "provider = CASE WHEN provider = '' THEN ? ELSE provider END, "
+                    "image = CASE WHEN image = '' THEN ? ELSE image END, "
+                    "published = CASE WHEN published = '' THEN ? ELSE published END WHERE id = ?",
+                    (now, article["provider"], article["image"], article["published"], row["id"]),
+                )
+            self._conn.commit()
+        if added:
+            logger.info(f"Indexed {added} new {site} {feed} article(s)")
+        return added
+
+    def search(self, query: str, limit: int = 20, site=None) -> list:
+        """
+        Full-text search, best matches first.
+        Args:
+            query (str): Words to match; every word must appear in the title or content
+            limit (int): Maximum results
+            site (str): Restrict to "cnbc" or "investing"
+        Returns:
+            list: Articles with a content snippet instead of the full text
+        """
+        words = _WORDS.findall(query)
+        if not words:
+            return []
+        # Quote each word so user input can never be read as FTS5 syntax
+        match = " ".join(f'"{word}"' for word in words)
+        sql = (
+            "SELECT a.url, a.site, a.feed, a.provider, a.title, a.image, a.published, a.first_seen, a.last_seen, "
+            "snippet(articles_fts, 1, '', '', '…', 24) AS snippet "
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+            "WHERE articles_fts MATCH ?"
+        )
+        params = [match]
+        if site:
+            sql += " AND a.site = ?"
+            params.append(site)
+        sql += " ORDER BY bm25(articles_fts, 4.0, 1.0) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            total, = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()
+            per_site = dict(self._conn.execute("SELECT site, COUNT(*) FROM articles GROUP BY site").fetchall())
+        return {"articles": total, "per_site": per_site}
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def default_index():
+    """Shared index at settings.NEWS_INDEX_PATH, or None when disabled"""
+    global _default_index
+    if not settings.NEWS_INDEX_PATH:
+        return None
+    with _default_lock:
+        if _default_index is None:
+            _default_index = NewsIndex(settings.NEWS_INDEX_PATH)
+    return _default_index
@@ -0,0 +1,75 @@
+"""
+Numeric normalization of ForexFactory actual / forecast / previous values.
+
+Whole columns are parsed in one pass with pandas string operations (the same parser
+as scraper.export): "0.3%" -> 0.3, "-12.5K" -> -12500.0, "1.2B" -> 1.2e9, "<0.1%" -> 0.1.
+Each row gains:
+
+    <column>_value  the parsed float for actual, forecast and previous (null if not a number)
+    unit            first suffix among the three: "%", "K", "M", "B", "T", or null
+    surprise        actual - forecast
+    beat_miss       "beat" (actual above forecast), "miss" (below), "inline", or null
+
+beat_miss is direction only: whether a higher print is good news depends on the event
+(a higher unemployment rate is still a "beat" here).
+"""
+from scraper import export
+
+EVENT_COLUMNS = ("actual", "forecast", "previous")
+HISTORY_COLUMNS = ("history_actual", "history_forecast", "history_previous")
+
+
+def _nullable(values) -> list:
+    # NaN -> None, so rows encode the same with orjson and the stdlib json module
+    import numpy as np
+
+    out = values.astype(object)
+    out[np.isnan(values)] = None
+    return out.tolist()
+
+
+def normalize_rows(rows, columns=EVENT_COLUMNS) -> list:
+    """
+    Add parsed values, unit, surprise and beat_miss to every row.
+    Args:
+        rows (list): Event or history row dicts
+        columns (tuple): Names of the actual, forecast and previous fields
+    Returns:
+        list: New dict rows; the input rows (possibly cached) are left as they are
+    """
+    if not rows:
+        return []
+    import numpy as np
+
+    # One pass over all three columns: they share most of their distinct strings
+    numbers, suffixes = export.parse_numeric([row[name] for name in columns for row in rows])
+    actual, forecast, previous = numbers.to_numpy().reshape(3, len(rows))
+    suffixes = suffixes.to_numpy(dtype=object).reshape(3, len(rows))
+
+    # First non-empty suffix across actual / forecast / previous
+    unit = np.where(suffixes[0] != "", suffixes[0], np.where(suffixes[1] != "", suffixes[1], suffixes[2]))
+    unit[unit == ""] = None
+
+    # Rounded so 0.3 - 0.2 reads 0.1, not 0.09999999999999998
+    surprise = np.round(actual - forecast, 10)
+    beat_miss = np.full(len(rows), None, dtype=object)
+    beat_miss[surprise > 0] = "beat"
+    beat_miss[surprise < 0] = "miss"
+    beat_miss[surprise == 0] = "inline"
+
+    names = (f"{columns[0]}_value", f"{columns[1]}_value", f"{columns[2]}_value", "unit", "surprise", "beat_miss")
+    added = zip(
+        _nullable(actual), _nullable(forecast), _nullable(previous),
+        unit.tolist(), _nullable(surprise), beat_miss.tolist(),
+    )
+    normalized = []
+    for row, values in zip(rows, added):
+        row = dict(row)
+        row.update(zip(names, values))
+        normalized.append(row)
+    return normalized
+
+
+def normalize_history(result: dict) -> dict:
+    """A HistoryScraper result with its history_data normalized"""
+    return {**result, "history_data": normalize_rows(result["history_data"], HISTORY_COLUMNS)}
@@ -0,0 +1,195 @@
+import importlib.util
+import logging
+from functools import lru_cache
+
+from scraper import settings
+
+logger = logging.getLogger(__name__)
+
+# Fastest first; "auto" picks the first one that is installed
+BACKENDS = ("selectolax", "lxml", "bs4")
+
+
+class Node:
+    """
+    Minimal element interface shared by every parser backend.
+
+    Scrapers only use these methods, so the backend can change without touching them.
+    """
+
+    __slots__ = ()
+
+    def css(self, selector: str) -> list:
+        raise NotImplementedError
+
+    def css_first(self, selector: str):
+        raise NotImplementedError
+
+    def text(self, separator: str = "", strip: bool = False) -> str:
+        """All descendant text; with strip=True each text node is stripped and blanks dropped"""
+        raise NotImplementedError
+
+    def attr(self, name: str, default=None):
+        raise NotImplementedError
+
+    def next_sibling(self, tag: str):
+        """First following sibling element with the given tag"""
+        raise NotImplementedError
+
+
+class SelectolaxNode(Node):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def css(self, selector):
+        return [SelectolaxNode(node) for node in self.node.css(selector)]
+
+    def css_first(self, selector):
+        node = self.node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def text(self, separator="", strip=False):
+        return self.node.text(separator=separator, strip=strip)
+
+    def attr(self, name, default=None):
+        value = self.node.attributes.get(name)
+        return default if value is None else value
+
+    def next_sibling(self, tag):
+        node = self.node.next
+        while node is not None and node.tag != tag:
+            node = node.next
+        return SelectolaxNode(node) if node is not None else None
+
+
+@lru_cache(maxsize=256)
+def _lxml_selector(selector: str):
+    from lxml.cssselect import CSSSelector
+
+    return CSSSelector(selector)
+
+
+class LxmlNode(Node):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def css(self, selector):
+        return [LxmlNode(node) for node in _lxml_selector(selector)(self.node)]
+
+    def css_first(self, selector):
+        nodes = _lxml_selector(selector)(self.node)
+        return LxmlNode(nodes[0]) if nodes else None
+
+    def text(self, separator="", strip=False):
+        pieces = self.node.itertext()
+        if strip:
+            pieces = (piece.strip() for piece in pieces)
+            pieces = (piece for piece in pieces if piece)
+        return separator.join(pieces)
+
+    def attr(self, name, default=None):
+        return self.node.get(name, default)
+
+    def next_sibling(self, tag):
+        return next((LxmlNode(node) for node in self.node.itersiblings(tag)), None)
+
+
+class SoupNode(Node):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def css(self, selector):
+        return [SoupNode(node) for node in self.node.select(selector)]
+
+    def css_first(self, selector):
+        node = self.node.select_one(selector)
+        return SoupNode(node) if node is not None else None
+
+    def text(self, separator="", strip=False):
+        return self.node.get_text(separator, strip=strip)
+
+    def attr(self, name, default=None):
+        value = self.node.get(name, default)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def next_sibling(self, tag):
+        node = self.node.find_next_sibling(tag)
+        return SoupNode(node) if node is not None else None
+
+
+def available_backends() -> list:
+    modules = {"selectolax": "selectolax", "lxml": "lxml.cssselect", "bs4": "bs4"}
+    return [name for name in BACKENDS if _installed(modules[name])]
+
+
+def _installed(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+_backend = None
+
+
+def default_backend() -> str:
+    if _backend is None:
+        set_backend(settings.HTML_PARSER)
+    return _backend
+
+
+def set_backend(name: str):
+    """
+    Choose the backend used when parse_html is called without one.
+    Args:
+        name (str): "auto", "selectolax", "lxml" or "bs4"
+    """
+    global _backend
+    if name == "auto":
+        backends = available_backends()
+        if not backends:
+            raise RuntimeError("No HTML parser installed; install selectolax, lxml or bs4")
+        name = backends[0]
+    elif name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{name}'")
+    logger.info(f"Using HTML parser backend: {name}")
+    _backend = name
+
+
+def parse_html(html, backend=None) -> Node:
+    """
+    Parse an HTML document or fragment.
+    Args:
+        html (str | bytes): Markup to parse
+        backend (str): "selectolax", "lxml" or "bs4"; defaults to settings.HTML_PARSER
+    Returns:
+        Node: Root node of the parsed tree
+    """
+    backend = backend or default_backend()
+
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+
+        return SelectolaxNode(LexborHTMLParser(html).root)
+
+    if backend == "lxml":
+        import lxml.html
+
+        if not html.strip():
+            return LxmlNode(lxml.html.Element("html"))
+        # lxml assumes latin-1 for bytes without a <meta charset>; the upstream sites are UTF-8
+        parser = lxml.html.HTMLParser(encoding="utf-8") if isinstance(html, bytes) else None
+        return LxmlNode(lxml.html.document_fromstring(html, parser=parser))
+
+    if backend == "bs4":
+        from bs4 import BeautifulSoup
+
+        return SoupNode(BeautifulSoup(html, "html.parser"))
+
+    raise ValueError(f"Unknown HTML parser backend '{backend}'")
@@ -0,0 +1,48 @@
+"""
+Calendar / history row shapes and JSON encoding for responses.
+
+Rows are plain dicts built from literal keys: orjson encodes those several times faster
+than slotted dataclasses, which saved only ~150 B per row (benchmarks/bench_records.py).
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+EVENT_FIELDS = ("event_id", "day", "date", "time", "currency", "impact", "event", "actual", "forecast", "previous")
+HISTORY_FIELDS = ("date", "history_actual", "history_forecast", "history_previous")
+
+
+def event_row(event_id, day, date, time, currency, impact, event, actual, forecast, previous) -> dict:
+    """One ForexFactory calendar event (calendar page row or apply-settings event)"""
+    return {
+        "event_id": event_id,
+        "day": day,
+        "date": date,
+        "time": time,
+        "currency": currency,
+        "impact": impact,
+        "event": event,
+        "actual": actual,
+        "forecast": forecast,
+        "previous": previous,
+    }
+
+
+def history_row(date, history_actual, history_forecast, history_previous) -> dict:
+    """One past release of a ForexFactory event"""
+    return {
+        "date": date,
+        "history_actual": history_actual,
+        "history_forecast": history_forecast,
+        "history_previous": history_previous,
+    }
+
+
+def dumps(value) -> bytes:
+    """Serialize to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
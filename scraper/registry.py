@@ -0,0 +1,35 @@
+import importlib
+from collections.abc import Mapping
+
+
+class LazyScrapers(Mapping):
+    """
+    Scraper callables by name, imported on first lookup.
+
+    Entries are "module:attribute" strings, so registering a scraper costs nothing at
+    startup: the module (and the HTTP clients, parsers and stores it pulls in) is only
+    imported when a request first needs it. Membership tests and iteration never import.
+    """
+
+    def __init__(self, entries: dict):
+        self._entries = dict(entries)
+        self._resolved = {}
+
+    def __getitem__(self, name: str):
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        module_name, _, attribute = self._entries[name].partition(":")
+        value = getattr(importlib.import_module(module_name), attribute)
+        self._resolved[name] = value
+        return value
+
+    def __contains__(self, name) -> bool:
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import random
+import time
+
+from scraper import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    __slots__ = ("name", "func", "interval", "runs", "failures", "last_run", "last_duration", "last_error")
+
+    def __init__(self, name: str, func, interval: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.runs = 0
+        self.failures = 0
+        self.last_run = None
+        self.last_duration = None
+        self.last_error = None
+
+
+class PrefetchScheduler:
+    """
+    Run refresh coroutines on fixed intervals in the background.
+
+    Each job gets its own task; a failing job is logged and retried on its next tick,
+    never stopping the others. Intervals are spread by +/- `jitter` (a fraction) so
+    jobs sharing an upstream do not fire in lockstep.
+    """
+
+    def __init__(self, jitter=None):
+        self.jitter = settings.PREFETCH_JITTER if jitter is None else jitter
+        self.jobs = []
+        self._tasks = []
+
+    def add(self, name: str, func, interval: float):
+        """
+        Register a job before `start`.
+        Args:
+            name (str): Label used in logs and stats
+            func (callable): Coroutine function doing one refresh
+            interval (float): Seconds between runs
+        """
+        self.jobs.append(Job(name, func, interval))
+
+    def start(self):
+        for job in self.jobs:
+            self._tasks.append(asyncio.ensure_future(self._run(job)))
+        logger.info(f"Prefetch scheduler started with {len(self.jobs)} job(s)")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> list:
+        return [{
+            "name": job.name,
+            "interval": job.interval,
+            "runs": job.runs,
+            "failures": job.failures,
+            "last_run": job.last_run,
+            "last_duration": job.last_duration,
+            "last_error": job.last_error,
+        } for job in self.jobs]
+
+    def _delay(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run(self, job: Job):
+        # Stagger the first run so startup does not hit every upstream at once
+        await asyncio.sleep(random.uniform(0, job.interval * self.jitter))
+        while True:
+            started = time.time()
+            try:
+                await job.func()
+                job.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.failures += 1
+                job.last_error = str(e)
+                logger.warning(f"Prefetch job {job.name} failed: {e}")
+            job.runs += 1
+            job.last_run = started
+            job.last_duration = round(time.time() - started, 3)
+            await asyncio.sleep(self._delay(job.interval))
@@ -0,0 +1,122 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+# Root log level for app.py and the command-line tools (the scraper modules only get loggers)
+LOG_LEVEL = os.getenv("SCRAPER_LOG_LEVEL", "INFO").upper()
+
+# Outbound HTTP
+REQUEST_TIMEOUT = _float("SCRAPER_REQUEST_TIMEOUT", 15.0)
+
+# Per-host throttling: token bucket rate (requests/second) and burst. A 429/503 halves
+# the rate, down to RATE_LIMIT_MIN, and successes bring it back. ForexFactory gets its
+# own, lower rate because bursts of history pagination get us blocked there.
+RATE_LIMIT = _float("SCRAPER_RATE_LIMIT", 5.0)
+RATE_LIMIT_BURST = _int("SCRAPER_RATE_LIMIT_BURST", 10)
+RATE_LIMIT_MIN = _float("SCRAPER_RATE_LIMIT_MIN", 0.2)
+FOREXFACTORY_RATE_LIMIT = _float("SCRAPER_FOREXFACTORY_RATE_LIMIT", 2.0)
+
+# Attempts per request for connection errors, timeouts, 429 and 5xx, with
+# full-jitter exponential backoff (seconds)
+RETRY_ATTEMPTS = _int("SCRAPER_RETRY_ATTEMPTS", 3)
+RETRY_BACKOFF = _float("SCRAPER_RETRY_BACKOFF", 0.5)
+RETRY_BACKOFF_MAX = _float("SCRAPER_RETRY_BACKOFF_MAX", 10.0)
+
+# Circuit breaker: consecutive failures that open a host's circuit, and seconds
+# before a probe request is let through again
+BREAKER_THRESHOLD = _int("SCRAPER_BREAKER_THRESHOLD", 5)
+BREAKER_RESET = _float("SCRAPER_BREAKER_RESET", 30.0)
+
+# Send every upstream request to this base URL instead, e.g. the benchmarks stub server:
+# https://www.cnbc.com/world/ becomes <SCRAPER_UPSTREAM_URL>/www.cnbc.com/world/.
+# Browser domains then use the plain HTTP clients too.
+UPSTREAM_URL = os.getenv("SCRAPER_UPSTREAM_URL", "").rstrip("/")
+
+# Add a Server-Timing header (per-stage durations, see scraper/metrics.py) to API responses
+SERVER_TIMING = os.getenv("SCRAPER_SERVER_TIMING", "0").lower() in ("1", "true", "yes")
+
+# Worker threads for blocking-only calls (botasaurus requests, HTML parsing, file IO)
+BLOCKING_WORKERS = _int("SCRAPER_BLOCKING_WORKERS", 16)
+
+# Per-domain connection pools
+MAX_CONNECTIONS = _int("SCRAPER_MAX_CONNECTIONS", 20)
+MAX_KEEPALIVE_CONNECTIONS = _int("SCRAPER_MAX_KEEPALIVE_CONNECTIONS", 10)
+KEEPALIVE_EXPIRY = _float("SCRAPER_KEEPALIVE_EXPIRY", 30.0)
+# "auto" enables HTTP/2 when the h2 package is installed
+HTTP2 = os.getenv("SCRAPER_HTTP2", "auto").lower()
+
+# Response cache (TTLs in seconds); set SCRAPER_CACHE_PATH to persist it in SQLite
+CACHE_MAX_ENTRIES = _int("SCRAPER_CACHE_MAX_ENTRIES", 1024)
+CACHE_PATH = os.getenv("SCRAPER_CACHE_PATH", "")
+LATEST_NEWS_TTL = _float("SCRAPER_LATEST_NEWS_TTL", 30.0)
+CALENDAR_TTL = _float("SCRAPER_CALENDAR_TTL", 60.0)
+# Calendar days that ended before yesterday no longer change: cached forever by default
+CALENDAR_PAST_TTL = _float("SCRAPER_CALENDAR_PAST_TTL", float("inf"))
+CACHE_STALE_TTL = _float("SCRAPER_CACHE_STALE_TTL", 300.0)
+HISTORY_TTL = _float("SCRAPER_HISTORY_TTL", 900.0)
+# Expired responses are kept this much longer and served when a refresh fails
+CACHE_ERROR_TTL = _float("SCRAPER_CACHE_ERROR_TTL", 24 * 3600.0)
+# Concurrent misses for one key share a single upstream fetch; 0 gives each its own
+CACHE_COALESCE = os.getenv("SCRAPER_CACHE_COALESCE", "1") != "0"
+
+# Opt-in: directory for per-scrape calendar JSON snapshots
+CALENDAR_SNAPSHOT_DIR = os.getenv("SCRAPER_CALENDAR_SNAPSHOT_DIR", "")
+
+# HTML parser backend: auto, selectolax, lxml or bs4
+HTML_PARSER = os.getenv("SCRAPER_HTML_PARSER", "auto").lower()
+
+# Batch detail pages: concurrent fetches per domain, per-URL timeout, max URLs per request
+BATCH_CONCURRENCY = _int("SCRAPER_BATCH_CONCURRENCY", 8)
+BATCH_URL_TIMEOUT = _float("SCRAPER_BATCH_URL_TIMEOUT", 30.0)
+BATCH_MAX_URLS = _int("SCRAPER_BATCH_MAX_URLS", 500)
+
+# Most days one multi-day calendar request (dates / week) may ask for
+CALENDAR_MAX_DAYS = _int("SCRAPER_CALENDAR_MAX_DAYS", 31)
+
+# ForexFactory history pages requested ahead concurrently
+HISTORY_PAGE_WINDOW = _int("SCRAPER_HISTORY_PAGE_WINDOW", 4)
+
+# Where the SQLite files below live by default; created when the first one is opened
+DATA_DIR = os.getenv(
+    "SCRAPER_DATA_DIR",
+    os.path.join(os.getenv("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"), "news-scraper"),
+)
+
+# SQLite full-text index of every scraped CNBC / Investing article; empty disables it
+NEWS_INDEX_PATH = os.getenv("SCRAPER_NEWS_INDEX_PATH", os.path.join(DATA_DIR, "news_index.sqlite3"))
+
+# SQLite file keeping ForexFactory event history between calls; empty disables it
+HISTORY_STORE_PATH = os.getenv("SCRAPER_HISTORY_STORE_PATH", os.path.join(DATA_DIR, "history_store.sqlite3"))
+
+# ForexFactory date ranges: days per apply-settings request, chunks fetched at once,
+# and how long chunks that ended before yesterday stay cached (seconds)
+RANGE_CHUNK_DAYS = _int("SCRAPER_RANGE_CHUNK_DAYS", 7)
+RANGE_CONCURRENCY = _int("SCRAPER_RANGE_CONCURRENCY", 4)
+RANGE_PAST_TTL = _float("SCRAPER_RANGE_PAST_TTL", 30 * 24 * 3600.0)
+RANGE_CACHE_MAX_ENTRIES = _int("SCRAPER_RANGE_CACHE_MAX_ENTRIES", 256)
+# SQLite file for range chunks so interrupted backfills resume; empty keeps them in memory
+RANGE_CACHE_PATH = os.getenv("SCRAPER_RANGE_CACHE_PATH", os.path.join(DATA_DIR, "range_cache.sqlite3"))
+
+# Keyword list used for relevance scoring (score=true) and by scraper.checker
+KEYWORDS_PATH = os.getenv("SCRAPER_KEYWORDS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "keywords.txt"))
+
+# Background prefetch of hot endpoints into the response cache (intervals in seconds;
+# keep them below the matching TTL + SCRAPER_CACHE_STALE_TTL so users never wait).
+# Off by default: every worker process runs its own scheduler, so enable it on one worker only
+PREFETCH_ENABLED = os.getenv("SCRAPER_PREFETCH", "0").lower() in ("1", "true", "yes")
+PREFETCH_JITTER = _float("SCRAPER_PREFETCH_JITTER", 0.1)
+PREFETCH_LATEST_INTERVAL = _float("SCRAPER_PREFETCH_LATEST_INTERVAL", 20.0)
+PREFETCH_CALENDAR_INTERVAL = _float("SCRAPER_PREFETCH_CALENDAR_INTERVAL", 45.0)
+PREFETCH_WEEK_INTERVAL = _float("SCRAPER_PREFETCH_WEEK_INTERVAL", 300.0)
+PREFETCH_HISTORY_INTERVAL = _float("SCRAPER_PREFETCH_HISTORY_INTERVAL", 600.0)
@@ -0,0 +1,125 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while a host's circuit breaker is open"""
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket for one upstream host.
+
+    `reserve` takes a token and returns how long the caller must wait before sending, so
+    the same bucket serves threads (time.sleep) and coroutines (asyncio.sleep). Tokens may
+    go negative: waiting callers queue up behind each other instead of all waking at once.
+    A 429/503 halves the rate (and honours Retry-After); each success adds back a tenth
+    of the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.throttled = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token; returns the seconds to wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate) - 1
+            self._updated = now
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def throttle(self, retry_after=None):
+        """Upstream asked us to slow down"""
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def recover(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def stats(self) -> dict:
+        return {"rate": round(self.rate, 3), "max_rate": self.max_rate, "throttled": self.throttled}
+
+
+class CircuitBreaker:
+    """
+    Stop calling a host after `threshold` consecutive failures.
+
+    While open, `check` raises CircuitOpenError straight away. Once `reset_timeout` has
+    passed one probe request is let through (half-open); its success closes the circuit,
+    its failure opens it again. A probe that never reports back only holds the circuit for
+    another `reset_timeout`.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self.state = "closed"
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def check(self, domain: str):
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                self._opened_at = now
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit open for {domain}; not calling it for up to {self.reset_timeout:g}s")
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = "closed"
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or (self.state == "closed" and self.failures >= self.threshold):
+                self.state = "open"
+                self.trips += 1
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+
+def retry_after(response):
+    """Seconds from a Retry-After header (delta or HTTP date), or None"""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt: int, base: float, cap: float, floor=None) -> float:
+    """Full-jitter exponential backoff, never shorter than `floor` (e.g. Retry-After)"""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, floor or 0.0)
@@ -0,0 +1,42 @@
+"""
+Shared setup: every test talks to benchmarks.stub_server, serving a synthetic fixture
+set, instead of the real upstreams. The environment is set before any scraper module
+is imported, because settings are read at import time.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_server import start_in_thread  # noqa: E402
+
+FIXTURES_DIR = tempfile.mkdtemp(prefix="scraper-fixtures-")
+STUB = start_in_thread(port=0, fixtures_dir=FIXTURES_DIR)
+
+os.environ.update({
+    "SCRAPER_UPSTREAM_URL": f"http://127.0.0.1:{STUB.server_port}",
+    "SCRAPER_DATA_DIR": tempfile.mkdtemp(prefix="scraper-data-"),
+    "SCRAPER_PREFETCH": "0",
+    "SCRAPER_NEWS_INDEX_PATH": "",
+    "SCRAPER_HISTORY_STORE_PATH": "",
+    "SCRAPER_RANGE_CACHE_PATH": "",
+    "SCRAPER_CACHE_PATH": "",
+    "SCRAPER_RATE_LIMIT": "1000000",
+    "SCRAPER_FOREXFACTORY_RATE_LIMIT": "1000000",
+    "SCRAPER_RATE_LIMIT_BURST": "1000000",
+    "SCRAPER_RETRY_BACKOFF": "0.01",
+})
+
+from benchmarks.record import record_synthetic  # noqa: E402  (imports the scrapers)
+
+PARAMS = record_synthetic(FIXTURES_DIR, history_pages=3)["params"]
+
+
+@pytest.fixture
+def params():
+    """Request parameters matching the synthetic fixtures (keyword, date, range, event_id, ...)"""
+    return dict(PARAMS)
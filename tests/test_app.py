@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+from scraper import news_index, settings
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # A fresh index per test; the suite otherwise runs with it disabled
+    monkeypatch.setattr(settings, "NEWS_INDEX_PATH", str(tmp_path / "news_index.sqlite3"))
+    monkeypatch.setattr(news_index, "_default_index", None)
+    return TestClient(app.app)
+
+
+@pytest.mark.parametrize("limit", [0, -1, 201])
+def test_news_search_limit_out_of_range(client, limit):
+    response = client.post("/v1/news/search", json={"keyword": "rate", "limit": limit})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("limit", [1, 200])
+def test_news_search_limit_in_range(client, limit):
+    response = client.post("/v1/news/search", json={"keyword": "rate", "limit": limit})
+    assert response.status_code == 200
+    assert response.json() == {"total_result": 0, "data": []}
+
+
+def test_app_starts_twice_in_one_process(client):
+    # aclose() at shutdown must not leave the next lifespan without a worker pool
+    for _ in range(2):
+        with client:
+            assert client.post("/v1/news/search", json={"keyword": "rate"}).status_code == 200
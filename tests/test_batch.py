@@ -0,0 +1,36 @@
+import asyncio
+
+from scraper import batch, settings
+
+
+async def detail(url):
+    await asyncio.sleep(0.001)
+    if url.endswith("/error"):
+        return {"error": "blocked"}
+    if url.endswith("/raise"):
+        raise RuntimeError("boom")
+    return {"title": url}
+
+
+def test_fetch_all_keeps_order_and_reports_failures():
+    urls = ["https://example.com/a", "https://example.com/error", "https://example.com/raise"]
+    results = asyncio.run(batch.fetch_all("example.com", detail, urls))
+    assert [result["url"] for result in results] == urls
+    assert [result["ok"] for result in results] == [True, False, False]
+    assert results[1]["error"] == "blocked"
+    assert results[2]["error"] == "boom"
+
+
+def test_fetch_all_survives_repeated_asyncio_run():
+    # More URLs than the limit, so the semaphore is contended (and bound) in each loop
+    urls = [f"https://example.com/{i}" for i in range(settings.BATCH_CONCURRENCY * 3)]
+    for _ in range(2):
+        results = asyncio.run(batch.fetch_all("example.com", detail, urls))
+        assert all(result["ok"] for result in results)
+
+
+def test_fetch_many_yields_every_url():
+    async def collect():
+        return [result async for result in batch.fetch_many("example.com", detail, ["https://example.com/a"] * 5)]
+
+    assert len(asyncio.run(collect())) == 5
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from scraper.cache import ResponseCache, SQLiteBackend
+
+
+class Upstream:
+    """Fetch function counting its calls; returns the queued values, or raises them"""
+
+    def __init__(self, *values, delay=0.0):
+        self.values = list(values)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        value = self.values.pop(0) if len(self.values) > 1 else self.values[0]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = ResponseCache()
+    fetch = Upstream(["a"], delay=0.05)
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_fetch("k", fetch, ttl=60) for _ in range(10)))
+
+    assert asyncio.run(main()) == [["a"]] * 10
+    assert fetch.calls == 1
+    assert cache.stats()["misses"] == 10
+    assert cache.stats()["inflight"] == 0
+
+
+def test_fresh_entry_is_served_without_fetching():
+    cache = ResponseCache()
+    fetch = Upstream(["a"], ["b"])
+
+    async def main():
+        return [await cache.get_or_fetch("k", fetch, ttl=60) for _ in range(3)]
+
+    assert asyncio.run(main()) == [["a"]] * 3
+    assert fetch.calls == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = ResponseCache()
+    fetch = Upstream(["new"], delay=0.01)
+
+    async def main():
+        await cache.set("k", ["old"], ttl=0, stale_ttl=60)
+        stale = await asyncio.gather(*(cache.get_or_fetch("k", fetch, ttl=60) for _ in range(5)))
+        await asyncio.sleep(0.05)
+        return stale, await cache.get_or_fetch("k", fetch, ttl=60)
+
+    stale, refreshed = asyncio.run(main())
+    assert stale == [["old"]] * 5
+    assert refreshed == ["new"]
+    assert fetch.calls == 1
+    assert cache.stats()["stale_hits"] == 5
+
+
+def test_uncacheable_value_is_not_stored():
+    cache = ResponseCache(cacheable=bool)
+    fetch = Upstream([], ["a"])
+
+    async def main():
+        return [await cache.get_or_fetch("k", fetch, ttl=60) for _ in range(3)]
+
+    assert asyncio.run(main()) == [[], ["a"], ["a"]]
+    assert fetch.calls == 2
+
+
+def test_expired_entry_answers_when_refresh_fails():
+    cache = ResponseCache(error_ttl=60)
+    fetch = Upstream(RuntimeError("upstream down"))
+
+    async def main():
+        await cache.set("k", ["old"], ttl=0)
+        return await cache.get_or_fetch("k", fetch, ttl=60)
+
+    assert asyncio.run(main()) == ["old"]
+    assert cache.stats()["error_hits"] == 1
+
+
+def test_expired_entry_answers_when_refresh_is_uncacheable():
+    cache = ResponseCache(error_ttl=60, cacheable=bool)
+    fetch = Upstream([])
+
+    async def main():
+        await cache.set("k", ["old"], ttl=0)
+        return await cache.get_or_fetch("k", fetch, ttl=60)
+
+    assert asyncio.run(main()) == ["old"]
+    assert cache.stats()["error_hits"] == 1
+
+
+def test_fetch_error_propagates_without_error_ttl():
+    cache = ResponseCache()
+    fetch = Upstream(RuntimeError("upstream down"))
+
+    async def main():
+        await cache.set("k", ["old"], ttl=0)
+        return await cache.get_or_fetch("k", fetch, ttl=60)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+    assert cache.stats()["inflight"] == 0
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ResponseCache(max_entries=2)
+    fetch = Upstream("fetched")
+
+    async def main():
+        for key in "abc":
+            await cache.set(key, key, ttl=60)
+        return await cache.get_or_fetch("a", fetch, ttl=60), await cache.get_or_fetch("c", fetch, ttl=60)
+
+    assert asyncio.run(main()) == ("fetched", "c")
+    assert fetch.calls == 1
+
+
+def test_backend_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    asyncio.run(ResponseCache(backend=SQLiteBackend(path)).set("k", {"days": [1, 2]}, ttl=60))
+
+    cache = ResponseCache(backend=SQLiteBackend(path))
+    assert asyncio.run(cache.get_or_fetch("k", Upstream(None), ttl=60)) == {"days": [1, 2]}
+    assert cache.stats()["hits"] == 1
+
+
+def test_peek_and_put_for_blocking_callers(tmp_path):
+    cache = ResponseCache(backend=SQLiteBackend(str(tmp_path / "responses.sqlite3")))
+    assert cache.peek("k") is None
+    cache.put("k", {"days": []}, ttl=60)
+    cache.put("expired", {"days": []}, ttl=0)
+    assert cache.peek("k") == {"days": []}
+    assert cache.peek("expired") is None
+    assert ResponseCache(backend=cache.backend).peek("k") == {"days": []}
+
+
+def test_without_coalescing_every_miss_fetches():
+    cache = ResponseCache(coalesce=False)
+    fetch = Upstream(["a"], delay=0.01)
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_fetch("k", fetch, ttl=0) for _ in range(5)))
+
+    assert asyncio.run(main()) == [["a"]] * 5
+    assert fetch.calls == 5
@@ -0,0 +1,66 @@
+import io
+import json
+
+import pytest
+
+from scraper.checker import iter_articles, iter_json_values
+
+VALUES = [
+    {"title": "a", "nested": {"list": [1, 2, {"x": "]["}]}},
+    123456789,
+    "a string with , and ] inside",
+    True,
+    None,
+    {"title": "ü ✓"},
+]
+
+
+def read(text, chunk_size):
+    return list(iter_json_values(io.StringIO(text), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 1 << 20])
+def test_json_array_across_chunk_boundaries(chunk_size):
+    assert read(json.dumps(VALUES, indent=2), chunk_size) == VALUES
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 1 << 20])
+def test_ndjson_across_chunk_boundaries(chunk_size):
+    text = "\n".join(json.dumps(value) for value in VALUES) + "\n"
+    assert read(text, chunk_size) == VALUES
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+def test_number_split_across_chunks(chunk_size):
+    # "1e-07" read as "1e" + "-07" must not yield 1
+    assert read("[-0.5, 1e-07, 12.5E+3]\n", chunk_size) == [-0.5, 1e-07, 12500.0]
+    assert read("-0.5\n1e-07\n", chunk_size) == [-0.5, 1e-07]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 20])
+def test_number_at_end_of_file(chunk_size):
+    assert read("[1, 22, 333]", chunk_size) == [1, 22, 333]
+    assert read("12345", chunk_size) == [12345]
+
+
+def test_empty_input():
+    assert read("", 4) == []
+    assert read("[]\n", 4) == []
+
+
+def test_truncated_input_raises():
+    with pytest.raises(ValueError):
+        read('[{"title": "a"}, {"title": ', 4)
+
+
+def test_iter_articles_unwraps_batch_results():
+    text = "\n".join(json.dumps(value) for value in [
+        {"title": "plain"},
+        [{"title": "listed"}, "not an article"],
+        {"url": "u1", "ok": True, "data": {"title": "batch"}},
+        {"url": "u2", "ok": False, "data": {"error": "timeout"}},
+        {"url": "u3", "ok": True, "data": [{"title": "b1"}, {"title": "b2"}]},
+    ])
+    assert [article.get("title") for article in iter_articles(io.StringIO(text))] == [
+        "plain", "listed", "batch", "b1", "b2",
+    ]
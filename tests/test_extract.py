@@ -0,0 +1,60 @@
+from scraper.extract import ParseMemo, assigned_json, digest, region
+
+PAGE = (
+    '<html><script>var x = 1;</script>'
+    '<script>window.__s_data = {"a": {"b": [1, 2]}, "c": "}"};</script>'
+    '<div>after</div></html>'
+)
+
+
+def test_assigned_json_fast_path():
+    assert assigned_json(PAGE, "window.__s_data") == {"a": {"b": [1, 2]}, "c": "}"}
+    assert assigned_json(PAGE.encode(), "window.__s_data") == {"a": {"b": [1, 2]}, "c": "}"}
+
+
+def test_assigned_json_with_statements_after_the_object():
+    page = '<script>window.__s_data = {"a": 1}; window.other = {"b": 2};</script>'
+    assert assigned_json(page, "window.__s_data") == {"a": 1}
+
+
+def test_assigned_json_without_closing_script():
+    assert assigned_json('window.__s_data = {"a": 1};', "window.__s_data") == {"a": 1}
+
+
+def test_assigned_json_missing_or_not_an_object():
+    assert assigned_json(PAGE, "window.__missing") is None
+    assert assigned_json('<script>window.__s_data = null;</script><p>{}</p>', "window.__s_data") is None
+    assert assigned_json('<script>window.__s_data = {broken</script>', "window.__s_data") is None
+
+
+def test_region_covers_every_repeated_block():
+    body = b"<ul><li class=card>a</li><li class=card>b</li></ul><footer>"
+    assert region(body, b"<li class=card>", b"</ul>") == b"<li class=card>a</li><li class=card>b</li>"
+    assert region(body, b"<table>", b"</ul>") is None
+
+
+def test_parse_memo_reuses_result_for_unchanged_region():
+    memo = ParseMemo()
+    calls = []
+
+    def parse(body):
+        calls.append(body)
+        return [body.upper()]
+
+    assert memo.parse("u", digest("a"), parse, "a") == ["A"]
+    assert memo.parse("u", digest("a"), parse, "a") == ["A"]
+    assert memo.parse("u", digest("b"), parse, "b") == ["B"]
+    assert calls == ["a", "b"]
+    assert (memo.hits, memo.misses) == (1, 2)
+    assert memo.last("u") == ["B"]
+    assert memo.last("other") is None
+
+
+def test_parse_memo_skips_errors_and_missing_digest():
+    memo = ParseMemo()
+    assert memo.parse("u", digest("a"), lambda: {"error": "blocked"}) == {"error": "blocked"}
+    assert memo.last("u") is None
+
+    memo.parse("u", None, lambda: [1])
+    assert memo.parse("u", None, lambda: [2]) == [2]
+    assert memo.misses == 3
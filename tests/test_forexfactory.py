@@ -0,0 +1,60 @@
+import asyncio
+
+from scraper.cache import ResponseCache
+from scraper.forexfactory_scraper import HistoryScraper, RangeScraper
+
+
+def range_scraper(params, **kwargs):
+    return RangeScraper(*params["range"], chunk_days=2, cache=ResponseCache(), **kwargs)
+
+
+def test_range_scrape_matches_async(params):
+    expected = asyncio.run(range_scraper(params).scrape_async())
+    assert expected["days"]
+    assert range_scraper(params).scrape() == expected
+
+
+def test_range_scrape_inside_running_loop(params):
+    # Sync callers may already be on a loop (notebooks, async apps calling a script helper)
+    async def caller():
+        return range_scraper(params).scrape()
+
+    assert asyncio.run(caller())["days"]
+
+
+def test_range_scrape_caches_chunks(params):
+    scraper = range_scraper(params)
+    first = scraper.scrape()
+    assert scraper.cache.stats()["entries"] == len(scraper.chunks())
+    assert scraper.scrape() == first
+    assert scraper.cache.stats()["hits"] == len(scraper.chunks())
+
+
+class SlowTailHistoryScraper(HistoryScraper):
+    async def fetch_history_page_async(self, event_id, i):
+        if i > 3:
+            await asyncio.sleep(60)
+        return await super().fetch_history_page_async(event_id, i)
+
+
+def test_history_pagination_leaves_no_tasks_behind(params):
+    # The window runs past the last page; the speculative requests must be finished, not orphaned
+    async def paginate():
+        history = await SlowTailHistoryScraper().history_pagination_async(params["event_id"], window=8)
+        return history, asyncio.all_tasks() - {asyncio.current_task()}
+
+    history, pending = asyncio.run(paginate())
+    assert len(history) == 3 * 20
+    assert not pending
+
+
+def test_closing_chunk_stream_early_leaves_no_tasks_behind(params):
+    async def first_chunk():
+        chunks = range_scraper(params, concurrency=1).iter_chunks_async()
+        chunk = await chunks.__anext__()
+        await chunks.aclose()
+        return chunk, asyncio.all_tasks() - {asyncio.current_task()}
+
+    chunk, pending = asyncio.run(first_chunk())
+    assert chunk["days"]
+    assert not pending
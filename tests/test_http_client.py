@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from scraper import cnbc_scraper, http_client
+
+
+def test_async_client_survives_repeated_asyncio_run():
+    # Each asyncio.run() has its own loop; a client cached from the first must not be reused
+    first = asyncio.run(cnbc_scraper.latest_news_async())
+    second = asyncio.run(cnbc_scraper.latest_news_async())
+    assert first and second
+    assert [item["news_url"] for item in first] == [item["news_url"] for item in second]
+
+
+def test_one_client_per_loop():
+    pool = http_client.get_pool("https://www.cnbc.com/world/")
+
+    async def client():
+        return pool.async_client()
+
+    async def twice():
+        return pool.async_client(), pool.async_client()
+
+    a, b = asyncio.run(twice())
+    assert a is b
+    assert asyncio.run(client()) is not a
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = b""
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def drive(policy, outcomes):
+    """Run the shared retry policy over canned outcomes, returning the delays it asked for"""
+    delays = [next(policy)]
+    for outcome in outcomes:
+        delays.append(policy.send(outcome))
+    return delays
+
+
+def test_retry_policy_retries_then_returns_checked_response():
+    pool = http_client.get_pool("https://retry-policy.test/")
+    policy = http_client._retry_policy(pool, "GET", "https://retry-policy.test/", conditional=False)
+    ok = Response(200)
+
+    delays = drive(policy, [Response(503), ConnectionError("reset")])
+    assert delays[0] == 0 and all(delay > 0 for delay in delays[1:])
+    with pytest.raises(StopIteration) as done:
+        policy.send(ok)
+    assert done.value.value is ok
+    assert pool.retries == 2
+
+
+def test_retry_policy_raises_when_attempts_run_out():
+    pool = http_client.get_pool("https://retry-policy-out.test/")
+    policy = http_client._retry_policy(pool, "GET", "https://retry-policy-out.test/", conditional=False)
+    error = ConnectionError("reset")
+
+    drive(policy, [Response(502), Response(504)])
+    with pytest.raises(ConnectionError) as raised:
+        policy.send(error)
+    assert raised.value is error
+
+    # 404 is an answer, not a retryable failure
+    policy = http_client._retry_policy(pool, "GET", "https://retry-policy-out.test/", conditional=False)
+    next(policy)
+    with pytest.raises(RuntimeError, match="HTTP 404"):
+        policy.send(Response(404))
@@ -0,0 +1,77 @@
+import pytest
+
+from scraper import matcher
+from scraper.matcher import KeywordMatcher, rank
+
+KEYWORDS = ["fed", "federal reserve", "rate", "rate cut", "cut", "he", "she", "hers", "his", "ECB", "  ", "Fed"]
+TEXTS = [
+    "",
+    "The Federal Reserve delivered a rate cut; the ECB held rates.",
+    "ushers in his and hers: she said he cut",
+    "FED FED fed",
+    "no keywords here at all",
+    "federal reserve rate cutfederal",
+]
+
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    # Compiled without pyahocorasick; the fallback stays in place after the patch is undone
+    with monkeypatch.context() as patch:
+        patch.setattr(matcher, "ahocorasick", None)
+        return KeywordMatcher(KEYWORDS)
+
+
+def naive(keywords, text):
+    # Every (start, keyword) occurrence, overlapping ones included, like `keyword in text`
+    text = text.lower()
+    return sorted(
+        (start, keyword)
+        for keyword in keywords
+        for start in range(len(text))
+        if text.startswith(keyword, start)
+    )
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_pure_python_matches_naive_scan(pure_python, text):
+    assert sorted(pure_python.iter_matches(text)) == naive(pure_python.keywords, text)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_pyahocorasick_matches_pure_python(pure_python, text):
+    pytest.importorskip("ahocorasick")
+    compiled = KeywordMatcher(KEYWORDS)
+    assert compiled._automaton is not None and pure_python._automaton is None
+    assert sorted(compiled.iter_matches(text)) == sorted(pure_python.iter_matches(text))
+    assert compiled.hits(text) == pure_python.hits(text)
+    assert compiled.count(text) == pure_python.count(text)
+
+
+def test_keywords_are_normalized():
+    assert KeywordMatcher(KEYWORDS).keywords == (
+        "fed", "federal reserve", "rate", "rate cut", "cut", "he", "she", "hers", "his", "ecb",
+    )
+    assert list(KeywordMatcher([]).iter_matches("anything")) == []
+
+
+def test_scan():
+    scan = KeywordMatcher(["rate", "cut"]).scan("Rate cut, then another rate")
+    assert scan == {
+        "count": 2,
+        "total": 3,
+        "hits": {"rate": 2, "cut": 1},
+        "positions": {"rate": [0, 23], "cut": [5]},
+    }
+
+
+def test_rank_sorts_copies_by_total():
+    items = [
+        {"title": "Markets", "content": "quiet"},
+        {"title": "Rate cut", "content": "the fed cut rates"},
+        {"title": "Fed", "content": None},
+    ]
+    ranked = rank(items, KeywordMatcher(["fed", "rate", "cut"]))
+    assert [item["title"] for item in ranked] == ["Rate cut", "Fed", "Markets"]
+    assert ranked[0]["keyword_matches"] == {"title": 2, "content": 3, "total": 5, "keywords": ["cut", "fed", "rate"]}
+    assert "keyword_matches" not in items[1]
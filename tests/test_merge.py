@@ -0,0 +1,77 @@
+from scraper.forexfactory_scraper import RangeScraper, Scraper
+from scraper.history_store import merge_history
+from scraper.records import event_row
+
+
+def history(*rows):
+    return [
+        {"date": date, "history_actual": actual, "history_forecast": "0.2%", "history_previous": "0.1%"}
+        for date, actual in rows
+    ]
+
+
+def test_merge_history_puts_first_page_on_top():
+    stored = history(("Mar 1", "0.1%"), ("Feb 1", "0.2%"), ("Jan 1", "0.3%"))
+    first_page = history(("Apr 1", "0.5%"), ("Mar 1", "0.4%"))
+
+    merged = merge_history(first_page, stored)
+    assert [row["date"] for row in merged] == ["Apr 1", "Mar 1", "Feb 1", "Jan 1"]
+    # Revised values on the fresh page win
+    assert merged[1]["history_actual"] == "0.4%"
+
+
+def test_merge_history_without_overlap_needs_full_scrape():
+    stored = history(("Jan 1", "0.3%"))
+    assert merge_history(history(("Mar 1", "0.4%")), stored) is None
+
+
+def test_merge_history_empty_store():
+    first_page = history(("Mar 1", "0.4%"))
+    assert merge_history(first_page, []) == first_page
+
+
+def event(event_id, name="CPI"):
+    return {"id": event_id, "name": name}
+
+
+def test_merge_chunks_drops_repeated_events_and_folds_days():
+    chunks = [
+        {"days": [{"date": "Mon Jan 6", "events": [event(1), event(2)]},
+                  {"date": "Tue Jan 7", "events": [event(3)]}]},
+        # The next chunk repeats Jan 7 with one new event and one already seen
+        {"days": [{"date": "Tue Jan 7", "events": [event(3), event(4)]},
+                  {"date": "Wed Jan 8", "events": [event(2), event(5)]}]},
+    ]
+    merged = RangeScraper.merge_chunks(chunks)
+    assert [day["date"] for day in merged["days"]] == ["Mon Jan 6", "Tue Jan 7", "Wed Jan 8"]
+    assert [[ev["id"] for ev in day["events"]] for day in merged["days"]] == [[1, 2], [3, 4], [5]]
+    # The input chunks (possibly cached) are left as they were
+    assert [ev["id"] for ev in chunks[1]["days"][0]["events"]] == [3, 4]
+
+
+def row(event_id, day=None, date=None, time=None):
+    return event_row(event_id, day, date, time, "USD", "red", f"Event {event_id}", None, None, None)
+
+
+def test_merge_days_orders_days_and_fills_from_own_label():
+    days = [
+        ("2025-01-07", [row(3), row(4, time="8:30am"), row(5)]),
+        ("2025-01-06", [row(1, "Mon", "Jan 6", "All Day"), row(2)]),
+    ]
+    merged = Scraper.merge_days(days)
+    assert [(r["event_id"], r["day"], r["date"], r["time"]) for r in merged] == [
+        (1, "Mon", "Jan 6", "All Day"),
+        (2, "Mon", "Jan 6", "All Day"),
+        # Never carried over from the day before
+        (3, "Tue", "Jan 7", None),
+        (4, "Tue", "Jan 7", "8:30am"),
+        (5, "Tue", "Jan 7", "8:30am"),
+    ]
+
+
+def test_merge_days_drops_repeated_events_and_keeps_input_rows():
+    shared = row(2)
+    merged = Scraper.merge_days([("2025-01-06", [row(1), shared]), ("2025-01-07", [row(2), row(3)])])
+    assert [r["event_id"] for r in merged] == [1, 2, 3]
+    # Rows may be shared with the response cache
+    assert shared["day"] is None
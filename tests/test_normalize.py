@@ -0,0 +1,58 @@
+import math
+
+from scraper.export import parse_numeric
+from scraper.normalize import HISTORY_COLUMNS, normalize_history, normalize_rows
+from scraper.records import event_row, history_row
+
+
+def test_parse_numeric():
+    values = ["0.3%", "-12.5K", "1.2B", "<0.1%", "1,234.5", "", None, "n/a", "0.3%", "2T", "4.1M"]
+    numbers, suffixes = parse_numeric(values)
+    expected = [0.3, -12500.0, 1.2e9, 0.1, 1234.5, None, None, None, 0.3, 2e12, 4.1e6]
+    for got, want in zip(numbers.tolist(), expected):
+        assert math.isnan(got) if want is None else math.isclose(got, want)
+    assert suffixes.tolist() == ["%", "K", "B", "%", "", "", "", "", "%", "T", "M"]
+
+
+def event(actual, forecast, previous):
+    return event_row(1, "Mon", "Jan 6", "8:30am", "USD", "red", "CPI", actual, forecast, previous)
+
+
+def test_normalize_rows():
+    rows = [
+        event("0.3%", "0.2%", "0.1%"),
+        event("-12.5K", "-10K", ""),
+        event("1.0%", "1.0%", "0.9%"),
+        event("", "4.1%", "4.0%"),
+        event(None, None, None),
+    ]
+    normalized = normalize_rows(rows)
+    assert [
+        (row["actual_value"], row["forecast_value"], row["previous_value"], row["unit"], row["surprise"], row["beat_miss"])
+        for row in normalized
+    ] == [
+        (0.3, 0.2, 0.1, "%", 0.1, "beat"),
+        (-12500.0, -10000.0, None, "K", -2500.0, "miss"),
+        (1.0, 1.0, 0.9, "%", 0.0, "inline"),
+        (None, 4.1, 4.0, "%", None, None),
+        (None, None, None, None, None, None),
+    ]
+    # New rows out, original fields kept, input rows untouched
+    assert normalized[0]["event"] == "CPI"
+    assert "actual_value" not in rows[0]
+
+
+def test_normalize_rows_accepts_dicts_and_empty_input():
+    assert normalize_rows([]) == []
+    row = {"actual": "1.5M", "forecast": "1.2M", "previous": "1.1M", "extra": 1}
+    assert normalize_rows([row])[0]["surprise"] == 300000.0
+    assert "surprise" not in row
+
+
+def test_normalize_history():
+    result = {"data_event_id": "1", "history_data": [history_row("Jan 1", "0.5%", "0.4%", "0.3%")], "related_news": []}
+    normalized = normalize_history(result)
+    assert normalized["history_data"][0]["history_actual_value"] == 0.5
+    assert normalized["history_data"][0]["beat_miss"] == "beat"
+    assert set(HISTORY_COLUMNS) <= normalized["history_data"][0].keys()
+    assert result["history_data"][0]["history_actual"] == "0.5%"
@@ -0,0 +1,115 @@
+import pytest
+
+from scraper import throttle
+from scraper.throttle import CircuitBreaker, CircuitOpenError, TokenBucket, backoff, retry_after
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(throttle.time, "monotonic", clock)
+    return clock
+
+
+class Response:
+    def __init__(self, **headers):
+        self.headers = headers
+
+
+def test_bucket_allows_burst_then_spaces_requests(clock):
+    bucket = TokenBucket(rate=10, burst=2, min_rate=1)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+    # Waiting callers queue up behind each other
+    assert bucket.reserve() == pytest.approx(0.2)
+
+    clock.now += 1
+    assert bucket.reserve() == 0
+
+
+def test_bucket_throttle_halves_rate_down_to_min(clock):
+    bucket = TokenBucket(rate=8, burst=1, min_rate=1)
+    for expected in (4, 2, 1, 1):
+        bucket.throttle()
+        assert bucket.rate == expected
+    assert bucket.throttled == 4
+
+    bucket.recover()
+    assert bucket.rate == pytest.approx(1.8)
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 8
+
+
+def test_bucket_honours_retry_after(clock):
+    bucket = TokenBucket(rate=100, burst=10, min_rate=1)
+    bucket.throttle(retry_after=5)
+    assert bucket.reserve() == pytest.approx(5)
+    clock.now += 5
+    assert bucket.reserve() == 0
+
+
+def test_breaker_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker(threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.failure()
+        breaker.check("example.com")
+    breaker.failure()
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        breaker.check("example.com")
+    assert breaker.stats() == {"state": "open", "failures": 3, "trips": 1, "rejected": 1}
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+    breaker.failure()
+    breaker.success()
+    breaker.failure()
+    assert breaker.state == "closed"
+
+
+def test_breaker_half_open_probe(clock):
+    breaker = CircuitBreaker(threshold=1, reset_timeout=30)
+    breaker.failure()
+
+    clock.now += 30
+    breaker.check("example.com")
+    assert breaker.state == "half-open"
+    # Only one probe goes through
+    with pytest.raises(CircuitOpenError):
+        breaker.check("example.com")
+
+    # A failed probe opens the circuit again, a successful one closes it
+    breaker.failure()
+    assert breaker.state == "open"
+    assert breaker.trips == 2
+    clock.now += 30
+    breaker.check("example.com")
+    breaker.success()
+    assert breaker.state == "closed"
+    breaker.check("example.com")
+
+
+def test_retry_after():
+    assert retry_after(Response(**{"retry-after": "7"})) == 7
+    assert retry_after(Response(**{"retry-after": "-3"})) == 0
+    assert retry_after(Response(**{"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+    assert retry_after(Response(**{"retry-after": "soon"})) is None
+    assert retry_after(Response()) is None
+
+
+def test_backoff_is_capped_and_floored():
+    for attempt in range(10):
+        assert 0 <= backoff(attempt, base=0.5, cap=4) <= 4
+    assert backoff(0, base=0.5, cap=4, floor=10) == 10